@@ -0,0 +1,10 @@
+"""Build performance benchmarks.
+
+Synthesizes sites of configurable size, times the discovery, render, export and
+full-build phases against the real filesystem and the in-memory test fake, and
+compares the results against the budgets checked into ``budgets.json``.
+
+Run from the repository root::
+
+    python -m benchmarks --profile small
+"""
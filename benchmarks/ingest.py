@@ -0,0 +1,121 @@
+"""Runtime catalog ingestion benchmark.
+
+Times :class:`core.discovery.RuntimeCatalogIngestor` turning a synthetic
+catalog snapshot into product pages, without the rest of the build::
+
+    python -m benchmarks.ingest --products 100000
+    python -m benchmarks.ingest --products 100000 --workers 4
+
+Peak memory is measured in a second pass under :mod:`tracemalloc` (skip it
+with ``--no-memory``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+from pathlib import Path
+import time
+import tracemalloc
+from typing import Any
+
+from .synth import RUNTIME_COLLECTION, _product
+
+COLLECTION_CONFIG = {
+    "type": "runtime_catalog",
+    "model": "product",
+    "layout": "product",
+    "route": {"prefix": "catalog"},
+}
+
+
+def _ingest(snapshot: dict[str, Any], workers: int, output_dir: Path) -> int:
+    from core.config import Config
+    from core.project import Project
+
+    config = Config()
+    config.settings["build"]["output_directory"] = str(output_dir)
+    config.settings["content"]["collections"] = {RUNTIME_COLLECTION: dict(COLLECTION_CONFIG)}
+    config.settings["runtime"]["catalog_snapshot"]["workers"] = workers
+    project = Project(config)
+    project.context.runtime_catalog_snapshot = snapshot
+    project.pipeline.discoverer.catalog_ingestor.load_collection(
+        RUNTIME_COLLECTION, COLLECTION_CONFIG, None
+    )
+    return len(project.context.site.pages)
+
+
+def run_ingest_benchmark(
+    products: int,
+    *,
+    workers: int = 0,
+    repeat: int = 1,
+    memory: bool = True,
+    output_dir: Path = Path("./output"),
+) -> dict[str, Any]:
+    """Ingest ``products`` synthetic products; returns seconds (best of ``repeat``) and peak MB."""
+    snapshot = {"products": [_product(index) for index in range(products)]}
+    best: float | None = None
+    pages = 0
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        started = time.perf_counter()
+        pages = _ingest(snapshot, workers, output_dir)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            _ingest(snapshot, workers, output_dir)
+            peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "products": products,
+        "workers": workers,
+        "pages": pages,
+        "seconds": round(best or 0.0, 4),
+        "per_product_us": round((best or 0.0) / max(products, 1) * 1_000_000, 2),
+        "peak_mb": peak_mb,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.ingest",
+        description="Benchmark runtime catalog ingestion on a synthetic snapshot.",
+    )
+    parser.add_argument("--products", type=int, default=100_000, help="Catalog size.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="runtime.catalog_snapshot.workers (0 = normalize in-process).",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Timing runs; the best is kept.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+
+    result = run_ingest_benchmark(
+        args.products, workers=args.workers, repeat=args.repeat, memory=not args.no_memory
+    )
+    peak = f"{result['peak_mb']:.2f} MB" if result["peak_mb"] is not None else "-"
+    print(
+        f"ingested {result['pages']} products with {result['workers']} worker(s): "
+        f"{result['seconds']:.3f}s ({result['per_product_us']:.1f} us/product), peak {peak}"
+    )
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(result, indent=2, sort_keys=True), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,361 @@
+"""Benchmark runner: times build phases and enforces checked-in budgets.
+
+Each benchmark synthesizes a site (see :mod:`benchmarks.synth`) and measures:
+
+- ``discover`` -- pipeline steps up to and including ``after_routes_built_hooks``
+  (content discovery, catalog ingestion, content models, routing),
+- ``render`` -- the ``render_pages`` step,
+- ``export`` -- the ``export_json`` step,
+- ``full_build`` -- constructing a fresh :class:`~core.project.Project` and
+  running the whole pipeline.
+
+Every phase runs against the real filesystem (``disk``) and against
+``tests.fakes.in_memory_fs.InMemoryFileSystem`` (``memory``). Parts of the core
+still probe the real filesystem directly (collection ``exists()`` checks,
+``Page.load``'s ``is_file()``, output-directory clearing, theme lookups), so the
+in-memory run keeps the synthesized sources on disk and mirrors them -- plus the
+theme -- into the fake; reads and writes then go through the fake.
+
+Wall time is measured without tracing overhead; peak memory is measured in a
+second pass under :mod:`tracemalloc` (skip it with ``--no-memory``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUDGETS_PATH = Path(__file__).resolve().parent / "budgets.json"
+
+STAGES = ("discover", "render", "export", "full_build")
+FS_KINDS = ("disk", "memory")
+
+DISCOVER_LAST_STEP = "after_routes_built_hooks"
+STAGE_STEPS = {"render_pages": "render", "export_json": "export"}
+
+PROFILES: dict[str, dict[str, int]] = {
+    "tiny": {"collections": 2, "pages_per_collection": 10, "blocks_per_page": 3, "products": 20},
+    "small": {"collections": 4, "pages_per_collection": 100, "blocks_per_page": 5, "products": 200},
+    "large": {"collections": 8, "pages_per_collection": 1000, "blocks_per_page": 8, "products": 5000},
+}
+
+
+@dataclass
+class Measurement:
+    stage: str
+    fs: str
+    seconds: float
+    peak_mb: float | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}.{self.fs}"
+
+
+@dataclass
+class BenchmarkResult:
+    profile: str
+    spec: dict[str, Any]
+    measurements: list[Measurement] = field(default_factory=list)
+    violations: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "profile": self.profile,
+            "spec": self.spec,
+            "results": {
+                m.key: {"seconds": round(m.seconds, 4), "peak_mb": m.peak_mb}
+                for m in self.measurements
+            },
+            "violations": list(self.violations),
+        }
+
+
+class _Chdir:
+    """Run with the repository root as CWD (theme lookups are CWD-relative)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.previous: str | None = None
+
+    def __enter__(self) -> None:
+        self.previous = os.getcwd()
+        os.chdir(self.path)
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.previous is not None:
+            os.chdir(self.previous)
+
+
+def _mirror_tree(fs, directory: Path) -> None:
+    """Copy every file below ``directory`` into ``fs`` under the same key form."""
+    if not directory.exists():
+        return
+    for path in directory.rglob("*"):
+        if path.is_file():
+            try:
+                fs.write_file(path, path.read_text(encoding="utf-8"))
+            except UnicodeDecodeError:
+                continue
+
+
+def _make_fs(kind: str, site, config):
+    if kind == "disk":
+        return None
+
+    from tests.fakes.in_memory_fs import InMemoryFileSystem
+
+    fs = InMemoryFileSystem()
+    _mirror_tree(fs, site.content_dir)
+    settings_path = Path(config.get("theme.settings"))
+    fs.write_file(settings_path, settings_path.read_text(encoding="utf-8"))
+    _mirror_tree(fs, Path("themes") / str(config.get("theme.name", "minimal-blog")))
+    return fs
+
+
+def _new_project(site, kind: str):
+    from core.project import Project
+
+    config = site.make_config()
+    fs = _make_fs(kind, site, config)
+    site.output_dir.mkdir(parents=True, exist_ok=True)
+    project = Project(config, fs_manager=fs)
+    project.runtime_catalog_snapshot = site.catalog_snapshot
+    return project
+
+
+class _Meter:
+    """Measures either wall time or tracemalloc peak for a callable."""
+
+    def __init__(self, memory: bool) -> None:
+        self.memory = memory
+
+    def measure(self, func: Callable[[], Any]) -> tuple[float, float | None]:
+        gc.collect()
+        if self.memory:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if self.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            return elapsed, round(max(peak - baseline, 0) / (1024 * 1024), 2)
+        return elapsed, None
+
+
+def _run_staged(site, kind: str, meter: _Meter) -> dict[str, tuple[float, float | None]]:
+    project = _new_project(site, kind)
+    results: dict[str, tuple[float, float | None]] = {}
+
+    steps = project.pipeline.steps
+    split = next(i for i, step in enumerate(steps) if step.name == DISCOVER_LAST_STEP) + 1
+
+    def discover() -> None:
+        for step in steps[:split]:
+            step.run()
+
+    results["discover"] = meter.measure(discover)
+    for step in steps[split:]:
+        stage = STAGE_STEPS.get(step.name)
+        if stage is None:
+            step.run()
+        else:
+            results[stage] = meter.measure(step.run)
+    return results
+
+
+def _run_full(site, kind: str, meter: _Meter) -> tuple[float, float | None]:
+    return meter.measure(lambda: _new_project(site, kind).build())
+
+
+def _run_pass(site, fs_kinds: list[str], memory: bool, repeat: int) -> dict[str, tuple[float, float | None]]:
+    meter = _Meter(memory)
+    best: dict[str, tuple[float, float | None]] = {}
+    for _ in range(max(1, repeat if not memory else 1)):
+        for kind in fs_kinds:
+            staged = _run_staged(site, kind, meter)
+            staged["full_build"] = _run_full(site, kind, meter)
+            for stage, value in staged.items():
+                key = f"{stage}.{kind}"
+                if key not in best or value[0] < best[key][0]:
+                    best[key] = value
+    return best
+
+
+def run_benchmark(
+    profile: str,
+    spec,
+    *,
+    fs_kinds: list[str] | tuple[str, ...] = FS_KINDS,
+    memory: bool = True,
+    repeat: int = 1,
+    workdir: Path | None = None,
+) -> BenchmarkResult:
+    """Synthesize ``spec`` and measure every stage for each filesystem kind."""
+    from .synth import synthesize_site
+
+    owned_dir = workdir is None
+    root = Path(tempfile.mkdtemp(prefix="wg-bench-")) if owned_dir else workdir
+    result = BenchmarkResult(profile=profile, spec=spec.as_dict())
+    try:
+        site = synthesize_site(root, spec)
+        with _Chdir(REPO_ROOT):
+            timings = _run_pass(site, list(fs_kinds), memory=False, repeat=repeat)
+            peaks: dict[str, tuple[float, float | None]] = {}
+            if memory:
+                tracemalloc.start()
+                try:
+                    peaks = _run_pass(site, list(fs_kinds), memory=True, repeat=1)
+                finally:
+                    tracemalloc.stop()
+        for kind in fs_kinds:
+            for stage in STAGES:
+                key = f"{stage}.{kind}"
+                peak = peaks.get(key, (0.0, None))[1]
+                result.measurements.append(
+                    Measurement(stage=stage, fs=kind, seconds=timings[key][0], peak_mb=peak)
+                )
+    finally:
+        if owned_dir:
+            shutil.rmtree(root, ignore_errors=True)
+    return result
+
+
+# -- budgets -------------------------------------------------------------------
+
+
+def load_budgets(path: Path = BUDGETS_PATH) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def check_budgets(result: BenchmarkResult, budgets: dict[str, Any]) -> list[str]:
+    """Return one message per exceeded budget (and record them on ``result``)."""
+    profile_budgets = budgets.get("profiles", {}).get(result.profile, {})
+    violations: list[str] = []
+    for measurement in result.measurements:
+        budget = profile_budgets.get(measurement.key)
+        if not isinstance(budget, dict):
+            continue
+        max_seconds = budget.get("max_seconds")
+        if max_seconds is not None and measurement.seconds > max_seconds:
+            violations.append(
+                f"{result.profile}:{measurement.key} took {measurement.seconds:.3f}s "
+                f"(budget {max_seconds}s)"
+            )
+        max_peak = budget.get("max_peak_mb")
+        if max_peak is not None and measurement.peak_mb is not None and measurement.peak_mb > max_peak:
+            violations.append(
+                f"{result.profile}:{measurement.key} peaked at {measurement.peak_mb:.2f} MB "
+                f"(budget {max_peak} MB)"
+            )
+    result.violations = violations
+    return violations
+
+
+def format_table(result: BenchmarkResult) -> str:
+    spec = result.spec
+    header = f"{'stage':<12} {'fs':<8} {'seconds':>10} {'peak MB':>10}"
+    lines = [
+        f"profile {result.profile}: {spec['total_pages']} pages "
+        f"({spec['collections']}x{spec['pages_per_collection']} documents, "
+        f"{spec['blocks_per_page']} blocks/page, {spec['products']} products)",
+        header,
+        "-" * len(header),
+    ]
+    for m in result.measurements:
+        peak = f"{m.peak_mb:.2f}" if m.peak_mb is not None else "-"
+        lines.append(f"{m.stage:<12} {m.fs:<8} {m.seconds:>10.3f} {peak:>10}")
+    return "\n".join(lines)
+
+
+# -- CLI -----------------------------------------------------------------------
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark build phases on synthetic sites and enforce budgets.",
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--collections", type=int, help="Override collections count.")
+    parser.add_argument("--pages", type=int, help="Override pages per collection.")
+    parser.add_argument("--blocks", type=int, help="Override blocks per page.")
+    parser.add_argument("--products", type=int, help="Override runtime catalog size.")
+    parser.add_argument(
+        "--plugins",
+        help="Comma-separated plugin classes to enable (default: the SiteSpec default set).",
+    )
+    parser.add_argument(
+        "--fs", default=",".join(FS_KINDS), help="Comma-separated filesystems: disk,memory."
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Timing runs; the best is kept.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path.")
+    parser.add_argument("--budgets", default=str(BUDGETS_PATH), help="Budget file to check.")
+    parser.add_argument("--no-budgets", action="store_true", help="Report only; never fail.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .synth import SiteSpec
+
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+
+    overrides = {
+        "collections": args.collections,
+        "pages_per_collection": args.pages,
+        "blocks_per_page": args.blocks,
+        "products": args.products,
+    }
+    shape: dict[str, Any] = dict(PROFILES[args.profile])
+    custom = {k: v for k, v in overrides.items() if v is not None}
+    if args.plugins is not None:
+        custom["plugins"] = tuple(name.strip() for name in args.plugins.split(",") if name.strip())
+    shape.update(custom)
+    profile = args.profile if not custom else f"{args.profile}+custom"
+
+    fs_kinds = [kind.strip() for kind in args.fs.split(",") if kind.strip()]
+    unknown = [kind for kind in fs_kinds if kind not in FS_KINDS]
+    if unknown:
+        print(f"Unknown filesystem kind(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    result = run_benchmark(
+        profile,
+        SiteSpec(**shape),
+        fs_kinds=fs_kinds,
+        memory=not args.no_memory,
+        repeat=args.repeat,
+    )
+    violations: list[str] = []
+    if not args.no_budgets:
+        violations = check_budgets(result, load_budgets(Path(args.budgets)))
+
+    print(format_table(result))
+    if args.json_path:
+        Path(args.json_path).write_text(
+            json.dumps(result.as_dict(), indent=2, sort_keys=True), encoding="utf-8"
+        )
+
+    if violations:
+        print("\nPerformance budget exceeded:", file=sys.stderr)
+        for violation in violations:
+            print(f"  - {violation}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,190 @@
+"""Synthetic site generator for build benchmarks."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from core.config import Config
+
+RUNTIME_COLLECTION = "catalog"
+
+_WORDS = (
+    "amber bazaar copper saffron lantern walnut indigo velvet cedar marble "
+    "tea spice loom silk harbor meadow ember quartz willow orchard"
+).split()
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """Shape of a synthetic site."""
+
+    collections: int = 2
+    pages_per_collection: int = 10
+    blocks_per_page: int = 3
+    products: int = 20
+    plugins: tuple[str, ...] = field(default=("CollectionIndexerPlugin", "SpecialPagesPlugin"))
+
+    @property
+    def total_pages(self) -> int:
+        return self.collections * self.pages_per_collection + self.products
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["plugins"] = list(self.plugins)
+        data["total_pages"] = self.total_pages
+        return data
+
+
+@dataclass
+class SyntheticSite:
+    """A synthesized site on disk plus the inputs needed to build it."""
+
+    root: Path
+    spec: SiteSpec
+    settings: dict[str, Any]
+    catalog_snapshot: dict[str, Any]
+
+    @property
+    def content_dir(self) -> Path:
+        return self.root / "content"
+
+    @property
+    def output_dir(self) -> Path:
+        return self.root / "output"
+
+    def make_config(self) -> Config:
+        """Return a fresh :class:`Config` for one build of this site."""
+        config = Config()
+        for section, values in self.settings.items():
+            if isinstance(values, dict) and isinstance(config.settings.get(section), dict):
+                config.settings[section].update(deepcopy(values))
+            else:
+                config.settings[section] = deepcopy(values)
+        config._rebuild_schema()
+        return config
+
+
+def _sentence(seed: int, length: int) -> str:
+    words = [_WORDS[(seed * 7 + i * 3) % len(_WORDS)] for i in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def _block(page_seed: int, index: int) -> dict[str, Any]:
+    seed = page_seed * 31 + index
+    if index % 2 == 0:
+        return {
+            "type": "hero",
+            "variant": "default",
+            "content": {
+                "eyebrow": _sentence(seed, 3),
+                "title": _sentence(seed + 1, 8),
+                "text": _sentence(seed + 2, 24),
+                "actions": [{"label": "Read more", "url": f"/p/{seed}/"}],
+            },
+        }
+    paragraphs = "".join(f"<p>{_sentence(seed + n, 40)}</p>" for n in range(3))
+    return {
+        "type": "rich_text",
+        "content": {"title": _sentence(seed, 5), "html": paragraphs},
+    }
+
+
+def _page_source(collection_index: int, page_index: int, spec: SiteSpec) -> str:
+    seed = collection_index * 100_003 + page_index
+    front_matter = {
+        "title": f"{_sentence(seed, 4)[:-1]} {page_index}",
+        "summary": _sentence(seed, 18),
+        "date": f"2026-01-{(page_index % 28) + 1:02d}",
+        "tags": [_WORDS[seed % len(_WORDS)], _WORDS[(seed + 5) % len(_WORDS)]],
+        "blocks": [_block(seed, i) for i in range(spec.blocks_per_page)],
+    }
+    body = "\n\n".join(
+        [f"## {_sentence(seed + n, 4)}\n\n{_sentence(seed + n, 60)}" for n in range(3)]
+    )
+    return "---\n" + yaml.safe_dump(front_matter, sort_keys=False) + "---\n\n" + body + "\n"
+
+
+def _product(index: int) -> dict[str, Any]:
+    name = f"{_sentence(index, 3)[:-1]} {index}"
+    return {
+        "name": name,
+        "sku": f"SKU-{index:06d}",
+        "description": _sentence(index, 30),
+        "currency": "IRR",
+        "metadata": {"availability": "in_stock", "badge": _WORDS[index % len(_WORDS)]},
+        "variants": [
+            {"sku": f"SKU-{index:06d}-{n}", "price": 100_000 + index * 10 + n, "currency": "IRR"}
+            for n in range(3)
+        ],
+    }
+
+
+def synthesize_site(root: Path, spec: SiteSpec) -> SyntheticSite:
+    """Write a synthetic site under ``root`` and return its build inputs."""
+    root = root.resolve()
+    content_dir = root / "content"
+    collections: dict[str, Any] = {}
+
+    for collection_index in range(spec.collections):
+        name = f"section{collection_index}"
+        collection_dir = content_dir / name
+        collection_dir.mkdir(parents=True, exist_ok=True)
+        for page_index in range(spec.pages_per_collection):
+            (collection_dir / f"page-{page_index:05d}.md").write_text(
+                _page_source(collection_index, page_index, spec), encoding="utf-8"
+            )
+        collections[name] = {
+            "path": str(collection_dir),
+            "type": "page",
+            "route": {"prefix": name},
+            "layout": "document",
+            "index": {
+                "enabled": True,
+                "layout": "collection",
+                "output_path": f"{name}/index.html",
+                "title": name.title(),
+            },
+        }
+
+    if spec.products:
+        collections[RUNTIME_COLLECTION] = {
+            "type": "runtime_catalog",
+            "model": "product",
+            "route": {"prefix": RUNTIME_COLLECTION},
+            "layout": "product",
+        }
+
+    settings_path = root / "theme.settings.yaml"
+    settings_path.write_text("preset: default\n", encoding="utf-8")
+
+    settings = {
+        "site": {"name": "Benchmark Site", "base_url": "", "navigation": []},
+        "content": {
+            "source_directory": str(content_dir),
+            "data_dir": str(root / "data"),
+            "collections": collections,
+        },
+        "theme": {
+            "settings": str(settings_path),
+            "site_theme_dir": str(root / "site-theme"),
+        },
+        "build": {
+            "output_directory": str(root / "output"),
+            "asset_dirs": [],
+        },
+        "plugins": list(spec.plugins),
+        "experimental": {
+            "export_data": {
+                "enabled": True,
+                "output_dir": str(root / "output" / "data"),
+                "include_collections": [],
+            },
+        },
+    }
+    snapshot = {"products": [_product(index) for index in range(spec.products)]}
+    return SyntheticSite(root=root, spec=spec, settings=settings, catalog_snapshot=snapshot)
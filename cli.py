@@ -1,45 +1,86 @@
+"""Command-line entry point for ``wg``.
+
+Startup latency matters here: ``wg`` runs from git hooks and editor
+integrations. Only the standard library modules needed to parse arguments are
+imported at module level; each subcommand imports what it needs (the build
+pipeline, Django templates, the runtime packages) when it runs. Check the
+import cost of any command with ``wg --startup-profile <command> ...``.
+"""
+
 from __future__ import annotations
 
 import argparse
-from functools import partial
-from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
-import json
 import logging
 import os
-import subprocess
 import sys
 from pathlib import Path
-import shutil
 import time
-from slugify import slugify
+from typing import TYPE_CHECKING
 
-from core.bootstrap import bootstrap
-from core.composition import build_project as compose_project
-from core.project import Project
-from core.starters import STARTER_NAMES, scaffold_starter
-from core.theme_manager import ThemeManager
-from utils.fs_manager import FileSystemManager
-from wg_runtime.mock_server import serve_mock_runtime
+from core.starters import STARTER_NAMES
+
+if TYPE_CHECKING:
+    from core.project import Project
 
 logger = logging.getLogger(__name__)
 
 
-def build_project(config_path: str = "config.yaml", *, strict: bool = True) -> Project:
+def build_project(
+    config_path: str = "config.yaml",
+    *,
+    strict: bool = True,
+    trace_dir: str | None = None,
+) -> Project:
+    from core.bootstrap import bootstrap
+    from core.composition import build_project as compose_project
+
     config = bootstrap(config_path)
     if not strict:
         config.settings["build"]["strict"] = False
         config._rebuild_schema()
+    if trace_dir:
+        config.settings["build"]["trace"] = {"enabled": True, "output_dir": trace_dir}
+        config._rebuild_schema()
     project = compose_project(config)
     project.build()
     return project
 
 
 def cmd_build(args: argparse.Namespace) -> int:
-    build_project(args.config, strict=not getattr(args, "lenient", False))
+    build_project(
+        args.config,
+        strict=not getattr(args, "lenient", False),
+        trace_dir=getattr(args, "trace", None),
+    )
     return 0
 
 
 def cmd_serve(args: argparse.Namespace) -> int:
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    if args.dev or args.preview:
+        if args.dev:
+            from core.dev_server import run_dev_server as run_server
+        else:
+            from core.preview_server import run_preview_server as run_server
+
+        try:
+            run_server(
+                args.config,
+                host=args.host,
+                port=args.port,
+                interval=args.interval,
+                force_polling=args.poll,
+                debounce=args.debounce,
+            )
+        except KeyboardInterrupt:
+            logger.info("Stopping server.")
+        return 0
+
+    from core.bootstrap import bootstrap
+    from core.composition import build_project as compose_project
+
     config = bootstrap(args.config)
     if args.build_first:
         project = compose_project(config)
@@ -53,9 +94,19 @@ def cmd_serve(args: argparse.Namespace) -> int:
     if not output_dir.is_dir():
         raise NotADirectoryError(f"Output path is not a directory: {output_dir}")
     resolved_output = output_dir.resolve()
+
+    if args.production:
+        from core.static_server import run_static_server
+
+        try:
+            run_static_server(resolved_output, host=args.host, port=args.port)
+        except KeyboardInterrupt:
+            logger.info("Stopping server.")
+        return 0
+
     handler = partial(SimpleHTTPRequestHandler, directory=str(resolved_output))
-    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
-    logger.info("Serving %s at http://127.0.0.1:%s", resolved_output, args.port)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    logger.info("Serving %s at http://%s:%s", resolved_output, args.host, args.port)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -66,30 +117,73 @@ def cmd_serve(args: argparse.Namespace) -> int:
 
 
 def cmd_watch(args: argparse.Namespace) -> int:
-    config = bootstrap(args.config)
-    watch_paths = _collect_watch_paths(config, Path(args.config))
-    last_snapshot = _snapshot_paths(watch_paths)
+    from core.warm_build import WarmBuildSession, watch_and_rebuild
 
     logger.info("Starting watch mode.")
-    compose_project(config).build()
-
+    session = WarmBuildSession(args.config)
+    session.build()
     try:
-        while True:
-            time.sleep(args.interval)
-            current_snapshot = _snapshot_paths(watch_paths)
-            if current_snapshot != last_snapshot:
-                logger.info("Detected changes, rebuilding...")
-                config = bootstrap(args.config)
-                compose_project(config).build()
-                watch_paths = _collect_watch_paths(config, Path(args.config))
-                current_snapshot = _snapshot_paths(watch_paths)
-            last_snapshot = current_snapshot
+        watch_and_rebuild(
+            session, interval=args.interval, force_polling=args.poll, debounce=args.debounce
+        )
     except KeyboardInterrupt:
         logger.info("Watch mode stopped.")
-        return 0
+    return 0
+
+
+def cmd_daemon_start(args: argparse.Namespace) -> int:
+    from core.daemon import create_daemon_server
+
+    server = create_daemon_server(args.socket)
+    logger.info("wg daemon listening on %s", server.socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping daemon.")
+    finally:
+        server.server_close()
+    return 0
+
+
+def cmd_daemon_request(args: argparse.Namespace) -> int:
+    import json
+
+    from core.daemon_client import request_daemon
+
+    request: dict[str, object] = {"command": args.daemon_command}
+    if args.daemon_command in {"build", "partial"}:
+        request.update(cwd=os.getcwd(), config=args.config, full=getattr(args, "full", False))
+        request["paths"] = getattr(args, "paths", [])
+
+    def show_progress(event: dict) -> None:
+        if event.get("event") == "step":
+            print(f"[{event['index']}/{event['total']}] {event['name']}", file=sys.stderr)
+
+    try:
+        message = request_daemon(request, args.socket, on_event=show_progress)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("No wg daemon is running; start one with 'wg daemon start'.", file=sys.stderr)
+        return 2
+    if message.get("event") == "error":
+        print(f"wg daemon error: {message.get('message')}", file=sys.stderr)
+        return 1
+    if args.daemon_command in {"build", "partial"}:
+        if not message["ok"]:
+            print(f"Build failed: {message['error']}", file=sys.stderr)
+            return 1
+        print(
+            f"{message['mode']} build in {message['seconds']:.2f}s: "
+            f"{message['rendered']} page(s) rendered, {message['removed']} removed"
+        )
+    else:
+        message.pop("event", None)
+        print(json.dumps(message, indent=2))
+    return 0
 
 
 def cmd_runtime_mock(args: argparse.Namespace) -> int:
+    from wg_runtime.mock_server import serve_mock_runtime
+
     serve_mock_runtime(
         host=args.host,
         port=args.port,
@@ -99,6 +193,8 @@ def cmd_runtime_mock(args: argparse.Namespace) -> int:
 
 
 def cmd_runtime_django(args: argparse.Namespace) -> int:
+    import subprocess
+
     manage_py = (
         Path(__file__).resolve().parent
         / "packages"
@@ -120,6 +216,9 @@ def cmd_runtime_django(args: argparse.Namespace) -> int:
 
 
 def cmd_init(args: argparse.Namespace) -> int:
+    from core.starters import scaffold_starter
+    from utils.fs_manager import FileSystemManager
+
     target_dir = Path(args.directory).resolve()
     fs_manager = FileSystemManager()
     fs_manager.create_directory(target_dir)
@@ -137,6 +236,8 @@ def cmd_new_post(args: argparse.Namespace) -> int:
 
 
 def cmd_theme_create(args: argparse.Namespace) -> int:
+    from utils.fs_manager import FileSystemManager
+
     theme_dir = Path("themes") / args.name
     fs_manager = FileSystemManager()
     for relative_dir in [
@@ -267,6 +368,12 @@ supports:
 
 
 def cmd_theme_inspect(args: argparse.Namespace) -> int:
+    import json
+
+    from core.bootstrap import bootstrap
+    from core.theme_manager import ThemeManager
+    from utils.fs_manager import FileSystemManager
+
     config = bootstrap(args.config)
     theme_manager = ThemeManager(config, FileSystemManager())
     print(json.dumps(theme_manager.manifest, indent=2))
@@ -274,6 +381,10 @@ def cmd_theme_inspect(args: argparse.Namespace) -> int:
 
 
 def cmd_theme_eject(args: argparse.Namespace) -> int:
+    from core.bootstrap import bootstrap
+    from core.theme_manager import ThemeManager
+    from utils.fs_manager import FileSystemManager
+
     config = bootstrap(args.config)
     fs_manager = FileSystemManager()
     theme_manager = ThemeManager(config, fs_manager)
@@ -295,6 +406,11 @@ def cmd_theme_eject(args: argparse.Namespace) -> int:
 def _create_content_file(
     args: argparse.Namespace, default_collection: str
 ) -> int:
+    from slugify import slugify
+
+    from core.bootstrap import bootstrap
+    from utils.fs_manager import FileSystemManager
+
     config = bootstrap(args.config)
     collections = config.get("content.collections", {})
     collection_name = args.collection or default_collection
@@ -328,41 +444,100 @@ date: {time.strftime('%Y-%m-%d')}
     return 0
 
 
-def _collect_watch_paths(config, config_path: Path) -> list[Path]:
-    paths = [config_path.resolve()]
-    for candidate in [
-        Path(config.get("content.source_directory", "./source")),
-        Path(config.get("content.data_dir", "./source/data")),
-        Path(config.get("theme.settings", "./theme.settings.yaml")),
-        Path(config.get("theme.site_theme_dir", "./site-theme")),
-        Path("themes") / str(config.get("theme.name", "minimal-blog")),
-    ]:
-        if candidate.exists():
-            paths.append(candidate.resolve())
-    return paths
-
-
-def _snapshot_paths(paths: list[Path]) -> dict[str, float]:
-    snapshot: dict[str, float] = {}
-    for path in paths:
-        if path.is_file():
-            snapshot[str(path)] = path.stat().st_mtime
-            continue
-        if path.is_dir():
-            for child in path.rglob("*"):
-                if child.is_file():
-                    snapshot[str(child)] = child.stat().st_mtime
-    return snapshot
-
-
 def _write_if_missing(path: Path, content: str) -> None:
+    from utils.fs_manager import FileSystemManager
+
     fs_manager = FileSystemManager()
     if not path.exists():
         fs_manager.write_file(path, content)
 
 
+_STARTUP_PROFILE_ENV = "WG_STARTUP_PROFILE_CHILD"
+_STARTUP_PROFILE_MARKER = "wg-startup-profile: dispatch"
+
+
+def _parse_importtime(lines: list[str]) -> list[tuple[str, int, int, int]]:
+    """Parse ``-X importtime`` lines into ``(module, depth, self_us, cumulative_us)``."""
+    entries: list[tuple[str, int, int, int]] = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header row
+        name_field = fields[2].rstrip()
+        stripped = name_field.lstrip(" ")
+        depth = (len(name_field) - len(stripped) - 1) // 2
+        entries.append((stripped, depth, int(fields[0]), int(fields[1])))
+    return entries
+
+
+def _format_import_table(title: str, entries: list[tuple[str, int, int, int]], limit: int) -> str:
+    top_level = [entry for entry in entries if entry[1] == 0]
+    total_ms = sum(entry[3] for entry in top_level) / 1000
+    lines = [f"{title}: {total_ms:.1f} ms in {len(entries)} modules"]
+    slowest = sorted(entries, key=lambda entry: entry[3], reverse=True)[:limit]
+    if slowest:
+        lines.append(f"  {'cumulative ms':>13} {'self ms':>9}  module")
+    for name, depth, self_us, cumulative_us in slowest:
+        lines.append(
+            f"  {cumulative_us / 1000:>13.1f} {self_us / 1000:>9.1f}  {'  ' * depth}{name}"
+        )
+    return "\n".join(lines)
+
+
+def _run_startup_profile(argv: list[str], limit: int = 15) -> int:
+    """Re-run ``wg`` under ``-X importtime`` and print an import-time breakdown.
+
+    Imports before the subcommand is dispatched are reported as startup cost;
+    the rest are the imports the subcommand itself deferred.
+    """
+    import subprocess
+
+    command = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        "import sys, cli; sys.exit(cli.main(sys.argv[1:]))",
+        *argv,
+    ]
+    env = dict(os.environ, **{_STARTUP_PROFILE_ENV: "1"})
+    started = time.perf_counter()
+    completed = subprocess.run(command, env=env, stderr=subprocess.PIPE, text=True)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    startup_lines: list[str] = []
+    command_lines: list[str] = []
+    sink = startup_lines
+    for line in completed.stderr.splitlines():
+        if line == _STARTUP_PROFILE_MARKER:
+            sink = command_lines
+        elif line.startswith("import time:"):
+            sink.append(line)
+        else:
+            print(line, file=sys.stderr)
+
+    report = [
+        _format_import_table(
+            "startup imports (before dispatch)", _parse_importtime(startup_lines), limit
+        ),
+        _format_import_table(
+            "command imports (deferred)", _parse_importtime(command_lines), limit
+        ),
+        f"total wall time: {elapsed_ms:.1f} ms (exit code {completed.returncode})",
+    ]
+    print("\n".join(report), file=sys.stderr)
+    return completed.returncode
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="wg", description="Website generator CLI")
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Run the command and print an import-time breakdown to stderr.",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     build_parser = subparsers.add_parser("build", help="Build the site")
@@ -372,17 +547,62 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Continue the build when a plugin or runtime integration fails (default: strict).",
     )
+    build_parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="./.wg-trace",
+        default=None,
+        metavar="DIR",
+        help="Record per-step/hook/page timings; writes trace.json (Chrome trace) and summary.json to DIR.",
+    )
     build_parser.set_defaults(func=cmd_build)
 
     serve_parser = subparsers.add_parser("serve", help="Serve the output directory")
     serve_parser.add_argument("--config", default="config.yaml")
+    serve_parser.add_argument("--host", default="127.0.0.1")
     serve_parser.add_argument("--port", type=int, default=8000)
     serve_parser.add_argument("--build-first", action="store_true")
+    serve_mode = serve_parser.add_mutually_exclusive_group()
+    serve_mode.add_argument(
+        "--dev",
+        action="store_true",
+        help="Rebuild on change, serve pages from memory and live-reload the browser",
+    )
+    serve_mode.add_argument(
+        "--production",
+        action="store_true",
+        help="Serve with ETags, conditional GET, precompressed sidecars, Range and keep-alive",
+    )
+    serve_mode.add_argument(
+        "--preview",
+        action="store_true",
+        help="Skip the full build; render each page on first request and memoize it",
+    )
+    serve_parser.add_argument(
+        "--interval", type=float, default=1.0, help="With --dev/--preview: polling interval in seconds"
+    )
+    serve_parser.add_argument(
+        "--poll", action="store_true", help="With --dev/--preview: use the polling file watcher"
+    )
+    serve_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.15,
+        help="With --dev/--preview: quiet period before rebuilding",
+    )
     serve_parser.set_defaults(func=cmd_serve)
 
     watch_parser = subparsers.add_parser("watch", help="Watch content and rebuild")
     watch_parser.add_argument("--config", default="config.yaml")
-    watch_parser.add_argument("--interval", type=float, default=1.0)
+    watch_parser.add_argument(
+        "--interval", type=float, default=1.0, help="Polling interval in seconds (polling backend)"
+    )
+    watch_parser.add_argument(
+        "--poll", action="store_true", help="Use the polling watcher even where inotify is available"
+    )
+    watch_parser.add_argument(
+        "--debounce", type=float, default=0.15, help="Quiet period in seconds before rebuilding"
+    )
     watch_parser.set_defaults(func=cmd_watch)
 
     init_parser = subparsers.add_parser("init", help="Scaffold a new site")
@@ -423,6 +643,27 @@ def build_parser() -> argparse.ArgumentParser:
     theme_eject_parser.add_argument("--config", default="config.yaml")
     theme_eject_parser.set_defaults(func=cmd_theme_eject)
 
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Persistent build daemon that keeps projects warm between builds"
+    )
+    daemon_subparsers = daemon_parser.add_subparsers(dest="daemon_command", required=True)
+    daemon_start_parser = daemon_subparsers.add_parser("start", help="Run the daemon in the foreground")
+    daemon_start_parser.set_defaults(func=cmd_daemon_start)
+    daemon_build_parser = daemon_subparsers.add_parser("build", help="Build through the daemon")
+    daemon_build_parser.add_argument("--config", default="config.yaml")
+    daemon_build_parser.add_argument("--full", action="store_true", help="Force a cold rebuild")
+    daemon_build_parser.set_defaults(func=cmd_daemon_request)
+    daemon_partial_parser = daemon_subparsers.add_parser(
+        "partial", help="Rebuild after the given files changed"
+    )
+    daemon_partial_parser.add_argument("paths", nargs="+")
+    daemon_partial_parser.add_argument("--config", default="config.yaml")
+    daemon_partial_parser.set_defaults(func=cmd_daemon_request)
+    for name, help_text in (("status", "Show warm projects"), ("stop", "Stop the daemon")):
+        daemon_subparsers.add_parser(name, help=help_text).set_defaults(func=cmd_daemon_request)
+    for subparser in daemon_subparsers.choices.values():
+        subparser.add_argument("--socket", default=None, help="Daemon socket path")
+
     runtime_parser = subparsers.add_parser("runtime", help="Runtime companion tools")
     runtime_subparsers = runtime_parser.add_subparsers(dest="runtime_command", required=True)
 
@@ -442,7 +683,12 @@ def build_parser() -> argparse.ArgumentParser:
 
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
+    argv = list(sys.argv[1:] if argv is None else argv)
     args = parser.parse_args(argv)
+    if args.startup_profile:
+        return _run_startup_profile([arg for arg in argv if arg != "--startup-profile"])
+    if os.environ.get(_STARTUP_PROFILE_ENV):
+        print(_STARTUP_PROFILE_MARKER, file=sys.stderr, flush=True)
     return int(args.func(args))
 
 
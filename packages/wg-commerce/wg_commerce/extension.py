@@ -4,10 +4,10 @@ from abc import ABC, abstractmethod
 from decimal import Decimal
 import json
 import logging
-from pathlib import Path
 from typing import Any
 
 from wg_contracts.extension import BaseExtension
+from .jsonl_writer import JsonlWriterOptions, get_jsonl_writer
 from wg_contracts.integrations import (
     AdapterResult,
     error_result,
@@ -184,22 +184,53 @@ class FlatRateShippingAdapter:
 
 
 class JsonlAccountingExporterAdapter:
+    """Appends accounting records to a JSONL file.
+
+    Provider config: ``output_file``; ``fsync`` (``always`` / ``interval`` /
+    ``never``) and ``fsync_interval_seconds``; ``rotate_max_bytes`` and/or
+    ``rotate_when: daily``; ``compress_rotated``; ``buffer_bytes``. See
+    :mod:`wg_commerce.jsonl_writer` for the durability each policy gives.
+    """
+
     name = "commerce.accounting.jsonl_exporter"
 
     def export_record(
         self, payload: dict[str, Any], provider_config: dict[str, Any]
     ) -> AdapterResult:
+        return self.export_records([payload], provider_config)[0]
+
+    def export_records(
+        self, payloads: list[dict[str, Any]], provider_config: dict[str, Any]
+    ) -> list[AdapterResult]:
+        """Append ``payloads`` through the shared writer for the output file.
+
+        Records are flushed to the OS before ``ok`` is returned, so the outbox
+        never marks an event exported while it is only in a memory buffer;
+        ``metadata.durability`` reports whether they were also fsynced.
+        """
         output_file = str(
             provider_config.get("output_file", "./output/runtime/accounting-export.jsonl")
         )
-        output_path = Path(output_file).expanduser().resolve()
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
-        return ok_result(
+        try:
+            writer = get_jsonl_writer(output_file, JsonlWriterOptions.from_config(provider_config))
+        except ValueError as exc:
+            error = error_result(provider=self.name, code="invalid_config", message=str(exc))
+            return [error] * len(payloads)
+        try:
+            durability = writer.write_records(payloads)
+        except OSError as exc:
+            error = error_result(
+                provider=self.name,
+                code="write_failed",
+                message=f"Could not write {writer.path}: {exc}",
+                retryable=True,
+            )
+            return [error] * len(payloads)
+        result = ok_result(
             provider=self.name,
-            metadata={"output_file": str(output_path), "exported": True},
+            metadata={"output_file": str(writer.path), "exported": True, "durability": durability},
         )
+        return [result] * len(payloads)
 
 
 class SimpleVatTaxPricingAdapter:
@@ -253,6 +284,7 @@ class CommerceExtension(BaseExtension):
             ShaparakLikePaymentAdapter,
             metadata={
                 "kind": "payment_provider",
+                "thread_safe": True,
                 "currencies": ["IRR", "IRT"],
                 "checkout_flow": "redirect_with_callback",
             },
@@ -262,6 +294,7 @@ class CommerceExtension(BaseExtension):
             LocalConsoleNotificationAdapter,
             metadata={
                 "kind": "notification_provider",
+                "thread_safe": True,
                 "channels": ["console"],
             },
         )
@@ -270,6 +303,7 @@ class CommerceExtension(BaseExtension):
             FlatRateShippingAdapter,
             metadata={
                 "kind": "shipping_provider",
+                "thread_safe": True,
                 "quote_mode": "flat_rate",
             },
         )
@@ -278,6 +312,7 @@ class CommerceExtension(BaseExtension):
             JsonlAccountingExporterAdapter,
             metadata={
                 "kind": "accounting_exporter",
+                "thread_safe": True,
                 "format": "jsonl",
             },
         )
@@ -286,6 +321,7 @@ class CommerceExtension(BaseExtension):
             SimpleVatTaxPricingAdapter,
             metadata={
                 "kind": "tax_pricing_provider",
+                "thread_safe": True,
                 "mode": "percentage",
             },
         )
@@ -0,0 +1,268 @@
+"""Process-wide, rotating JSONL writer for the accounting exporter.
+
+One :class:`RotatingJsonlWriter` per output file is shared by every adapter
+instance in the process (see :func:`get_jsonl_writer`). It keeps the file
+open and writes each batch of records with a single ``write``.
+
+Durability is explicit. :meth:`RotatingJsonlWriter.write_records` returns
+only after the records are flushed to the operating system, so an accepted
+record survives a crash of this process. Whether they are also on disk
+depends on the ``fsync`` policy:
+
+- ``always``: fsync on every write. The records survive power loss once
+  the call returns.
+- ``interval`` (default): fsync at most every ``fsync_interval`` seconds.
+  A background thread syncs writes that would otherwise wait for the next
+  one. The file is also synced when it is rotated or closed.
+- ``never``: leave fsync to the operating system.
+
+The value returned (``"fsynced"`` or ``"flushed"``) says which guarantee the
+call gave.
+
+Rotation happens before a write would grow the file past ``max_bytes``,
+or on the first write of a new (UTC) day with ``rotate_daily``. The
+rotated segment is renamed to ``<stem>.<UTC timestamp><suffix>`` and,
+with ``compress``, gzipped in the background.
+
+Several processes (e.g. Celery workers) may append to the same file. Each
+write and rotation holds an exclusive ``flock`` on ``<file>.lock``, and a
+writer whose open file was rotated away by another process reopens the
+path before writing. Where ``fcntl`` is not available (Windows) there is no
+such lock, so use one writer process per file there.
+"""
+
+from __future__ import annotations
+
+import atexit
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+import shutil
+import threading
+import time
+from typing import IO, Any, Iterable
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+@dataclass(frozen=True)
+class JsonlWriterOptions:
+    fsync: str = "interval"
+    fsync_interval: float = 1.0
+    max_bytes: int = 0
+    rotate_daily: bool = False
+    compress: bool = False
+    buffer_bytes: int = 64 * 1024
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "JsonlWriterOptions":
+        fsync = str(config.get("fsync", "interval")).strip().lower() or "interval"
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}; got '{fsync}'.")
+        return cls(
+            fsync=fsync,
+            fsync_interval=float(config.get("fsync_interval_seconds", 1.0)),
+            max_bytes=int(config.get("rotate_max_bytes", 0) or 0),
+            rotate_daily=str(config.get("rotate_when", "")).strip().lower() == "daily",
+            compress=bool(config.get("compress_rotated", False)),
+            buffer_bytes=max(4096, int(config.get("buffer_bytes", 64 * 1024))),
+        )
+
+
+class RotatingJsonlWriter:
+    def __init__(self, path: Path, options: JsonlWriterOptions) -> None:
+        self.path = path
+        self.options = options
+        self._lock = threading.Lock()
+        self._handle: IO[bytes] | None = None
+        self._lock_fd: int | None = None
+        self._pid = 0
+        self._size = 0
+        self._opened_day = ""
+        self._last_fsync = 0.0
+        self._dirty = False
+        self._syncer: threading.Thread | None = None
+
+    def write_records(self, records: Iterable[dict[str, Any]]) -> str:
+        """Append ``records``; returns ``"fsynced"`` or ``"flushed"`` (see module docs)."""
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        encoded = data.encode("utf-8")
+        with self._lock, self._file_lock():
+            handle = self._open_for(len(encoded))
+            handle.write(encoded)
+            handle.flush()
+            self._size += len(encoded)
+            self._dirty = True
+            if self.options.fsync == "interval":
+                self._ensure_syncer()
+            if self.options.fsync == "always" or (
+                self.options.fsync == "interval"
+                and time.monotonic() - self._last_fsync >= self.options.fsync_interval
+            ):
+                self._fsync()
+                return "fsynced"
+            return "flushed"
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+            if self._lock_fd is not None and self._pid == os.getpid():
+                os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _sync_periodically(self) -> None:
+        while True:
+            time.sleep(self.options.fsync_interval)
+            with self._lock:
+                if self._handle is None or self._pid != os.getpid():
+                    self._syncer = None
+                    return
+                if self._dirty:
+                    self._fsync()
+
+    # -- internals (called with the lock held) -------------------------------
+
+    def _ensure_syncer(self) -> None:
+        if self._syncer is None or not self._syncer.is_alive():
+            self._syncer = threading.Thread(
+                target=self._sync_periodically, name=f"jsonl-fsync:{self.path.name}", daemon=True
+            )
+            self._syncer.start()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the exclusive cross-process lock on ``<file>.lock``."""
+        if fcntl is None:
+            yield
+            return
+        if self._lock_fd is not None and self._pid != os.getpid():
+            # Forked child: the inherited descriptor shares its lock with the
+            # parent. Closing this copy does not release the parent's lock.
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            self._handle = None
+        if self._lock_fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            lock_path = self.path.with_name(self.path.name + ".lock")
+            self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _open_for(self, incoming: int) -> IO[bytes]:
+        if self._handle is not None and self._pid != os.getpid():
+            # Forked child (e.g. a prefork Celery worker): the inherited handle
+            # belongs to the parent.
+            self._handle = None
+        if self._handle is not None:
+            self._follow_path()
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if self._handle is None:
+            self._open(today)
+        if (self.options.rotate_daily and today != self._opened_day) or (
+            self.options.max_bytes and self._size and self._size + incoming > self.options.max_bytes
+        ):
+            self._rotate()
+            self._open(today)
+        assert self._handle is not None
+        return self._handle
+
+    def _open(self, today: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.path.open("ab", buffering=self.options.buffer_bytes)
+        self._pid = os.getpid()
+        self._size = self._handle.tell()
+        self._opened_day = today
+
+    def _follow_path(self) -> None:
+        """Drop the handle if another writer rotated the file away; else refresh its size."""
+        assert self._handle is not None
+        opened = os.fstat(self._handle.fileno())
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            current = None
+        if current is None or (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+            self._close()
+        else:
+            # Other processes append to the same file.
+            self._size = opened.st_size
+
+    def _fsync(self) -> None:
+        if self._handle is not None and self._dirty:
+            os.fsync(self._handle.fileno())
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def _close(self) -> None:
+        if self._handle is None:
+            return
+        if self._pid == os.getpid():
+            self._handle.flush()
+            if self.options.fsync != "never":
+                self._fsync()
+            self._handle.close()
+        self._handle = None
+
+    def _rotate(self) -> None:
+        self._close()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        os.replace(self.path, rotated)
+        self._size = 0
+        if self.options.compress:
+            threading.Thread(target=_gzip_segment, args=(rotated,), daemon=True).start()
+
+
+def _gzip_segment(path: Path) -> None:
+    target = path.with_name(path.name + ".gz")
+    partial = target.with_name(target.name + ".part")
+    try:
+        with path.open("rb") as source, gzip.open(partial, "wb") as sink:
+            shutil.copyfileobj(source, sink)
+        os.replace(partial, target)
+        path.unlink()
+    except OSError:
+        logger.exception("Could not compress rotated accounting segment %s", path)
+        partial.unlink(missing_ok=True)
+
+
+_writers: dict[Path, RotatingJsonlWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_jsonl_writer(path: str | Path, options: JsonlWriterOptions) -> RotatingJsonlWriter:
+    """The process-wide writer for ``path``; a change of ``options`` reopens it."""
+    resolved = Path(path).expanduser().resolve()
+    with _writers_lock:
+        writer = _writers.get(resolved)
+        if writer is None or writer.options != options:
+            if writer is not None:
+                writer.close()
+            writer = _writers[resolved] = RotatingJsonlWriter(resolved, options)
+        return writer
+
+
+@atexit.register
+def close_jsonl_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
@@ -3,6 +3,11 @@
 These define the contract between the commerce runtime and provider adapters.
 Adapters live in ``wg-commerce`` (or third-party packages); the runtime resolves
 and calls them through these Protocols. Both sides depend only on this module.
+
+Adapters are registered with metadata naming their ``kind`` (one of the
+``KIND_*`` constants). The runtime reuses adapter instances: set
+``"thread_safe": True`` in the metadata when one instance may serve every
+thread, otherwise each thread gets its own.
 """
 
 from __future__ import annotations
@@ -111,6 +116,18 @@ class AccountingExporterAdapter(Protocol):
     ) -> AdapterResult: ...
 
 
+class BatchAccountingExporterAdapter(AccountingExporterAdapter, Protocol):
+    """Optional capability: export many records in one call.
+
+    Returns one result per payload, in the same order. The outbox worker
+    uses it for batches of accounting events when the adapter provides it.
+    """
+
+    def export_records(
+        self, payloads: list[dict[str, Any]], provider_config: dict[str, Any]
+    ) -> list[AdapterResult]: ...
+
+
 class TaxPricingProviderAdapter(Protocol):
     def calculate_totals(
         self, payload: dict[str, Any], provider_config: dict[str, Any]
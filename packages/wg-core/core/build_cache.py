@@ -69,6 +69,10 @@ class BuildCache:
     def record(self, key: str, page_hash: str) -> None:
         self._current[key] = page_hash
 
+    def stale_keys(self) -> list[str]:
+        """Outputs rendered by the previous build that this build did not produce."""
+        return sorted(set(self._previous) - set(self._current))
+
     def save(self) -> None:
         manifest = {"signature": self.build_signature, "pages": self._current}
         self.manifest_path.write_text(
@@ -20,6 +20,7 @@ from .router import Router
 from .runtime_manager import RuntimeManager
 from .site import Site
 from .theme_manager import ThemeManager
+from .tracing import NullTracer
 
 
 @dataclass
@@ -41,6 +42,22 @@ class BuildContext:
     # The Project facade, exposed to extension build hooks for backward
     # compatibility. Steps should prefer the explicit collaborators above.
     project: Any = None
+    # A core.discovery.ParsedDocumentCache for long-lived (watch/dev) projects.
+    parse_cache: Any = None
+    # A core.tracing.BuildTracer when tracing is enabled; NullTracer otherwise.
+    tracer: Any = field(default_factory=NullTracer)
     logger: logging.Logger = field(
         default_factory=lambda: logging.getLogger("core.build")
     )
+
+    def page_hook_kwargs(self, page: Any) -> dict[str, Any]:
+        """Keyword arguments shared by every per-page plugin hook.
+
+        Built once per page and reused for each hook invoked on that page.
+        """
+        return {
+            "site": self.site,
+            "config": self.config,
+            "fs_manager": self.fs_manager,
+            "page": page,
+        }
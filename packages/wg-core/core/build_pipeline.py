@@ -22,7 +22,12 @@ from .content_models import ContentModelError
 from .assets import AssetCopier, OutputPreparer
 from .discovery import ContentDiscoverer
 from .exporting import JsonExporter
+from .output_manifest import write_output_manifest
 from .rendering import PageRenderer
+from .tracing import CATEGORY_STEP
+
+# ``on_step(step_name, index, total)`` progress callback (index is 1-based).
+StepCallback = Callable[[str, int, int], None]
 
 
 @dataclass
@@ -67,15 +72,43 @@ class BuildPipeline:
             BuildStep("build_tailwind", self._build_tailwind),
             BuildStep("copy_assets", self.asset_copier.copy),
             BuildStep("after_build_hooks", self._after_build_hooks),
+            BuildStep("write_output_manifest", self._write_output_manifest),
         ]
 
-    def run(self) -> None:
+    def run(self, on_step: StepCallback | None = None) -> None:
+        """Run every step; ``on_step(name, index, total)`` is called before each one."""
+        tracer = self.ctx.tracer
+        # A warm session reuses the project (and its tracer) across builds.
+        tracer.reset()
         self.logger.info("Build process started.")
-        for step in self.steps:
-            self.logger.debug("Build step: %s", step.name)
-            step.run()
+        total = len(self.steps)
+        try:
+            for index, step in enumerate(self.steps, start=1):
+                self.logger.debug("Build step: %s", step.name)
+                if on_step is not None:
+                    on_step(step.name, index, total)
+                with tracer.span(step.name, CATEGORY_STEP):
+                    step.run()
+        finally:
+            if tracer.enabled:
+                self._export_trace()
+        if self.ctx.plugin_manager.plugins and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Plugin hook timings:\n%s", self.ctx.plugin_manager.format_timing_report()
+            )
         self.logger.info("Build process finished successfully.")
 
+    def _export_trace(self) -> None:
+        ctx = self.ctx
+        output_dir = Path(ctx.config.get("build.trace.output_dir", "./.wg-trace"))
+        trace_path, summary_path = ctx.tracer.export(output_dir, ctx.fs_manager)
+        self.logger.info(
+            "Build trace written to %s (summary: %s)\n%s",
+            trace_path,
+            summary_path,
+            ctx.tracer.format_summary_table(),
+        )
+
     # -- hook steps --------------------------------------------------------
 
     def _before_build_hooks(self) -> None:
@@ -214,3 +247,12 @@ class BuildPipeline:
 
     def _build_tailwind(self) -> None:
         build_tailwind(self.ctx.config)
+
+    def _write_output_manifest(self) -> None:
+        config = self.ctx.config
+        if not config.get("build.output_manifest", False):
+            return
+        write_output_manifest(
+            Path(config.get("build.output_directory")),
+            precompress=config.get("build.precompress", []) or [],
+        )
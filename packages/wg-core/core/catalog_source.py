@@ -9,19 +9,286 @@ infrastructure detail. This keeps wg-core independent of the Django runtime.
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import io
 import json
+import logging
+import os
+from pathlib import Path
+import shutil
+from typing import IO, Any, Iterator
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from urllib.request import Request, urlopen
 
+logger = logging.getLogger(__name__)
+
+_COPY_CHUNK_BYTES = 256 * 1024
+
+
+def _product_key(product: Any) -> str | None:
+    if not isinstance(product, dict):
+        return None
+    key = product.get("id") or product.get("slug")
+    return str(key) if key not in (None, "") else None
+
+
+def merge_catalog_delta(snapshot: dict[str, Any], delta: dict[str, Any]) -> bool:
+    """Apply a delta snapshot to ``snapshot`` in place; returns whether anything changed.
+
+    Products are matched by ``id`` (falling back to ``slug``). Changed products
+    replace their previous entry in place, new ones are appended, and IDs
+    listed under ``deleted`` are dropped. A product that is both deleted and
+    changed (re-published) is kept.
+    """
+    updates: dict[str, dict[str, Any]] = {}
+    for product in delta.get("products") or []:
+        key = _product_key(product)
+        if key is not None:
+            updates[key] = product
+    deleted = {str(product_id) for product_id in delta.get("deleted") or []}
+
+    products = snapshot.get("products")
+    changed = False
+    merged: list[Any] = []
+    for product in products if isinstance(products, list) else []:
+        key = _product_key(product)
+        if key in updates:
+            replacement = updates.pop(key)
+            changed = changed or replacement != product
+            merged.append(replacement)
+        elif key is not None and key in deleted:
+            changed = True
+        else:
+            merged.append(product)
+    if updates:
+        changed = True
+        merged.extend(updates.values())
+    snapshot["products"] = merged
+    if "cursor" in delta:
+        snapshot["cursor"] = delta["cursor"]
+    return changed
+
+
+def _metadata_path_for(snapshot_path: Path) -> Path:
+    return snapshot_path.with_suffix(".meta.json")
+
 
 class HttpCatalogSource:
-    """Fetches a catalog snapshot from an HTTP endpoint (the runtime service)."""
+    """Fetches a catalog snapshot from an HTTP endpoint (the runtime service).
+
+    With a ``cache_dir`` the last snapshot is kept on disk together with the
+    response's ``ETag`` / ``Last-Modified`` validators. The next fetch is a
+    conditional GET; on ``304 Not Modified`` the cached snapshot is reused and
+    :attr:`not_modified` is set so callers can skip downstream work.
+
+    When the cached snapshot carries a ``cursor`` and ``delta`` is enabled,
+    the request asks for ``?updated_since=<cursor>``. A delta response
+    (``"delta": true``) is merged into the cached snapshot with
+    :func:`merge_catalog_delta`. A delta that changes nothing counts as not
+    modified. Runtimes that ignore the parameter simply answer with a full
+    snapshot, which replaces the cache.
 
-    def __init__(self, url: str, *, timeout: int = 30) -> None:
+    Responses may be gzip-encoded. With a cache, the body is decompressed in
+    chunks straight into the cache file, so the compressed payload is never
+    held in memory. Decoding uses :func:`json.load`, which reads the whole
+    text before parsing (the standard library has no incremental decoder), so
+    the raw text and the decoded snapshot are briefly in memory together.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        timeout: int = 30,
+        cache_dir: str | Path | None = None,
+        delta: bool = True,
+    ) -> None:
         self.url = url
         self.timeout = timeout
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.delta = delta
+        self.not_modified = False
+
+    @property
+    def snapshot_path(self) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(self.url.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"snapshot-{key}.json"
+
+    @property
+    def _metadata_path(self) -> Path | None:
+        snapshot_path = self.snapshot_path
+        return _metadata_path_for(snapshot_path) if snapshot_path else None
 
     def fetch_snapshot(self) -> dict | None:
-        request = Request(self.url, headers={"Accept": "application/json"})
+        self.not_modified = False
+        state = self._load_state()
+        try:
+            return self._fetch(state)
+        except HTTPError as exc:
+            # Validators are only kept alongside a cached snapshot.
+            snapshot_path = self.snapshot_path
+            if exc.code != 304 or not state or snapshot_path is None:
+                raise
+        try:
+            snapshot: dict | None = self._read(snapshot_path)
+        except (OSError, ValueError) as exc:
+            logger.warning("Cached catalog snapshot is unreadable (%s); refetching.", exc)
+            self._discard_cache()
+            return self._fetch({})
+        self.not_modified = True
+        logger.info("Catalog snapshot not modified; reusing %s", snapshot_path)
+        return snapshot
+
+    def _request_url(self, state: dict[str, str]) -> str:
+        cursor = state.get("cursor")
+        if not (self.delta and cursor):
+            return self.url
+        parts = urlsplit(self.url)
+        query = parse_qsl(parts.query, keep_blank_values=True) + [("updated_since", cursor)]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def _fetch(self, state: dict[str, str]) -> dict | None:
+        headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        request = Request(self._request_url(state), headers=headers)
         with urlopen(request, timeout=self.timeout) as response:  # noqa: S310 - URL is config-controlled
-            payload = response.read()
-        return json.loads(payload.decode("utf-8"))
+            body: IO[bytes] | gzip.GzipFile = response
+            if response.headers.get("Content-Encoding", "").lower() == "gzip":
+                body = gzip.GzipFile(fileobj=response)
+            snapshot_path = self.snapshot_path
+            if snapshot_path is None:
+                return json.load(io.TextIOWrapper(body, encoding="utf-8"))
+            partial = self._download(body, snapshot_path)
+            response_headers = response.headers
+
+        document: dict | None = self._read(partial)
+        if isinstance(document, dict) and document.get("delta"):
+            partial.unlink(missing_ok=True)
+            try:
+                snapshot: dict = self._read(snapshot_path)
+            except (OSError, ValueError) as exc:
+                logger.warning("Cannot apply catalog delta (%s); refetching.", exc)
+                self._discard_cache()
+                return self._fetch({})
+            if merge_catalog_delta(snapshot, document):
+                self._write(snapshot, snapshot_path)
+                logger.info(
+                    "Catalog delta applied: %d changed, %d deleted.",
+                    len(document.get("products") or []),
+                    len(document.get("deleted") or []),
+                )
+            else:
+                self.not_modified = True
+            document = snapshot
+        else:
+            os.replace(partial, snapshot_path)
+        self._save_state(_metadata_path_for(snapshot_path), response_headers, document)
+        return document
+
+    # -- local snapshot cache ---------------------------------------------------
+
+    def _load_state(self) -> dict[str, str]:
+        snapshot_path = self.snapshot_path
+        if snapshot_path is None or not snapshot_path.exists():
+            return {}
+        metadata_path = _metadata_path_for(snapshot_path)
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(metadata, dict) or metadata.get("url") != self.url:
+            return {}
+        return {
+            key: str(metadata[key])
+            for key in ("etag", "last_modified", "cursor")
+            if metadata.get(key)
+        }
+
+    def _save_state(self, metadata_path: Path, headers: Any, snapshot: Any) -> None:
+        metadata = {
+            "url": self.url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "cursor": snapshot.get("cursor") if isinstance(snapshot, dict) else None,
+        }
+        metadata_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+    @staticmethod
+    def _download(body: IO[bytes] | gzip.GzipFile, snapshot_path: Path) -> Path:
+        partial = snapshot_path.with_suffix(".part")
+        partial.parent.mkdir(parents=True, exist_ok=True)
+        with partial.open("wb") as handle:
+            shutil.copyfileobj(body, handle, _COPY_CHUNK_BYTES)
+        return partial
+
+    @staticmethod
+    def _write(snapshot: dict[str, Any], snapshot_path: Path) -> None:
+        partial = snapshot_path.with_suffix(".part")
+        with partial.open("w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle, ensure_ascii=False, separators=(",", ":"))
+        os.replace(partial, snapshot_path)
+
+    @staticmethod
+    def _read(path: Path) -> Any:
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _discard_cache(self) -> None:
+        for path in (self.snapshot_path, self._metadata_path):
+            if path is not None:
+                path.unlink(missing_ok=True)
+
+
+class FileCatalogSource:
+    """Reads a catalog snapshot artifact from disk (no runtime service needed).
+
+    ``json`` files hold the same ``{"products": [...]}`` document the HTTP
+    endpoint returns. ``ndjson`` files hold one product object per line and
+    are decoded line by line. A ``.gz`` suffix is decompressed transparently.
+    The format defaults to the file suffix (``.ndjson`` / ``.jsonl`` mean
+    NDJSON).
+    """
+
+    FORMATS = ("json", "ndjson")
+
+    def __init__(self, path: str | Path, *, format: str | None = None) -> None:  # pylint: disable=redefined-builtin
+        self.path = Path(path)
+        self.format = format or self._infer_format(self.path)
+
+    @staticmethod
+    def _infer_format(path: Path) -> str:
+        suffixes = [suffix.lower() for suffix in path.suffixes if suffix.lower() != ".gz"]
+        return "ndjson" if suffixes and suffixes[-1] in {".ndjson", ".jsonl"} else "json"
+
+    def _open(self) -> IO[str]:
+        if self.path.suffix.lower() == ".gz":
+            return gzip.open(self.path, "rt", encoding="utf-8")
+        return self.path.open("r", encoding="utf-8")
+
+    def fetch_snapshot(self) -> dict | None:
+        if self.format not in self.FORMATS:
+            raise ValueError(
+                f"Unsupported catalog snapshot format '{self.format}'; expected json or ndjson."
+            )
+        with self._open() as handle:
+            if self.format == "json":
+                return json.load(handle)
+            return {"products": list(self._iter_lines(handle))}
+
+    def _iter_lines(self, handle: IO[str]) -> Iterator[dict[str, Any]]:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(
+                    f"{self.path}:{line_number}: expected a product object per line."
+                )
+            yield record
@@ -42,6 +42,12 @@ DEFAULT_SETTINGS: dict[str, Any] = {
         "log_level": 20,
         "strict": True,
         "incremental": False,
+        "output_manifest": False,
+        "precompress": [],
+        "trace": {
+            "enabled": False,
+            "output_dir": "./.wg-trace",
+        },
     },
     "extensions": {
         "enabled": [],
@@ -55,9 +61,15 @@ DEFAULT_SETTINGS: dict[str, Any] = {
         "targets": [],
         "catalog_snapshot": {
             "enabled": False,
+            "source": "http",
+            "path": "",
+            "format": "",
             "target": "",
             "url_path": "/catalog/snapshot",
             "output_dir": "./output/data/runtime",
+            "cache_dir": "./.wg-cache/catalog",
+            "delta": True,
+            "workers": 0,
         },
     },
     "integrations": {},
@@ -242,7 +254,22 @@ class Config:
                 "A collection uses type 'runtime_catalog' but runtime.catalog_snapshot.enabled is not true."
             )
 
-        if snapshot_enabled:
+        snapshot_source = (
+            str(catalog_snapshot.get("source", "http")).strip()
+            if isinstance(catalog_snapshot, dict)
+            else "http"
+        )
+        if snapshot_enabled and snapshot_source not in {"http", "file"}:
+            self.warnings.append(
+                "runtime.catalog_snapshot.source '%s' is not recognized; "
+                "supported values are 'http' and 'file'." % snapshot_source
+            )
+        elif snapshot_enabled and snapshot_source == "file":
+            if not str(catalog_snapshot.get("path", "")).strip():
+                self.warnings.append(
+                    "runtime.catalog_snapshot.source is 'file' but no runtime.catalog_snapshot.path is set."
+                )
+        elif snapshot_enabled:
             named_targets: list[str] = []
             if isinstance(runtime_targets, list):
                 for raw_target in runtime_targets:
@@ -63,6 +63,12 @@ class ThemeConfig:
     customizer: dict[str, Any]
 
 
+@dataclass(frozen=True)
+class TraceConfig:
+    enabled: bool = False
+    output_dir: str = "./.wg-trace"
+
+
 @dataclass(frozen=True)
 class BuildConfig:
     output_directory: str
@@ -72,6 +78,9 @@ class BuildConfig:
     log_level: int
     strict: bool = True
     incremental: bool = False
+    output_manifest: bool = False
+    precompress: list[str] = field(default_factory=list)
+    trace: TraceConfig = field(default_factory=TraceConfig)
 
 
 @dataclass(frozen=True)
@@ -162,6 +171,7 @@ def build_app_config(settings: dict[str, Any]) -> AppConfig:
 
     export_data_cfg = _as_dict(experimental_cfg.get("export_data"))
     tailwind_cfg = _as_dict(experimental_cfg.get("tailwind"))
+    trace_cfg = _as_dict(build_cfg.get("trace"))
 
     return AppConfig(
         version=int(settings.get("version", 2)),
@@ -189,6 +199,12 @@ def build_app_config(settings: dict[str, Any]) -> AppConfig:
             log_level=int(build_cfg.get("log_level", 20)),
             strict=bool(build_cfg.get("strict", True)),
             incremental=bool(build_cfg.get("incremental", False)),
+            output_manifest=bool(build_cfg.get("output_manifest", False)),
+            precompress=[str(e) for e in _as_list(build_cfg.get("precompress"))],
+            trace=TraceConfig(
+                enabled=bool(trace_cfg.get("enabled", False)),
+                output_dir=str(trace_cfg.get("output_dir", "./.wg-trace")),
+            ),
         ),
         experimental=ExperimentalConfig(
             export_data=ExportDataConfig(
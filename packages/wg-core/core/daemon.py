@@ -0,0 +1,258 @@
+"""Persistent build daemon (``wg daemon``).
+
+A cold ``wg build`` pays for interpreter start-up, config bootstrap,
+extension loading, template-engine creation and theme manifest loading
+before any real work. The daemon keeps one warm
+:class:`~core.warm_build.WarmBuildSession` per ``(working directory, config)``
+and accepts requests over a local Unix socket.
+
+Protocol: the client sends one JSON object per connection, terminated by a
+newline. The daemon answers with newline-delimited JSON messages: zero or more
+``{"event": "step", "name", "index", "total"}`` progress messages followed by
+exactly one ``{"event": "result", ...}`` or ``{"event": "error", "message"}``.
+
+Commands:
+
+- ``build``: bring the output up to date. The first request for a config
+  performs a cold build. Later requests rebuild only what the session's file
+  watcher saw change since the previous request. ``"full": true`` forces a cold
+  build.
+- ``partial``: like ``build``, with ``"paths"`` added to the changed set.
+  Editors use it to rebuild a just-saved file without waiting for the watcher.
+- ``status``: report the daemon's warm projects and their last build.
+- ``stop``: shut the daemon down.
+
+Config files use paths relative to the project directory, and the working
+directory is process-wide. Builds are therefore serialized, and each one runs
+with the cwd set to the requesting client's ``cwd``.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Iterator
+
+from .daemon_client import check_private_directory, default_socket_path
+from .warm_build import FULL, RebuildReport, WarmBuildSession
+from .watcher import FileWatcher, create_watcher
+
+logger = logging.getLogger(__name__)
+
+_MAX_REQUEST_BYTES = 1024 * 1024
+
+Emit = Callable[[dict[str, Any]], None]
+
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@dataclass
+class _WarmProject:
+    cwd: Path
+    config: Path
+    session: WarmBuildSession
+    watcher: FileWatcher | None = None
+    builds: int = 0
+
+    def reset_watcher(self) -> None:
+        if self.watcher is not None:
+            self.watcher.close()
+        self.watcher = create_watcher(self.session.watch_paths())
+
+    def pending_changes(self) -> set[Path]:
+        return self.watcher.poll(0) if self.watcher is not None else set()
+
+    def close(self) -> None:
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+
+def _report_payload(report: RebuildReport) -> dict[str, Any]:
+    return {
+        "ok": report.ok,
+        "mode": report.mode,
+        "changed": [str(path) for path in report.changed],
+        "rendered": len(report.rendered),
+        "removed": len(report.removed),
+        "seconds": round(report.seconds, 4),
+        "error": report.error,
+    }
+
+
+class BuildDaemon:
+    """Transport-independent request handling for the daemon."""
+
+    def __init__(self) -> None:
+        self._projects: dict[tuple[Path, Path], _WarmProject] = {}
+        self._build_lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests = 0
+
+    def dispatch(self, request: dict[str, Any], emit: Emit) -> dict[str, Any]:
+        """Handle one request, streaming progress through ``emit``; returns the result."""
+        self.requests += 1
+        command = request.get("command")
+        if command == "status":
+            return self.status()
+        if command in {"build", "partial"}:
+            return self.build(request, emit)
+        raise ValueError(f"Unknown daemon command: {command!r}")
+
+    def build(self, request: dict[str, Any], emit: Emit) -> dict[str, Any]:
+        cwd = Path(request.get("cwd") or os.getcwd()).resolve()
+        config = (cwd / str(request.get("config") or "config.yaml")).resolve()
+        extra_paths = {(cwd / str(path)).resolve() for path in request.get("paths") or []}
+
+        def on_step(name: str, index: int, total: int) -> None:
+            emit({"event": "step", "name": name, "index": index, "total": total})
+
+        with self._build_lock, _working_directory(cwd):
+            key = (cwd, config)
+            project = self._projects.get(key)
+            if project is None:
+                project = _WarmProject(cwd=cwd, config=config, session=WarmBuildSession(config))
+                self._projects[key] = project
+
+            session = project.session
+            output_missing = session.project is not None and not Path(
+                session.project.config.get("build.output_directory")
+            ).exists()
+            if session.project is None or request.get("full") or output_missing:
+                report = session.build(on_step)
+            else:
+                report = session.rebuild(project.pending_changes() | extra_paths, on_step)
+
+            if report.mode == FULL or project.watcher is None:
+                project.reset_watcher()
+            project.builds += 1
+
+        return _report_payload(report)
+
+    def status(self) -> dict[str, Any]:
+        projects = []
+        for project in self._projects.values():
+            session = project.session
+            last = session.last_report
+            projects.append(
+                {
+                    "cwd": str(project.cwd),
+                    "config": str(project.config),
+                    "builds": project.builds,
+                    "pages": len(session.project.site.pages) if session.project else 0,
+                    "watcher": getattr(project.watcher, "backend", None),
+                    "last": _report_payload(last) if last is not None else None,
+                }
+            )
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "projects": projects,
+        }
+
+    def close(self) -> None:
+        for project in self._projects.values():
+            project.close()
+        self._projects.clear()
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        self._connected = True
+        line = self.rfile.readline(_MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as exc:
+            self._send({"event": "error", "message": f"Invalid request: {exc}"})
+            return
+
+        if request.get("command") == "stop":
+            self._send({"event": "result", "ok": True, "stopping": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        try:
+            result = self.server.build_daemon.dispatch(request, self._send)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Daemon request failed: %s", exc, exc_info=True)
+            self._send({"event": "error", "message": str(exc)})
+            return
+        self._send({"event": "result", **result})
+
+    def _send(self, message: dict[str, Any]) -> None:
+        # A client that hung up must not abort the build it started.
+        if not self._connected:
+            return
+        try:
+            self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        except OSError:
+            self._connected = False
+
+
+# ``UnixStreamServer`` does not exist on platforms without Unix sockets
+# (Windows); the module must still import there.
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, socket_path: Path, daemon: BuildDaemon | None = None) -> None:
+            self.socket_path = Path(socket_path)
+            self.build_daemon = daemon or BuildDaemon()
+            # Create the socket owner-only; a chmod after bind() leaves a window
+            # in which other users could connect.
+            previous_umask = os.umask(0o177)
+            try:
+                super().__init__(str(self.socket_path), _DaemonRequestHandler)
+            finally:
+                os.umask(previous_umask)
+
+        def server_close(self) -> None:
+            super().server_close()
+            self.build_daemon.close()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def create_daemon_server(socket_path: str | Path | None = None) -> DaemonServer:
+    """Bind the daemon socket, replacing a stale one left by a crashed daemon."""
+    if not hasattr(socketserver, "UnixStreamServer"):
+        raise RuntimeError("wg daemon requires Unix domain sockets, which this platform lacks.")
+    if socket_path:
+        path = Path(socket_path)
+    else:
+        path = default_socket_path()
+        check_private_directory(path.parent, create=True)
+    if path.exists():
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(str(path))
+        except OSError:
+            path.unlink()
+        else:
+            raise RuntimeError(f"A wg daemon is already listening on {path}")
+    return DaemonServer(path)
@@ -0,0 +1,77 @@
+"""Client side of the ``wg daemon`` protocol.
+
+Kept free of build imports so ``wg daemon build`` starts as fast as the
+interpreter allows; the point of the daemon is to skip that cold start.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import socket
+import stat
+import tempfile
+from typing import Any, Callable
+
+
+def default_socket_path() -> Path:
+    """Per-user socket path, in a directory only this user can access.
+
+    ``$XDG_RUNTIME_DIR`` is used when set, otherwise a private ``wg-<uid>``
+    directory in the system temp directory (see :func:`check_private_directory`).
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and Path(runtime_dir).is_dir():
+        return Path(runtime_dir) / "wg-daemon.sock"
+    user = os.getuid() if hasattr(os, "getuid") else "user"
+    return Path(tempfile.gettempdir()) / f"wg-{user}" / "daemon.sock"
+
+
+def check_private_directory(directory: Path, *, create: bool = False) -> None:
+    """Refuse a socket directory another user owns or can enter.
+
+    In a shared temp directory anyone can create ``wg-<uid>`` first; a squatted
+    directory must not be used to talk to, or impersonate, the daemon.
+    """
+    if not hasattr(os, "getuid"):
+        return
+    if create:
+        directory.mkdir(mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(
+            f"{directory} must be a directory owned by the current user and closed to "
+            "others (mode 0700) to hold the wg daemon socket."
+        )
+
+
+def request_daemon(
+    request: dict[str, Any],
+    socket_path: str | Path | None = None,
+    *,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Send ``request`` to the daemon and return its final ``result``/``error`` message.
+
+    Progress messages received before the result are passed to ``on_event``.
+    """
+    if socket_path:
+        path = Path(socket_path)
+    else:
+        path = default_socket_path()
+        if path.parent.exists():
+            check_private_directory(path.parent)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                message: dict[str, Any] = json.loads(line)
+                if message.get("event") in {"result", "error"}:
+                    return message
+                if on_event is not None:
+                    on_event(message)
+    raise ConnectionError("The wg daemon closed the connection without a result.")
@@ -0,0 +1,259 @@
+"""Live-reload development server (``wg serve --dev``).
+
+The dev server builds through a :class:`~core.warm_build.WarmBuildSession`
+whose filesystem is an :class:`~utils.fs_manager.OutputOverlayFileSystem`:
+rendered pages live in an in-memory output map and are served straight from
+it, while binary assets copied into the output directory are served from disk.
+
+After every rebuild the server publishes an event on
+:data:`LIVE_RELOAD_PATH`, a Server-Sent Events stream. HTML responses get a
+small client script (:data:`LIVE_RELOAD_SNIPPET`) injected before ``</body>``
+that listens on that stream and reloads the page. The snippet is only ever
+added by this server; ``wg build`` output never contains it.
+
+Everything runs on the standard library ``ThreadingHTTPServer``.
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+
+from utils.fs_manager import OutputOverlayFileSystem
+from .warm_build import RebuildReport, WarmBuildSession, watch_and_rebuild
+
+logger = logging.getLogger(__name__)
+
+LIVE_RELOAD_PATH = "/__wg/livereload"
+LIVE_RELOAD_SNIPPET = (
+    "<script>(function(){"
+    f'var source=new EventSource("{LIVE_RELOAD_PATH}");'
+    "source.onmessage=function(event){"
+    "var message=JSON.parse(event.data);"
+    'if(message.type==="reload"){window.location.reload();}'
+    'else if(message.type==="error"){console.error("[wg] rebuild failed: "+message.message);}'
+    "};"
+    "})();</script>"
+)
+
+_HEARTBEAT_SECONDS = 15.0
+
+
+def inject_live_reload(html: bytes) -> bytes:
+    """Insert the live-reload client before the closing ``</body>`` tag (or append it)."""
+    snippet = LIVE_RELOAD_SNIPPET.encode("utf-8")
+    index = html.lower().rfind(b"</body>")
+    if index == -1:
+        return html + snippet
+    return html[:index] + snippet + html[index:]
+
+
+class ReloadBroadcaster:
+    """Fan-out of rebuild events to every connected SSE client.
+
+    Clients only need the latest event, so bursts are coalesced: a client that
+    was busy writing sees the most recent event once, not each one it missed.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._event: dict[str, Any] | None = None
+        self.version = 0
+        self.closed = False
+
+    def publish(self, event: dict[str, Any]) -> None:
+        with self._condition:
+            self.version += 1
+            self._event = event
+            self._condition.notify_all()
+
+    def wait_for(self, seen_version: int, timeout: float) -> tuple[int, dict[str, Any]] | None:
+        """Return ``(version, event)`` once newer than ``seen_version``, or ``None`` on timeout/close."""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.version != seen_version or self.closed, timeout=timeout
+            )
+            if self.closed or self.version == seen_version or self._event is None:
+                return None
+            return self.version, self._event
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class DevServer(ThreadingHTTPServer):
+    """HTTP server bound to a warm build session and its in-memory output."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        session: WarmBuildSession,
+        overlay: OutputOverlayFileSystem,
+        *,
+        live_reload: bool = True,
+    ) -> None:
+        self.session = session
+        self.overlay = overlay
+        self.live_reload = live_reload
+        self.broadcaster = ReloadBroadcaster()
+        super().__init__(address, DevRequestHandler)
+
+    def publish_report(self, report: RebuildReport) -> None:
+        """Tell connected browsers about a finished rebuild."""
+        if not report.ok:
+            self.broadcaster.publish({"type": "error", "message": report.error})
+        elif report.mode != "noop":
+            self.broadcaster.publish(
+                {
+                    "type": "reload",
+                    "mode": report.mode,
+                    "rendered": len(report.rendered),
+                    "seconds": round(report.seconds, 3),
+                }
+            )
+
+    def apply_changes(self, changed: set[Path]) -> RebuildReport:
+        report = self.session.rebuild(changed)
+        self.publish_report(report)
+        return report
+
+    def server_close(self) -> None:
+        self.broadcaster.close()
+        super().server_close()
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the in-memory output map first, then the output directory on disk."""
+
+    server: DevServer
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, directory=str(args[2].overlay.output_dir), **kwargs)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == LIVE_RELOAD_PATH:
+            self._stream_reload_events()
+            return
+        if not self._serve_from_memory(head_only=False):
+            super().do_GET()
+
+    def do_HEAD(self) -> None:
+        if not self._serve_from_memory(head_only=True):
+            super().do_HEAD()
+
+    def _memory_lookup(self) -> tuple[Path, bytes] | None:
+        translated = Path(self.translate_path(self.path))
+        overlay = self.server.overlay
+        candidates = [translated]
+        if urlsplit(self.path).path.endswith("/") or translated.is_dir():
+            candidates = [translated / "index.html"]
+        # Wait for an in-flight rebuild so a reload never sees half-written output.
+        with self.server.session.lock:
+            for candidate in candidates:
+                data = overlay.get_output(candidate)
+                if data is not None:
+                    return candidate, data
+        return None
+
+    def _serve_from_memory(self, *, head_only: bool) -> bool:
+        found = self._memory_lookup()
+        if found is None:
+            return False
+        path, body = found
+        content_type = self.guess_type(str(path))
+        if self.server.live_reload and content_type == "text/html":
+            body = inject_live_reload(body)
+        if content_type.startswith("text/") or content_type in {"application/json", "application/xml"}:
+            content_type += "; charset=utf-8"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+        return True
+
+    def _stream_reload_events(self) -> None:
+        broadcaster = self.server.broadcaster
+        seen = broadcaster.version
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            while not broadcaster.closed:
+                received = broadcaster.wait_for(seen, timeout=_HEARTBEAT_SECONDS)
+                if received is None:
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    seen, event = received
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def create_dev_server(
+    config_path: str | Path,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    live_reload: bool = True,
+) -> DevServer:
+    """Run the initial build and return a server ready for ``serve_forever``."""
+    from .bootstrap import bootstrap
+
+    config = bootstrap(config_path)
+    output_dir = Path(config.get("build.output_directory", config.get("output_directory")))
+    overlay = OutputOverlayFileSystem(output_dir)
+    session = WarmBuildSession(config_path, fs_manager=overlay)
+    report = session.build()
+    if not report.ok:
+        logger.error("Initial build failed; fix the error and save to rebuild.")
+    os.makedirs(overlay.output_dir, exist_ok=True)
+    return DevServer((host, port), session, overlay, live_reload=live_reload)
+
+
+def run_dev_server(
+    config_path: str | Path,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    interval: float = 1.0,
+    force_polling: bool = False,
+    debounce: float = 0.15,
+) -> None:
+    """Serve with live reload, rebuilding on change until interrupted."""
+    server = create_dev_server(config_path, host, port)
+    thread = threading.Thread(target=server.serve_forever, name="wg-dev-server", daemon=True)
+    thread.start()
+    logger.info("Dev server with live reload at http://%s:%s", host, server.server_address[1])
+    try:
+        watch_and_rebuild(
+            server.session,
+            interval=interval,
+            force_polling=force_polling,
+            debounce=debounce,
+            on_report=server.publish_report,
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
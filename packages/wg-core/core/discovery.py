@@ -7,23 +7,127 @@ testable responsibility.
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import multiprocessing
 import os
 from copy import deepcopy
 from pathlib import Path
 from typing import Any
 
-from slugify import slugify
-
 from processor.factory import _PROCESSOR_MAP, create_content_processor
 from .build_context import BuildContext
 from .page import Page
+from .routing import bulk_slugify
 
 supported_extensions = list(_PROCESSOR_MAP.keys())
 
 
+# Below this many products a process pool costs more than it saves.
+_POOL_MIN_PRODUCTS = 20_000
+_POOL_CHUNK_SIZE = 5_000
+
+
+def normalize_catalog_products(
+    products: list[Any], collection_cfg: dict
+) -> list[dict[str, Any] | None]:
+    """Normalize runtime products into page metadata in one pass (``None`` = skipped).
+
+    The result shares nested values (runtime metadata values, variant dicts)
+    with the snapshot instead of deep-copying them: generated product pages
+    treat them as read-only, and content models copy metadata before
+    normalizing it. Slugs for products without one are computed once per
+    distinct name. Module-level so it can run in a worker process.
+    """
+    model = str(collection_cfg.get("model", "product"))
+    page_type_default = model.strip() or "product"
+    collection_layout = collection_cfg.get("layout")
+
+    entries: list[tuple[dict[str, Any], str] | None] = []
+    for product in products:
+        if not isinstance(product, dict):
+            entries.append(None)
+            continue
+        name = str(product.get("name", product.get("title", ""))).strip()
+        entries.append((product, name) if name else None)
+    slugs = bulk_slugify(
+        entry[1] for entry in entries if entry is not None and not str(entry[0].get("slug", "")).strip()
+    )
+
+    normalized_products: list[dict[str, Any] | None] = []
+    for entry in entries:
+        if entry is None:
+            normalized_products.append(None)
+            continue
+        product, name = entry
+        runtime_metadata = product.get("metadata")
+        if not isinstance(runtime_metadata, dict):
+            runtime_metadata = {}
+
+        raw_variants = product.get("variants")
+        variants = (
+            [variant for variant in raw_variants if isinstance(variant, dict)]
+            if isinstance(raw_variants, list)
+            else []
+        )
+        first_variant = variants[0] if variants else {}
+
+        slug = str(product.get("slug", "")).strip() or slugs[name]
+        description = str(product.get("description", "")).strip()
+        summary = str(product.get("summary", description)).strip()
+
+        sku_value = product.get("sku")
+        if sku_value is None or sku_value == "":
+            sku_value = first_variant.get("sku", "")
+
+        price_value = product.get("price")
+        if price_value is None or price_value == "":
+            price_value = first_variant.get("price")
+
+        currency_value = (
+            product.get("currency")
+            or first_variant.get("currency", "")
+            or runtime_metadata.get("currency", "")
+        )
+        availability_value = product.get(
+            "availability", runtime_metadata.get("availability", "in_stock")
+        )
+        page_type = str(product.get("type", page_type_default)).strip() or "product"
+        layout_value = (
+            product.get("layout") or collection_layout or runtime_metadata.get("layout", "")
+        )
+
+        normalized = dict(runtime_metadata)
+        normalized["title"] = name
+        normalized["slug"] = slug
+        normalized["summary"] = summary
+        normalized["description"] = description
+        normalized["type"] = page_type
+        normalized["model"] = model
+        normalized["variants"] = variants
+        if layout_value:
+            normalized["layout"] = str(layout_value)
+
+        if sku_value is not None and sku_value != "":
+            normalized["sku"] = str(sku_value)
+        if price_value is not None and price_value != "":
+            normalized["price"] = price_value
+        if currency_value is not None and currency_value != "":
+            normalized["currency"] = str(currency_value)
+        if availability_value is not None and availability_value != "":
+            normalized["availability"] = str(availability_value)
+
+        normalized_products.append(normalized)
+    return normalized_products
+
+
 class RuntimeCatalogIngestor:
-    """Turns a runtime catalog snapshot into generated product pages."""
+    """Turns a runtime catalog snapshot into generated product pages.
+
+    Products are normalized in one batched pass (optionally spread over
+    ``runtime.catalog_snapshot.workers`` processes for very large catalogs)
+    and then turned into pages without per-product deep copies.
+    """
 
     def __init__(self, ctx: BuildContext) -> None:
         self.ctx = ctx
@@ -49,12 +153,10 @@ class RuntimeCatalogIngestor:
 
         route_prefix = collection_cfg.get("route", {}).get("prefix", "")
         output_dir = Path(ctx.config.get("build.output_directory", "./output"))
-        for product in products:
-            if not isinstance(product, dict):
-                continue
-
-            page_metadata = self._normalize_product(product, collection_cfg)
+        skipped = 0
+        for page_metadata in self._normalize(products, collection_cfg):
             if page_metadata is None:
+                skipped += 1
                 continue
 
             page = Page(Path(), ctx.config, ctx.fs_manager)
@@ -69,79 +171,101 @@ class RuntimeCatalogIngestor:
 
             page.processed_content = ""
             page.raw_content = ""
-            page.model_data = deepcopy(page_metadata)
+            page.model_data = dict(page_metadata)
 
             if not page.get_output_path():
                 page.calculate_output_path(output_dir)
 
             ctx.site.add_page(page)
 
-    def _normalize_product(
-        self, product: dict[str, Any], collection_cfg: dict
-    ) -> dict[str, Any] | None:
-        runtime_metadata = product.get("metadata", {})
-        if not isinstance(runtime_metadata, dict):
-            runtime_metadata = {}
+        if skipped:
+            self.logger.warning(
+                "Skipped %d runtime catalog entr%s without a name/title in collection '%s'.",
+                skipped,
+                "y" if skipped == 1 else "ies",
+                collection_name,
+            )
 
-        raw_variants = product.get("variants", [])
-        variants: list[dict[str, Any]] = []
-        if isinstance(raw_variants, list):
-            for raw_variant in raw_variants:
-                if isinstance(raw_variant, dict):
-                    variants.append(deepcopy(raw_variant))
+    def _normalize(
+        self, products: list[Any], collection_cfg: dict
+    ) -> list[dict[str, Any] | None]:
+        workers = self._worker_count()
+        if workers < 2 or len(products) < _POOL_MIN_PRODUCTS:
+            return normalize_catalog_products(products, collection_cfg)
+
+        chunks = [
+            products[start : start + _POOL_CHUNK_SIZE]
+            for start in range(0, len(products), _POOL_CHUNK_SIZE)
+        ]
+        self.logger.info(
+            "Normalizing %d runtime products in %d chunk(s) across %d worker processes.",
+            len(products),
+            len(chunks),
+            workers,
+        )
+        # "spawn" keeps worker start-up safe when the build runs inside a
+        # threaded process (dev server, daemon).
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            results = pool.map(
+                normalize_catalog_products, chunks, [collection_cfg] * len(chunks)
+            )
+            return [entry for chunk in results for entry in chunk]
 
-        first_variant = variants[0] if variants else {}
-        name = str(product.get("name", product.get("title", ""))).strip()
-        if not name:
-            self.logger.warning("Skipping runtime catalog product with missing name/title.")
-            return None
+    def _worker_count(self) -> int:
+        try:
+            return int(self.ctx.config.get("runtime.catalog_snapshot.workers", 0) or 0)
+        except (TypeError, ValueError):
+            return 0
 
-        slug = str(product.get("slug", "")).strip() or slugify(name)
-        description = str(product.get("description", "")).strip()
-        summary = str(product.get("summary", description)).strip()
 
-        sku_value = product.get("sku")
-        if (sku_value is None or sku_value == "") and isinstance(first_variant, dict):
-            sku_value = first_variant.get("sku", "")
+class ParsedDocumentCache:
+    """Keeps parsed source documents warm between builds of a long-lived project.
 
-        price_value = product.get("price")
-        if (price_value is None or price_value == "") and isinstance(first_variant, dict):
-            price_value = first_variant.get("price")
+    Entries are keyed by source path and validated against the file's mtime and
+    size, so an unchanged document skips reading, front matter parsing and
+    Markdown conversion. Used by watch mode and the dev servers; one-shot
+    builds run without it.
+    """
 
-        currency_value = (
-            product.get("currency")
-            or (first_variant.get("currency", "") if isinstance(first_variant, dict) else "")
-            or runtime_metadata.get("currency", "")
-        )
-        availability_value = product.get("availability", runtime_metadata.get("availability", "in_stock"))
-        page_type = str(product.get("type", collection_cfg.get("model", "product"))).strip() or "product"
-        layout_value = (
-            product.get("layout")
-            or collection_cfg.get("layout")
-            or runtime_metadata.get("layout", "")
-        )
+    def __init__(self) -> None:
+        self._entries: dict[Path, tuple[tuple[int, int], str, str, dict[str, Any]]] = {}
 
-        normalized = deepcopy(runtime_metadata)
-        normalized["title"] = name
-        normalized["slug"] = slug
-        normalized["summary"] = summary
-        normalized["description"] = description
-        normalized["type"] = page_type
-        normalized["model"] = str(collection_cfg.get("model", "product"))
-        normalized["variants"] = variants
-        if layout_value:
-            normalized["layout"] = str(layout_value)
+    def _stamp(self, path: Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def restore(self, page: Page) -> bool:
+        entry = self._entries.get(page.source_filepath)
+        if entry is None or entry[0] != self._stamp(page.source_filepath):
+            return False
+        _, raw_content, processed_content, metadata = entry
+        page.raw_content = raw_content
+        page.processed_content = processed_content
+        page.metadata = deepcopy(metadata)
+        page._populate_attributes()
+        return True
+
+    def store(self, page: Page) -> None:
+        stamp = self._stamp(page.source_filepath)
+        if stamp is None:
+            return
+        self._entries[page.source_filepath] = (
+            stamp,
+            page.raw_content,
+            page.processed_content,
+            deepcopy(page.metadata),
+        )
 
-        if sku_value is not None and sku_value != "":
-            normalized["sku"] = str(sku_value)
-        if price_value is not None and price_value != "":
-            normalized["price"] = price_value
-        if currency_value is not None and currency_value != "":
-            normalized["currency"] = str(currency_value)
-        if availability_value is not None and availability_value != "":
-            normalized["availability"] = str(availability_value)
+    def discard(self, path: Path) -> None:
+        self._entries.pop(path, None)
 
-        return normalized
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class ContentDiscoverer:
@@ -208,16 +332,10 @@ class ContentDiscoverer:
                 page.collection_config = cfg
                 page.set_route_prefix(cfg.get("route", {}).get("prefix", ""))
 
-                ctx.plugin_manager.run_hook(
-                    "before_page_parsed",
-                    site=ctx.site,
-                    config=ctx.config,
-                    fs_manager=ctx.fs_manager,
-                    page=page,
-                )
+                hook_kwargs = ctx.page_hook_kwargs(page)
+                ctx.plugin_manager.run_hook("before_page_parsed", **hook_kwargs)
 
-                processor = create_content_processor(ext)
-                page.load(processor)
+                self._load_page(page, ext)
                 apply_collection_defaults(page, cfg)
 
                 if page.draft:
@@ -226,20 +344,16 @@ class ContentDiscoverer:
 
                 ctx.site.add_page(page)
 
-                ctx.plugin_manager.run_hook(
-                    "after_document_loaded",
-                    site=ctx.site,
-                    config=ctx.config,
-                    fs_manager=ctx.fs_manager,
-                    page=page,
-                )
-                ctx.plugin_manager.run_hook(
-                    "after_page_parsed",
-                    site=ctx.site,
-                    config=ctx.config,
-                    fs_manager=ctx.fs_manager,
-                    page=page,
-                )
+                ctx.plugin_manager.run_hook("after_document_loaded", **hook_kwargs)
+                ctx.plugin_manager.run_hook("after_page_parsed", **hook_kwargs)
+
+    def _load_page(self, page: Page, ext: str) -> None:
+        cache = self.ctx.parse_cache
+        if cache is not None and cache.restore(page):
+            return
+        page.load(create_content_processor(ext))
+        if cache is not None:
+            cache.store(page)
 
     def _discover_flat_source(self, output_dir: Path) -> None:
         ctx = self.ctx
@@ -255,16 +369,10 @@ class ContentDiscoverer:
                 continue
 
             page = Page(path, ctx.config, ctx.fs_manager)
-            ctx.plugin_manager.run_hook(
-                "before_page_parsed",
-                site=ctx.site,
-                config=ctx.config,
-                fs_manager=ctx.fs_manager,
-                page=page,
-            )
+            hook_kwargs = ctx.page_hook_kwargs(page)
+            ctx.plugin_manager.run_hook("before_page_parsed", **hook_kwargs)
 
-            processor = create_content_processor(ext)
-            page.load(processor)
+            self._load_page(page, ext)
             if page.draft:
                 continue
 
@@ -272,20 +380,8 @@ class ContentDiscoverer:
                 page.calculate_output_path(output_dir)
 
             ctx.site.add_page(page)
-            ctx.plugin_manager.run_hook(
-                "after_document_loaded",
-                site=ctx.site,
-                config=ctx.config,
-                fs_manager=ctx.fs_manager,
-                page=page,
-            )
-            ctx.plugin_manager.run_hook(
-                "after_page_parsed",
-                site=ctx.site,
-                config=ctx.config,
-                fs_manager=ctx.fs_manager,
-                page=page,
-            )
+            ctx.plugin_manager.run_hook("after_document_loaded", **hook_kwargs)
+            ctx.plugin_manager.run_hook("after_page_parsed", **hook_kwargs)
 
 
 def apply_collection_defaults(page: Page, collection_cfg: dict) -> None:
@@ -13,6 +13,7 @@ from slugify import slugify
 
 from utils.fs_manager import FileSystemManager
 from .content_models import ContentModelRegistry, DEFAULT_MODELS
+from .tracing import CATEGORY_EXTENSION_HOOK, NullTracer
 
 
 class DefinitionRegistry:
@@ -49,6 +50,9 @@ class BuildHookRegistry:
     def register(self, hook_name: str, func: Callable[..., Any]) -> None:
         self._hooks.setdefault(str(hook_name), []).append(func)
 
+    def get(self, hook_name: str) -> list[Callable[..., Any]]:
+        return list(self._hooks.get(str(hook_name), []))
+
     def run(self, hook_name: str, **kwargs) -> list[Any]:
         results: list[Any] = []
         for func in self._hooks.get(str(hook_name), []):
@@ -114,10 +118,11 @@ class LoadedExtension:
 class ExtensionManager:
     """Loads extension packages and exposes their registries to the build."""
 
-    def __init__(self, config, fs_manager: FileSystemManager) -> None:
+    def __init__(self, config, fs_manager: FileSystemManager, *, tracer=None) -> None:
         self.logger = logging.getLogger(__name__)
         self.config = config
         self.fs_manager = fs_manager
+        self.tracer = tracer or NullTracer()
         self.api = ExtensionAPI()
         self.loaded_extensions: list[LoadedExtension] = []
 
@@ -168,7 +173,15 @@ class ExtensionManager:
         return self.loaded_extensions
 
     def run_build_hook(self, hook_name: str, **kwargs) -> list[Any]:
-        return self.api.build_hooks.run(hook_name, **kwargs)
+        if not self.tracer.enabled:
+            return self.api.build_hooks.run(hook_name, **kwargs)
+
+        results: list[Any] = []
+        for func in self.api.build_hooks.get(hook_name):
+            label = getattr(func, "__qualname__", None) or repr(func)
+            with self.tracer.span(f"{label}@{hook_name}", CATEGORY_EXTENSION_HOOK):
+                results.append(func(**kwargs))
+        return results
 
     def get_template_dirs(self) -> list[str]:
         template_dirs: list[str] = []
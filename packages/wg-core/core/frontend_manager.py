@@ -364,6 +364,61 @@ def build_static_islands_bundle(
       return;
     }
 
+    function showLookupError(error) {
+      var result = element.querySelector('[data-order-status-result]');
+      if (result) {
+        result.textContent = error.message || 'Order status lookup failed.';
+      }
+    }
+
+    function fetchStatus(baseUrl, orderId) {
+      return fetch(baseUrl + '/orders/' + encodeURIComponent(orderId), {
+        method: 'GET'
+      }).then(function (response) {
+        if (!response.ok) {
+          throw new Error('Order status lookup failed');
+        }
+        return response.json();
+      }).then(function (payload) {
+        renderOrderStatus(element, payload);
+      });
+    }
+
+    function watchStatus(baseUrl, orderId) {
+      if (element.wgOrderStatusStream) {
+        element.wgOrderStatusStream.close();
+        element.wgOrderStatusStream = null;
+      }
+      if (typeof window.EventSource !== 'function') {
+        return false;
+      }
+      // The runtime pushes a status event whenever the order changes and
+      // closes the stream with an end event once the order is final.
+      var stream = new EventSource(baseUrl + '/orders/' + encodeURIComponent(orderId) + '/events');
+      var received = false;
+      element.wgOrderStatusStream = stream;
+      stream.addEventListener('status', function (event) {
+        received = true;
+        try {
+          renderOrderStatus(element, JSON.parse(event.data));
+        } catch (error) {
+          /* ignore malformed events */
+        }
+      });
+      stream.addEventListener('end', function () {
+        stream.close();
+      });
+      stream.onerror = function () {
+        // Reconnects are automatic once the stream has worked; runtimes
+        // without the events endpoint get a single lookup instead.
+        if (!received) {
+          stream.close();
+          fetchStatus(baseUrl, orderId).catch(showLookupError);
+        }
+      };
+      return true;
+    }
+
     function lookup(orderId) {
       if (!orderId) {
         renderOrderStatus(element, null);
@@ -374,22 +429,11 @@ def build_static_islands_bundle(
         if (!target || !target.public_base_url) {
           throw new Error('Runtime target is not configured');
         }
-        return fetch(target.public_base_url.replace(/\\/$/, '') + '/orders/' + encodeURIComponent(orderId), {
-          method: 'GET'
-        });
-      }).then(function (response) {
-        if (!response.ok) {
-          throw new Error('Order status lookup failed');
-        }
-        return response.json();
-      }).then(function (payload) {
-        renderOrderStatus(element, payload);
-      }).catch(function (error) {
-        var result = element.querySelector('[data-order-status-result]');
-        if (result) {
-          result.textContent = error.message || 'Order status lookup failed.';
+        var baseUrl = target.public_base_url.replace(/\\/$/, '');
+        if (!watchStatus(baseUrl, orderId)) {
+          return fetchStatus(baseUrl, orderId);
         }
-      });
+      }).catch(showLookupError);
     }
 
     form.addEventListener('submit', function (event) {
@@ -0,0 +1,127 @@
+"""Output manifest and precompressed sidecars for serving a built site.
+
+With ``build.output_manifest: true`` the last build step hashes every output
+file into ``.wg-output-manifest.json`` (relative path -> SHA-256 and size).
+``wg serve --production`` turns those hashes into strong ETags without
+re-reading files at request time.
+
+``build.precompress`` (``[gzip]``, ``[gzip, br]``) additionally writes
+``file.gz`` / ``file.br`` sidecars next to compressible files so the server
+can hand out pre-encoded bytes. Brotli needs the optional ``brotli`` package;
+without it ``br`` is skipped with a warning.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_MANIFEST_FILENAME = ".wg-output-manifest.json"
+SIDECAR_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+COMPRESSIBLE_SUFFIXES = {
+    ".html",
+    ".htm",
+    ".css",
+    ".js",
+    ".mjs",
+    ".json",
+    ".xml",
+    ".svg",
+    ".txt",
+    ".map",
+    ".webmanifest",
+}
+# Below this size the encoding overhead outweighs the saving.
+MIN_PRECOMPRESS_BYTES = 512
+
+_SKIPPED_NAMES = {OUTPUT_MANIFEST_FILENAME, ".wg-build-cache.json"}
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_sidecar(path: Path) -> bool:
+    return path.suffix in SIDECAR_SUFFIXES.values() and Path(path.stem).suffix != ""
+
+
+def _iter_output_files(output_dir: Path) -> Iterable[Path]:
+    for dirpath, dirnames, filenames in os.walk(output_dir):
+        dirnames[:] = sorted(name for name in dirnames if name != ".git")
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if filename in _SKIPPED_NAMES or _is_sidecar(path):
+                continue
+            yield path
+
+
+def _write_sidecar(source: Path, data: bytes, encoding: str) -> None:
+    if encoding == "gzip":
+        encoded = gzip.compress(data, compresslevel=9, mtime=0)
+    else:
+        encoded = brotli.compress(data, quality=11)
+    if len(encoded) < len(data):
+        source.with_name(source.name + SIDECAR_SUFFIXES[encoding]).write_bytes(encoded)
+
+
+def write_output_manifest(output_dir: Path, *, precompress: Iterable[str] = ()) -> Path:
+    """Hash every output file (and write requested sidecars); returns the manifest path."""
+    output_dir = Path(output_dir)
+    encodings = []
+    for encoding in precompress:
+        if encoding not in SIDECAR_SUFFIXES:
+            logger.warning("Unknown precompress encoding '%s'; expected gzip or br.", encoding)
+        elif encoding == "br" and brotli is None:
+            logger.warning("build.precompress requests 'br' but the brotli package is not installed.")
+        else:
+            encodings.append(encoding)
+
+    files: dict[str, dict[str, Any]] = {}
+    for path in _iter_output_files(output_dir):
+        data = path.read_bytes()
+        relative = path.relative_to(output_dir).as_posix()
+        files[relative] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+        for suffix in SIDECAR_SUFFIXES.values():
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
+        if (
+            encodings
+            and path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+            and len(data) >= MIN_PRECOMPRESS_BYTES
+        ):
+            for encoding in encodings:
+                _write_sidecar(path, data, encoding)
+
+    manifest_path = output_dir / OUTPUT_MANIFEST_FILENAME
+    manifest_path.write_text(
+        json.dumps({"version": 1, "files": files}, sort_keys=True, indent=2), encoding="utf-8"
+    )
+    logger.info("Output manifest written: %d file(s) -> %s", len(files), manifest_path)
+    return manifest_path
+
+
+def load_output_manifest(output_dir: Path) -> dict[str, dict[str, Any]]:
+    """Return ``{relative_posix_path: {"sha256", "size"}}`` or ``{}`` when absent/invalid."""
+    manifest_path = Path(output_dir) / OUTPUT_MANIFEST_FILENAME
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    files = data.get("files") if isinstance(data, dict) else None
+    return files if isinstance(files, dict) else {}
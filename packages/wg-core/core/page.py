@@ -5,13 +5,11 @@ import os
 from pathlib import Path
 from typing import Any, Optional, TYPE_CHECKING
 
-from slugify import slugify
-
 from processor.base_processor import ContentProcessor
 from utils.fs_manager import FileSystemManager
 from .config import Config
 from .presentation import DEFAULT_SHARE_IMAGE, format_price_display, safe_image_url
-from .routing import build_output_path, to_abs_url, to_root_relative_url
+from .routing import build_output_path, to_abs_url, to_root_relative_url, to_slug
 
 if TYPE_CHECKING:
     from .site import Site
@@ -111,7 +109,7 @@ class Page:
         self.description = str(
             self._first_value("description", self._first_value("summary", ""))
         )
-        self.slug = slugify(str(self._first_value("slug", self.title or default_title)))
+        self.slug = to_slug(str(self._first_value("slug", self.title or default_title)))
 
         page_type_value = self._first_value("type", None)
         self.page_type = str(page_type_value) if page_type_value else self.page_type
@@ -208,7 +206,7 @@ class Page:
 
     def set_slug(self) -> None:
         slug_source = self._first_value("slug", self.title)
-        self.slug = slugify(str(slug_source))
+        self.slug = to_slug(str(slug_source))
 
     def set_title(self) -> None:
         default_title = (
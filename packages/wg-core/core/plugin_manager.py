@@ -1,32 +1,67 @@
 from .config import Config
 from .errors import PluginError
+from .plugin_registry import PluginRegistry, default_registry
 from plugins.base_plugin import BasePlugin, LifecycleEvent
 from .site import Site
+from .tracing import CATEGORY_PLUGIN_HOOK, NullTracer
 
-import importlib
-import inspect
 import logging
-from pathlib import Path
+import time
+from typing import Any, Callable
+
+# (plugin, bound hook method) pairs for one hook, in plugin order.
+HookTable = list[tuple[BasePlugin, Callable[..., Any]]]
 
 
 def _event_name(hook: "str | LifecycleEvent") -> str:
     return hook.value if isinstance(hook, LifecycleEvent) else str(hook)
 
 
+def _overrides_hook(plugin: object, hook_name: str) -> bool:
+    """Return True when ``plugin`` provides its own implementation of a hook.
+
+    ``BasePlugin`` defines every lifecycle hook as a no-op, so a plugin only
+    participates in a hook when an instance attribute or a class below
+    ``BasePlugin`` in the MRO defines it.
+    """
+    if hook_name in getattr(plugin, "__dict__", {}):
+        return callable(plugin.__dict__[hook_name])
+    implementation = getattr(type(plugin), hook_name, None)
+    if implementation is None or not callable(implementation):
+        return False
+    return implementation is not getattr(BasePlugin, hook_name, None)
+
+
 class PluginManager:
     """
     Manages the discovery, loading, and execution of plugins.
 
-    A plugin is a class that inherits from `BasePlugin`, located in the `plugins/`
-    directory, and explicitly listed in the `plugins` section of the config.
+    A plugin is a class that inherits from `BasePlugin` and is explicitly listed
+    in the `plugins` section of the config. Names are resolved lazily through a
+    :class:`core.plugin_registry.PluginRegistry`, so third-party plugins can
+    live outside the `plugins/` package.
 
     Hook execution follows an explicit error policy: in ``strict`` mode (the
     default) a failing plugin raises :class:`core.errors.PluginError` so the
     build fails loudly; in lenient mode the error is logged and other plugins
     continue. Failures are never silently ignored.
+
+    Dispatch goes through per-hook tables built when ``plugins`` is assigned:
+    each table lists only the plugins that override that hook (the inherited
+    ``BasePlugin`` no-ops are never called), with the bound method resolved
+    once. Every call's wall time is accumulated per plugin and hook; see
+    :meth:`plugin_timings`.
     """
 
-    def __init__(self, config: Config, site: Site, *, strict: bool = True) -> None:
+    def __init__(
+        self,
+        config: Config,
+        site: Site,
+        *,
+        strict: bool = True,
+        tracer=None,
+        registry: PluginRegistry | None = None,
+    ) -> None:
         """
         Initialize the plugin manager.
 
@@ -34,25 +69,61 @@ class PluginManager:
             config (Config): Application configuration.
             site (Site): The site instance, representing the project being built.
             strict (bool): If True, a plugin hook error aborts the build.
+            tracer: Optional :class:`core.tracing.BuildTracer`; each hook
+                invocation is recorded as a ``plugin_hook`` span.
+            registry: Plugin name registry; defaults to the process-wide
+                :data:`core.plugin_registry.default_registry`.
         """
         self.logger = logging.getLogger(__name__)
         self.config: Config = config
         self.site: Site = site
         self.strict: bool = strict
-        self.plugins: list[BasePlugin] = []
+        self.tracer = tracer or NullTracer()
+        self.registry: PluginRegistry = registry or default_registry
+        self._dispatch: dict[str, HookTable] = {}
+        self._timings: dict[tuple[str, str], list[float]] = {}
+        self.plugins = []
+
+    @property
+    def plugins(self) -> list[BasePlugin]:
+        return self._plugins
+
+    @plugins.setter
+    def plugins(self, plugins: list[BasePlugin]) -> None:
+        self._plugins = list(plugins)
+        self._build_dispatch_tables()
+
+    def _build_dispatch_tables(self) -> None:
+        self._dispatch = {}
+        for event in LifecycleEvent:
+            self._hook_table(event.value)
+
+    def _hook_table(self, hook_name: str) -> HookTable:
+        table = self._dispatch.get(hook_name)
+        if table is None:
+            table = [
+                (plugin, getattr(plugin, hook_name))
+                for plugin in self._plugins
+                if _overrides_hook(plugin, hook_name)
+            ]
+            self._dispatch[hook_name] = table
+        return table
+
+    def has_hook(self, hook_name: "str | LifecycleEvent") -> bool:
+        """Return True when at least one loaded plugin implements ``hook_name``."""
+        return bool(self._hook_table(_event_name(hook_name)))
 
     def detect_and_load_plugins(self) -> list[BasePlugin]:
         """
-        Detects available plugin modules in the `plugins/` directory,
-        imports them dynamically, and loads classes that match the following criteria:
-          - Subclass of `BasePlugin`
-          - Class name is listed in the config under `plugins`
+        Resolves and instantiates the plugins listed in the config under
+        `plugins`, in config order.
 
-        Successfully matched plugins are instantiated and stored in `self.plugins`.
+        Names are resolved through the plugin registry (runtime registrations,
+        the built-in index, ``wg.plugins`` entry points, or a direct
+        ``"module:Class"`` reference), so only the modules of configured
+        plugins are imported.
 
-        Raises:
-            ImportError: If a plugin module cannot be imported.
-            Exception: If plugin instantiation fails.
+        Successfully matched plugins are instantiated and stored in `self.plugins`.
         """
         plugins_list = self.config.get("plugins", [])
         if not isinstance(plugins_list, list):
@@ -60,37 +131,15 @@ class PluginManager:
             plugins_list = []
             return []
 
-        plugin_package = importlib.import_module("plugins")
-        plugin_dir = Path(plugin_package.__file__).resolve().parent
-        plugin_files = [
-            path.name
-            for path in plugin_dir.iterdir()
-            if path.suffix == ".py" and path.name != "__init__.py"
-        ]
-
-        plugin_modules = []
-        for filename in plugin_files:
-            module_name = f"{plugin_package.__name__}.{filename[:-3]}"
+        plugins_to_load: list[BasePlugin] = []
+        for plugin_name in plugins_list:
             try:
-                module = importlib.import_module(module_name)
-                plugin_modules.append(module)
-            except ImportError as e:
+                plugin_class = self.registry.resolve(str(plugin_name))
+            except (ImportError, AttributeError, TypeError) as e:
                 self.logger.error(
-                    f"Failed to import module {module_name}: {e}", exc_info=True
+                    f"Failed to load plugin '{plugin_name}': {e}", exc_info=True
                 )
-
-        discovered_plugins: dict[str, type[BasePlugin]] = {}
-        for module in plugin_modules:
-            for _, obj in inspect.getmembers(module):
-                # Check if it's a class
-                if inspect.isclass(obj):
-                    # Check if it inherits from BasePlugin and isn't the base class itself
-                    if issubclass(obj, BasePlugin) and obj is not BasePlugin:
-                        discovered_plugins[obj.__name__] = obj
-
-        plugins_to_load: list[BasePlugin] = []
-        for plugin_name in plugins_list:
-            plugin_class = discovered_plugins.get(plugin_name)
+                continue
             if plugin_class:
                 plugins_to_load.append(plugin_class())
             else:
@@ -105,9 +154,8 @@ class PluginManager:
         """
         Executes a named hook method on all loaded plugins.
 
-        For each plugin:
-          - If the plugin defines a method with the given hook name,
-            that method is called with the provided arguments.
+        Only plugins that override the hook are called (see the dispatch
+        tables built when plugins are loaded).
 
         Args:
             hook_name: The name of the hook/method to call on plugins.
@@ -120,13 +168,11 @@ class PluginManager:
               plugins continue.
         """
         hook_name = _event_name(hook_name)
-        for plugin in self.plugins:
-            method = getattr(plugin, hook_name, None)
-            if method and callable(method):
-                try:
-                    method(*args, **kwargs)
-                except Exception as exc:
-                    self._handle_hook_error(plugin, hook_name, exc)
+        for plugin, method in self._hook_table(hook_name):
+            try:
+                self._call(plugin, hook_name, method, args, kwargs)
+            except Exception as exc:
+                self._handle_hook_error(plugin, hook_name, exc)
 
     def run_hook_collect(self, hook_name: str, *args, **kwargs) -> list:
         """
@@ -142,17 +188,73 @@ class PluginManager:
         """
         hook_name = _event_name(hook_name)
         results: list = []
-        for plugin in self.plugins:
-            method = getattr(plugin, hook_name, None)
-            if method and callable(method):
-                try:
-                    result = method(*args, **kwargs)
-                    if result is not None:
-                        results.append(result)
-                except Exception as exc:
-                    self._handle_hook_error(plugin, hook_name, exc)
+        for plugin, method in self._hook_table(hook_name):
+            try:
+                result = self._call(plugin, hook_name, method, args, kwargs)
+            except Exception as exc:
+                self._handle_hook_error(plugin, hook_name, exc)
+                continue
+            if result is not None:
+                results.append(result)
         return results
 
+    def _call(
+        self,
+        plugin: BasePlugin,
+        hook_name: str,
+        method: Callable[..., Any],
+        args: tuple,
+        kwargs: dict[str, Any],
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            if self.tracer.enabled:
+                with self.tracer.span(
+                    f"{plugin.__class__.__name__}.{hook_name}", CATEGORY_PLUGIN_HOOK
+                ):
+                    return method(*args, **kwargs)
+            return method(*args, **kwargs)
+        finally:
+            key = (plugin.__class__.__name__, hook_name)
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = [0, 0.0]
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start
+
+    def plugin_timings(self) -> list[dict[str, Any]]:
+        """Return cumulative hook time per plugin, slowest first.
+
+        Each row holds ``plugin``, ``calls``, ``total_ms`` and a ``hooks``
+        mapping of hook name to ``{"calls", "total_ms"}``.
+        """
+        rows: dict[str, dict[str, Any]] = {}
+        for (plugin_name, hook_name), (calls, seconds) in self._timings.items():
+            row = rows.setdefault(
+                plugin_name, {"plugin": plugin_name, "calls": 0, "total_ms": 0.0, "hooks": {}}
+            )
+            row["calls"] += calls
+            row["total_ms"] += seconds * 1000
+            row["hooks"][hook_name] = {"calls": calls, "total_ms": round(seconds * 1000, 3)}
+        ordered = sorted(rows.values(), key=lambda row: row["total_ms"], reverse=True)
+        for row in ordered:
+            row["total_ms"] = round(row["total_ms"], 3)
+        return ordered
+
+    def format_timing_report(self, limit: int = 10) -> str:
+        """Render :meth:`plugin_timings` as a short slow-plugin report."""
+        lines = [f"{'plugin':<32} {'calls':>8} {'total ms':>11}  slowest hook"]
+        for row in self.plugin_timings()[:limit]:
+            slowest = max(row["hooks"].items(), key=lambda item: item[1]["total_ms"])
+            lines.append(
+                f"{row['plugin'][:32]:<32} {row['calls']:>8} {row['total_ms']:>11.2f}  "
+                f"{slowest[0]} ({slowest[1]['total_ms']:.2f} ms)"
+            )
+        return "\n".join(lines)
+
+    def reset_timings(self) -> None:
+        self._timings.clear()
+
     def _handle_hook_error(self, plugin: BasePlugin, hook_name: str, exc: Exception) -> None:
         plugin_name = plugin.__class__.__name__
         message = f"Plugin '{plugin_name}' failed on hook '{hook_name}': {exc}"
@@ -0,0 +1,148 @@
+"""Plugin name -> implementation registry.
+
+``PluginManager`` used to import every module in the ``plugins`` package and
+introspect all of its members just to find the few classes named in the
+config, pulling optional dependencies (BeautifulSoup, ...) into every build.
+The registry resolves a configured plugin name to a ``"module:Class"`` target
+and imports only that module.
+
+Resolution order for a configured name:
+
+1. Plugins registered at runtime with :meth:`PluginRegistry.register`
+2. The static index of built-in plugins (:data:`BUILTIN_PLUGINS`)
+3. Installed distributions exposing a ``wg.plugins`` entry point
+4. A direct ``"package.module:ClassName"`` reference in the config
+5. Legacy fallback: scanning ``plugins/*.py`` for a matching class name (for
+   plugins dropped into the package without an index entry)
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import importlib
+from importlib import metadata
+import inspect
+import logging
+from pathlib import Path
+from typing import Any
+
+from plugins.base_plugin import BasePlugin
+
+PLUGIN_ENTRY_POINT_GROUP = "wg.plugins"
+
+BUILTIN_PLUGINS: dict[str, str] = {
+    "BlogIndexerPlugin": "plugins.blog_indexer:BlogIndexerPlugin",
+    "CollectionIndexerPlugin": "plugins.collection_indexer:CollectionIndexerPlugin",
+    "FrontendCustomizer": "plugins.frontend_customizer:FrontendCustomizer",
+    "PageKeyWordExtractor": "plugins.keywords_extractor:PageKeyWordExtractor",
+    "SitemapPlugin": "plugins.sitemap_generator:SitemapPlugin",
+    "SpecialPagesPlugin": "plugins.special_pages_plugin:SpecialPagesPlugin",
+}
+
+
+@lru_cache(maxsize=1)
+def _plugin_entry_points() -> dict[str, str]:
+    """Return ``name -> "module:attr"`` for every installed ``wg.plugins`` entry point."""
+    try:
+        discovered = metadata.entry_points()
+    except Exception:
+        return {}
+
+    if hasattr(discovered, "select"):
+        candidates = discovered.select(group=PLUGIN_ENTRY_POINT_GROUP)
+    else:
+        candidates = discovered.get(PLUGIN_ENTRY_POINT_GROUP, [])  # pylint: disable=no-member
+    return {candidate.name: candidate.value for candidate in candidates}
+
+
+def _import_target(target: str) -> Any:
+    module_name, _, attr_name = target.partition(":")
+    module = importlib.import_module(module_name)
+    if not attr_name:
+        raise ImportError(f"Plugin target '{target}' must be in 'module:ClassName' form.")
+    return getattr(module, attr_name)
+
+
+class PluginRegistry:
+    """Maps plugin names to classes, importing only what is asked for."""
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+        self._registered: dict[str, str | type[BasePlugin]] = {}
+
+    def register(self, name: str, target: "str | type[BasePlugin]") -> None:
+        """Register a plugin under ``name`` as a class or ``"module:Class"`` string."""
+        self._registered[name] = target
+
+    def names(self) -> list[str]:
+        """Return every known plugin name without importing any plugin module."""
+        known = set(BUILTIN_PLUGINS) | set(_plugin_entry_points()) | set(self._registered)
+        return sorted(known)
+
+    def target_for(self, name: str) -> "str | type[BasePlugin] | None":
+        if name in self._registered:
+            return self._registered[name]
+        if name in BUILTIN_PLUGINS:
+            return BUILTIN_PLUGINS[name]
+        entry_points = _plugin_entry_points()
+        if name in entry_points:
+            return entry_points[name]
+        if ":" in name:
+            return name
+        return None
+
+    def resolve(self, name: str) -> type[BasePlugin] | None:
+        """Return the plugin class for ``name`` or ``None`` when it is unknown.
+
+        Raises:
+            ImportError: If the plugin's module cannot be imported.
+            TypeError: If the target is not a ``BasePlugin`` subclass.
+        """
+        target = self.target_for(name)
+        if target is None:
+            plugin_class = self._scan_plugins_package(name)
+        elif isinstance(target, str):
+            plugin_class = _import_target(target)
+        else:
+            plugin_class = target
+
+        if plugin_class is None:
+            return None
+        if not (inspect.isclass(plugin_class) and issubclass(plugin_class, BasePlugin)):
+            raise TypeError(f"Plugin '{name}' does not resolve to a BasePlugin subclass.")
+        return plugin_class
+
+    def _scan_plugins_package(self, name: str) -> type[BasePlugin] | None:
+        plugin_package = importlib.import_module("plugins")
+        plugin_dir = Path(plugin_package.__file__).resolve().parent
+        indexed_modules = {target.partition(":")[0] for target in BUILTIN_PLUGINS.values()}
+        for path in sorted(plugin_dir.glob("*.py")):
+            if path.name == "__init__.py":
+                continue
+            module_name = f"{plugin_package.__name__}.{path.stem}"
+            if module_name in indexed_modules or module_name == "plugins.base_plugin":
+                continue
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError as e:
+                self.logger.error(
+                    f"Failed to import module {module_name}: {e}", exc_info=True
+                )
+                continue
+            candidate = getattr(module, name, None)
+            if inspect.isclass(candidate) and issubclass(candidate, BasePlugin):
+                self.logger.debug(
+                    "Plugin '%s' found by scanning %s; add it to the plugin index.",
+                    name,
+                    module_name,
+                )
+                return candidate
+        return None
+
+
+default_registry = PluginRegistry()
+
+
+def register_plugin(name: str, target: "str | type[BasePlugin]") -> None:
+    """Register a plugin on the process-wide default registry."""
+    default_registry.register(name, target)
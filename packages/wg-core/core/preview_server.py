@@ -0,0 +1,255 @@
+"""On-demand preview server (``wg serve --preview``).
+
+A preview environment rarely needs every page, so rendering the whole site
+before the first request is wasted work. :class:`PreviewSession` runs
+discovery, content models, plugin hooks and routing once, indexes every page
+by its output path, and renders a page through
+:class:`~core.rendering.PageRenderer` only when it is requested. Rendered
+HTML is memoized until the page's inputs change:
+
+- content edits invalidate only the pages whose fingerprint changed (the same
+  per-page fingerprint the warm rebuild uses),
+- adding/removing pages, navigation or site data changes, and template edits
+  invalidate every memoized page.
+
+Steps that produce the finished site are skipped: the output directory is
+not wiped (``prepare_output_dir``), and ``render_pages``, the JSON export,
+frontend bundles, ``after_build`` hooks (sitemaps, search indexes and the
+like, which expect rendered pages) and the output manifest do not run.
+Nothing is written to disk for pages. CSS, scripts and images are served
+from the output directory, so the asset steps (Tailwind, ``copy_assets``)
+and the runtime manifest still run at start; they copy over existing files
+and run again only when assets or templates change.
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import logging
+from pathlib import Path, PurePosixPath
+import threading
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from .build_pipeline import StepCallback
+from .page import Page
+from .tracing import CATEGORY_STEP
+from .warm_build import _ASSET_STEPS, WarmBuildSession, _ChangeKinds, watch_and_rebuild
+
+logger = logging.getLogger(__name__)
+
+_PREVIEW_SKIPPED_STEPS = {
+    "prepare_output_dir",
+    "render_pages",
+    "export_json",
+    "build_frontend_targets",
+    "after_build_hooks",
+    "write_output_manifest",
+}
+
+
+class PreviewSession(WarmBuildSession):
+    """Warm session that renders pages lazily instead of writing the whole site."""
+
+    def __init__(self, config_path: str | Path = "config.yaml") -> None:
+        super().__init__(config_path)
+        self.output_dir: Path | None = None
+        self._index: dict[str, Page] = {}
+        self._memo: dict[str, str] = {}
+        self._header = ""
+        self._navigation: list[dict[str, Any]] = []
+        self.render_count = 0
+
+    # -- build -----------------------------------------------------------------
+
+    def _run_steps(self, skipped: set[str], on_step: StepCallback | None) -> None:
+        project = self._require_project()
+        ctx = project.context
+        steps = [step for step in project.pipeline.steps if step.name not in skipped]
+        for index, step in enumerate(steps, start=1):
+            if on_step is not None:
+                on_step(step.name, index, len(steps))
+            with ctx.tracer.span(step.name, CATEGORY_STEP):
+                step.run()
+
+    def _cold_build(self, on_step: StepCallback | None) -> list[Path]:
+        self._run_steps(_PREVIEW_SKIPPED_STEPS, on_step)
+        self._memo.clear()
+        self._index_pages()
+        logger.info("Preview index ready: %d page(s), rendered on request.", len(self._index))
+        return []
+
+    def _warm_rebuild(
+        self, kinds: _ChangeKinds, on_step: StepCallback | None = None
+    ) -> tuple[list[Path], list[Path]]:
+        if kinds.templates:
+            self._reset_templates()
+        previous_outputs = set(self._fingerprints)
+        self._reset_site()
+
+        skipped = _PREVIEW_SKIPPED_STEPS | {"fetch_runtime_catalog"}
+        if not (kinds.assets or kinds.templates):
+            skipped |= _ASSET_STEPS
+        self._run_steps(skipped, on_step)
+        self._index_pages()
+
+        stale = self._affected_pages(rerender_all=kinds.templates or kinds.data)
+        for page in stale:
+            self._memo.pop(str(page.get_output_path()), None)
+        current_outputs = {
+            str(page.get_output_path()) for page in self._require_project().site.pages
+        }
+        removed = sorted(previous_outputs - current_outputs)
+        for key in removed:
+            self._memo.pop(key, None)
+
+        self._remember_state()
+        logger.info(
+            "Preview index refreshed: %d memoized page(s) invalidated, %d removed.",
+            len(stale),
+            len(removed),
+        )
+        return [], [Path(key) for key in removed]
+
+    def _index_pages(self) -> None:
+        project = self._require_project()
+        site = project.site
+        self.output_dir = Path(project.config.get("build.output_directory")).resolve()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        index: dict[str, Page] = {}
+        for page in site.pages:
+            output_path = page.get_output_path()
+            if output_path is None:
+                continue
+            try:
+                relative = Path(output_path).resolve().relative_to(self.output_dir)
+            except ValueError:
+                continue
+            index[relative.as_posix()] = page
+        self._index = index
+        self._navigation = site.build_navigation()
+        self._header = site.populate_header()
+
+    # -- lookup and render -------------------------------------------------------
+
+    def page_count(self) -> int:
+        return len(self._index)
+
+    def lookup(self, request_path: str) -> Page | None:
+        """Return the page served at ``request_path`` (``/blog/post/``, ``/blog/post/index.html``)."""
+        path = unquote(urlsplit(request_path).path)
+        relative = str(PurePosixPath("/", path)).lstrip("/")
+        if path.endswith("/") or not relative:
+            candidates = [f"{relative}/index.html".lstrip("/")]
+        else:
+            candidates = [relative, f"{relative}/index.html"]
+        for candidate in candidates:
+            page = self._index.get(candidate)
+            if page is not None:
+                return page
+        return None
+
+    def render(self, request_path: str) -> str | None:
+        """Render (or return the memoized HTML for) the page at ``request_path``."""
+        with self.lock:
+            if self.project is None:
+                return None
+            page = self.lookup(request_path)
+            if page is None:
+                return None
+            key = str(page.get_output_path())
+            html = self._memo.get(key)
+            if html is None:
+                ctx = self.project.context
+                hook_kwargs = ctx.page_hook_kwargs(page)
+                ctx.plugin_manager.run_hook("before_page_rendered", **hook_kwargs)
+                html = self.project.pipeline.renderer.render_html(
+                    page, self._header, self._navigation, hook_kwargs
+                )
+                ctx.plugin_manager.run_hook("after_page_rendered", **hook_kwargs)
+                self._memo[key] = html
+                self.render_count += 1
+            return html
+
+
+class PreviewServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], session: PreviewSession) -> None:
+        self.session = session
+        super().__init__(address, PreviewRequestHandler)
+
+
+class PreviewRequestHandler(SimpleHTTPRequestHandler):
+    """Renders indexed pages on demand and serves everything else from the output directory."""
+
+    server: PreviewServer
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, directory=str(args[2].session.output_dir), **kwargs)
+
+    def do_GET(self) -> None:
+        if not self._serve_page(head_only=False):
+            super().do_GET()
+
+    def do_HEAD(self) -> None:
+        if not self._serve_page(head_only=True):
+            super().do_HEAD()
+
+    def _serve_page(self, *, head_only: bool) -> bool:
+        try:
+            html = self.server.session.render(self.path)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Preview render failed for %s: %s", self.path, exc, exc_info=True)
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Render failed: {exc}")
+            return True
+        if html is None:
+            return False
+        body = html.encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+        return True
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def create_preview_server(
+    config_path: str | Path, host: str = "127.0.0.1", port: int = 8000
+) -> PreviewServer:
+    """Index the site (no page rendering) and return a server ready for ``serve_forever``."""
+    session = PreviewSession(config_path)
+    report = session.build()
+    if not report.ok:
+        raise RuntimeError(f"Preview indexing failed: {report.error}")
+    logger.info("Preview ready in %.2fs.", report.seconds)
+    return PreviewServer((host, port), session)
+
+
+def run_preview_server(
+    config_path: str | Path,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    interval: float = 1.0,
+    force_polling: bool = False,
+    debounce: float = 0.15,
+) -> None:
+    """Serve on-demand renders, refreshing the index on change until interrupted."""
+    server = create_preview_server(config_path, host, port)
+    thread = threading.Thread(target=server.serve_forever, name="wg-preview-server", daemon=True)
+    thread.start()
+    logger.info("Preview server at http://%s:%s", host, server.server_address[1])
+    try:
+        watch_and_rebuild(
+            server.session, interval=interval, force_polling=force_polling, debounce=debounce
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -9,7 +9,7 @@ from utils.fs_manager import FileSystemManager
 from wg_contracts.ports import FileSystemPort
 from .build_cache import BuildCache, compute_build_signature
 from .build_context import BuildContext
-from .build_pipeline import BuildPipeline
+from .build_pipeline import BuildPipeline, StepCallback
 from .config import Config
 from .exporting import JsonExporter
 from .extension_manager import ExtensionManager
@@ -20,6 +20,7 @@ from .router import Router
 from .runtime_manager import RuntimeManager
 from .site import Site
 from .theme_manager import ThemeManager
+from .tracing import create_tracer
 
 
 class Project:
@@ -41,8 +42,11 @@ class Project:
         self.config: Config = config
         self.strict: bool = bool(config.get("build.strict", True))
         self.fs_manager: FileSystemPort = fs_manager or FileSystemManager()
+        self.tracer = create_tracer(self.config)
 
-        self.extension_manager = ExtensionManager(self.config, self.fs_manager)
+        self.extension_manager = ExtensionManager(
+            self.config, self.fs_manager, tracer=self.tracer
+        )
         self.extension_manager.detect_and_load_extensions()
         self.site: Site = Site(self.config)
         self.router = Router(self.config)
@@ -54,7 +58,7 @@ class Project:
             self.config, self.fs_manager, self.extension_manager, strict=self.strict
         )
         self.plugin_manager: PluginManager = PluginManager(
-            self.config, self.site, strict=self.strict
+            self.config, self.site, strict=self.strict, tracer=self.tracer
         )
         self.plugin_manager.detect_and_load_plugins()
 
@@ -98,6 +102,7 @@ class Project:
             incremental=self.incremental,
             build_cache=build_cache,
             project=self,
+            tracer=self.tracer,
         )
         self.pipeline = BuildPipeline(self.context)
 
@@ -115,8 +120,8 @@ class Project:
         )
         return BuildCache(output_dir, signature)
 
-    def build(self) -> None:
-        self.pipeline.run()
+    def build(self, on_step: StepCallback | None = None) -> None:
+        self.pipeline.run(on_step=on_step)
 
     def get_template_engine(self) -> TemplateEngine:
         return self.template_engine
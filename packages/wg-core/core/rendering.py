@@ -10,10 +10,12 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
+from typing import Any
 
 from .build_context import BuildContext
 from .errors import BuildError
 from .page import Page
+from .tracing import CATEGORY_PAGE
 
 
 class PageContextBuilder:
@@ -22,15 +24,23 @@ class PageContextBuilder:
     def __init__(self, ctx: BuildContext) -> None:
         self.ctx = ctx
 
-    def build(self, page: Page, header: str, navigation_items: list[dict]) -> dict:
+    def build(
+        self,
+        page: Page,
+        header: str,
+        navigation_items: list[dict],
+        hook_kwargs: dict | None = None,
+    ) -> dict:
         ctx = self.ctx
+        if hook_kwargs is None:
+            hook_kwargs = ctx.page_hook_kwargs(page)
         stylesheets = ctx.theme_manager.get_stylesheets()
         scripts = ctx.theme_manager.get_scripts()
         layout_options = ctx.theme_manager.get_layout_options(page)
         theme_context = ctx.theme_manager.get_theme_context()
 
-        self._collect_injected_assets(page, "inject_css", stylesheets)
-        self._collect_injected_assets(page, "inject_js", scripts)
+        self._collect_injected_assets(hook_kwargs, "inject_css", stylesheets)
+        self._collect_injected_assets(hook_kwargs, "inject_js", scripts)
 
         frontend_context = ctx.frontend_manager.get_context()
         runtime_context = ctx.runtime_manager.get_context()
@@ -57,33 +67,23 @@ class PageContextBuilder:
             page.blocks, ctx.template_engine, context
         )
 
-        self._apply_context_plugins(page, context)
+        self._apply_context_plugins(hook_kwargs, context)
         return context
 
-    def _collect_injected_assets(self, page: Page, hook: str, sink: list[str]) -> None:
-        ctx = self.ctx
-        for injected in ctx.plugin_manager.run_hook_collect(
-            hook,
-            site=ctx.site,
-            config=ctx.config,
-            fs_manager=ctx.fs_manager,
-            page=page,
-        ):
+    def _collect_injected_assets(self, hook_kwargs: dict, hook: str, sink: list[str]) -> None:
+        for injected in self.ctx.plugin_manager.run_hook_collect(hook, **hook_kwargs):
             if isinstance(injected, str):
                 sink.append(injected)
             elif isinstance(injected, (list, tuple)):
                 sink.extend(injected)
 
-    def _apply_context_plugins(self, page: Page, context: dict) -> None:
-        ctx = self.ctx
+    def _apply_context_plugins(self, hook_kwargs: dict, context: dict) -> None:
+        plugin_manager = self.ctx.plugin_manager
         for hook in ("modify_context", "modify_template_context"):
-            for update in ctx.plugin_manager.run_hook_collect(
-                hook,
-                context=context,
-                site=ctx.site,
-                config=ctx.config,
-                fs_manager=ctx.fs_manager,
-                page=page,
+            if not plugin_manager.has_hook(hook):
+                continue
+            for update in plugin_manager.run_hook_collect(
+                hook, context=context, **hook_kwargs
             ):
                 if isinstance(update, dict):
                     context.update(update)
@@ -128,7 +128,8 @@ class PageRenderer:
         self.context_builder = PageContextBuilder(ctx)
         self.template_resolver = TemplateResolver(ctx)
 
-    def render_all(self) -> None:
+    def render_all(self, pages: list[Page] | None = None) -> None:
+        """Render every page, or only ``pages`` (navigation still covers the whole site)."""
         ctx = self.ctx
         self.logger.info("Rendering pages...")
         navigation_items = ctx.site.build_navigation()
@@ -138,43 +139,61 @@ class PageRenderer:
         if cache is not None:
             cache.load()
 
-        for page in ctx.site.pages:
+        tracer = ctx.tracer
+        for page in ctx.site.pages if pages is None else pages:
             output_path = page.get_output_path()
             if output_path is None:
                 raise BuildError(f"No output path assigned for page '{page.title}'")
 
-            if cache is not None and self._skip_unchanged(page, output_path, cache):
-                self.logger.debug("Skipping unchanged page: %s", page.source_filepath)
-                continue
-
-            ctx.plugin_manager.run_hook(
-                "before_page_rendered",
-                site=ctx.site,
-                config=ctx.config,
-                fs_manager=ctx.fs_manager,
-                page=page,
-            )
-
-            context = self.context_builder.build(page, header, navigation_items)
-            template_name = self.template_resolver.resolve(page)
-            rendered_html = ctx.template_engine.render(template_name, context)
-
-            ctx.fs_manager.write_file(output_path, rendered_html)
+            if cache is not None:
+                if self._skip_unchanged(page, output_path, cache):
+                    tracer.count("build_cache.hit")
+                    self.logger.debug("Skipping unchanged page: %s", page.source_filepath)
+                    continue
+                tracer.count("build_cache.miss")
+
+            hook_kwargs = ctx.page_hook_kwargs(page)
+            ctx.plugin_manager.run_hook("before_page_rendered", **hook_kwargs)
+            rendered_html = self.render_html(page, header, navigation_items, hook_kwargs)
+            with tracer.span("page.write", CATEGORY_PAGE, page=str(output_path)):
+                ctx.fs_manager.write_file(output_path, rendered_html)
+            tracer.count("pages.rendered")
             self.logger.debug(
                 "Rendered page: %s -> %s", page.source_filepath, output_path
             )
 
-            ctx.plugin_manager.run_hook(
-                "after_page_rendered",
-                site=ctx.site,
-                config=ctx.config,
-                fs_manager=ctx.fs_manager,
-                page=page,
-            )
+            ctx.plugin_manager.run_hook("after_page_rendered", **hook_kwargs)
 
         if cache is not None:
+            if pages is None:
+                self._remove_stale_outputs(cache)
             cache.save()
 
+    def render_html(
+        self,
+        page: Page,
+        header: str,
+        navigation_items: list[dict[str, Any]],
+        hook_kwargs: dict[str, Any] | None = None,
+    ) -> str:
+        """Build ``page``'s template context and render it to HTML without writing it."""
+        ctx = self.ctx
+        page_label = str(page.get_output_path())
+        with ctx.tracer.span("page.context", CATEGORY_PAGE, page=page_label):
+            context = self.context_builder.build(page, header, navigation_items, hook_kwargs)
+        with ctx.tracer.span("page.template", CATEGORY_PAGE, page=page_label):
+            template_name = self.template_resolver.resolve(page)
+            return ctx.template_engine.render(template_name, context)
+
+    def _remove_stale_outputs(self, cache) -> None:
+        """Delete pages the previous build wrote but this one no longer has (e.g. deleted products)."""
+        for key in cache.stale_keys():
+            stale = Path(key)
+            if stale.is_file():
+                stale.unlink()
+                self.ctx.tracer.count("build_cache.removed")
+                self.logger.debug("Removed stale page: %s", stale)
+
     def _skip_unchanged(self, page, output_path, cache) -> bool:
         """Return True (and record the hash) when a page can be reused as-is."""
         key = str(output_path)
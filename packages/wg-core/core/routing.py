@@ -9,9 +9,29 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+import re
+from typing import Iterable
 
 from slugify import slugify
 
+_SLUG_SHAPED = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+def to_slug(value: str) -> str:
+    """``slugify(value)``, skipping the transliteration work for values that already are slugs."""
+    if _SLUG_SHAPED.fullmatch(value):
+        return value
+    return slugify(value)
+
+
+def bulk_slugify(values: Iterable[str]) -> dict[str, str]:
+    """Map each distinct value to its slug, slugifying every distinct value once."""
+    slugs: dict[str, str] = {}
+    for value in values:
+        if value not in slugs:
+            slugs[value] = to_slug(value)
+    return slugs
+
 
 def build_output_path(
     output_dir: Path,
@@ -38,14 +58,14 @@ def build_output_path(
                 candidate = candidate / "index.html"
             return output_dir / candidate
         if route_prefix:
-            return output_dir / slugify(route_prefix) / "index.html"
-        return output_dir / slugify(collection or "index") / "index.html"
+            return output_dir / to_slug(route_prefix) / "index.html"
+        return output_dir / to_slug(collection or "index") / "index.html"
 
     segments: list[str] = []
     if route_prefix:
-        segments.append(slugify(route_prefix))
+        segments.append(to_slug(route_prefix))
     if slug:
-        segments.append(slugify(slug))
+        segments.append(to_slug(slug))
 
     if not segments:
         return output_dir / "index.html"
@@ -10,12 +10,17 @@ from urllib.error import HTTPError, URLError
 
 from utils.fs_manager import FileSystemManager
 from wg_contracts.ports import CatalogSourcePort
-from .catalog_source import HttpCatalogSource
+from .catalog_source import FileCatalogSource, HttpCatalogSource
 from .errors import IntegrationError
 
 
-def _default_catalog_source_factory(url: str) -> CatalogSourcePort:
-    return HttpCatalogSource(url, timeout=30)
+_DEFAULT_CATALOG_CACHE_DIR = "./.wg-cache/catalog"
+
+
+def _default_catalog_source_factory(
+    url: str, *, cache_dir: str | Path | None = None, delta: bool = True
+) -> CatalogSourcePort:
+    return HttpCatalogSource(url, timeout=30, cache_dir=cache_dir, delta=delta)
 
 
 # Keys safe to publish in runtime/public-config.json (allowlist, not denylist).
@@ -31,6 +36,8 @@ _PUBLIC_PROVIDER_KEYS = frozenset(
         "supported_currencies",
     }
 )
+# Registry metadata the runtime acts on itself; not part of the public manifest.
+_PRIVATE_ADAPTER_METADATA_KEYS = frozenset({"thread_safe"})
 
 
 class RuntimeManager:
@@ -50,9 +57,7 @@ class RuntimeManager:
         self.fs_manager = fs_manager
         self.extension_manager = extension_manager
         self.strict = strict
-        self.catalog_source_factory = (
-            catalog_source_factory or _default_catalog_source_factory
-        )
+        self.catalog_source_factory = catalog_source_factory or self._http_catalog_source
         self.public_manifest: dict[str, Any] = {"targets": [], "integrations": {}}
 
     def build_public_config(self) -> dict[str, Any]:
@@ -113,6 +118,11 @@ class RuntimeManager:
                     adapter_metadata = self.extension_manager.runtime_adapter_registry.describe(
                         adapter_name
                     )
+                    adapter_metadata = {
+                        key: value
+                        for key, value in (adapter_metadata or {}).items()
+                        if key not in _PRIVATE_ADAPTER_METADATA_KEYS
+                    }
                     if adapter_metadata:
                         public_provider["adapter_metadata"] = deepcopy(adapter_metadata)
                 public_providers[str(provider_name)] = public_provider
@@ -120,15 +130,18 @@ class RuntimeManager:
             public[str(domain)] = public_domain
         return public
 
-    def fetch_catalog_snapshot(self) -> tuple[dict[str, Any] | None, Path | None]:
-        runtime_cfg = self.config.get("runtime", {})
-        if not isinstance(runtime_cfg, dict):
-            return None, None
-
-        snapshot_cfg = runtime_cfg.get("catalog_snapshot", {})
-        if not isinstance(snapshot_cfg, dict) or not snapshot_cfg.get("enabled", False):
-            return None, None
+    def _http_catalog_source(self, url: str) -> CatalogSourcePort:
+        cache_dir = self.config.get(
+            "runtime.catalog_snapshot.cache_dir", _DEFAULT_CATALOG_CACHE_DIR
+        )
+        delta = self.config.get("runtime.catalog_snapshot.delta", True)
+        return _default_catalog_source_factory(
+            url, cache_dir=cache_dir or None, delta=bool(delta)
+        )
 
+    def _catalog_snapshot_url(
+        self, runtime_cfg: dict[str, Any], snapshot_cfg: dict[str, Any]
+    ) -> str | None:
         targets = runtime_cfg.get("targets", [])
         if not isinstance(targets, list):
             targets = []
@@ -146,24 +159,46 @@ class RuntimeManager:
                 target = first_target
 
         if not isinstance(target, dict):
-            return None, None
+            return None
 
         public_base_url = str(target.get("public_base_url", "")).strip()
         if not public_base_url:
-            return None, None
+            return None
 
         url_path = str(snapshot_cfg.get("url_path", "/catalog/snapshot")).strip()
         if not url_path.startswith("/"):
             url_path = "/" + url_path
 
-        snapshot_url = urljoin(public_base_url.rstrip("/") + "/", url_path.lstrip("/"))
-        catalog_source = self.catalog_source_factory(snapshot_url)
+        return urljoin(public_base_url.rstrip("/") + "/", url_path.lstrip("/"))
+
+    def fetch_catalog_snapshot(self) -> tuple[dict[str, Any] | None, Path | None]:
+        runtime_cfg = self.config.get("runtime", {})
+        if not isinstance(runtime_cfg, dict):
+            return None, None
+
+        snapshot_cfg = runtime_cfg.get("catalog_snapshot", {})
+        if not isinstance(snapshot_cfg, dict) or not snapshot_cfg.get("enabled", False):
+            return None, None
+
+        source_kind = str(snapshot_cfg.get("source", "http")).strip() or "http"
+        if source_kind == "file":
+            location = str(snapshot_cfg.get("path", "")).strip()
+            if not location:
+                return None, None
+            catalog_source: CatalogSourcePort = FileCatalogSource(
+                location, format=str(snapshot_cfg.get("format", "")).strip() or None
+            )
+        else:
+            location = self._catalog_snapshot_url(runtime_cfg, snapshot_cfg)
+            if location is None:
+                return None, None
+            catalog_source = self.catalog_source_factory(location)
 
         try:
             snapshot_data = catalog_source.fetch_snapshot()
         except (HTTPError, URLError, ValueError, json.JSONDecodeError, OSError) as exc:
             message = (
-                f"Failed to fetch runtime catalog snapshot from '{snapshot_url}': {exc}"
+                f"Failed to fetch runtime catalog snapshot from '{location}': {exc}"
             )
             if self.strict:
                 raise IntegrationError(message) from exc
@@ -176,6 +211,11 @@ class RuntimeManager:
         output_dir = Path(snapshot_cfg.get("output_dir", "./output/data/runtime"))
         self.fs_manager.create_directory(output_dir)
         output_path = output_dir / "catalog.json"
+        if getattr(catalog_source, "not_modified", False) and self.fs_manager.path_exists(
+            output_path
+        ):
+            self.logger.debug("Catalog snapshot unchanged; keeping %s", output_path)
+            return snapshot_data, output_path
         self.fs_manager.write_file(
             output_path,
             json.dumps(snapshot_data, ensure_ascii=False, indent=2, sort_keys=True),
@@ -0,0 +1,472 @@
+"""Production static file server (``wg serve --production``).
+
+Unlike ``SimpleHTTPRequestHandler`` this handler:
+
+- sends strong ``ETag`` headers taken from the build's output manifest
+  (:mod:`core.output_manifest`), hashing files lazily when there is none or
+  when a file changed after the manifest was written; the manifest is
+  re-read whenever it is rewritten and is never served itself,
+- answers ``If-None-Match`` / ``If-Modified-Since`` with ``304``,
+- negotiates precompressed ``.br`` / ``.gz`` sidecars via ``Accept-Encoding``,
+- serves single ``Range`` requests (``206`` / ``416``, honouring ``If-Range``),
+- sends ``Cache-Control`` by file kind (fingerprinted assets are immutable),
+- writes large bodies with ``socket.sendfile`` (zero-copy where the OS allows)
+  and small hot files from an in-memory LRU,
+- speaks HTTP/1.1 keep-alive with an idle timeout and a per-connection
+  request cap.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import mimetypes
+from pathlib import Path
+import posixpath
+import re
+import threading
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from .output_manifest import (
+    OUTPUT_MANIFEST_FILENAME,
+    SIDECAR_SUFFIXES,
+    hash_file,
+    load_output_manifest,
+)
+
+logger = logging.getLogger(__name__)
+
+# Preference order when the client accepts several encodings.
+_ENCODING_PREFERENCE = ("br", "gzip")
+_FINGERPRINTED = re.compile(r"[.-][0-9a-f]{8,}\.[A-Za-z0-9]+$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_WHOLE_BODY = (-1, -1)
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+HTML_CACHE = "public, max-age=0, must-revalidate"
+DEFAULT_CACHE = "public, max-age=3600"
+
+
+@dataclass
+class _Representation:
+    path: Path
+    size: int
+    etag: str
+    encoding: str | None = None
+
+
+@dataclass
+class _FileEntry:
+    path: Path
+    stat_key: tuple[int, int]
+    mtime: float
+    content_type: str
+    cache_control: str
+    identity: _Representation
+    encoded: dict[str, _Representation] = field(default_factory=dict)
+
+
+class LRUFileCache:
+    """Byte-bounded LRU of small file bodies, keyed by ``(path, mtime_ns, size)``."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entry_bytes: int = 256 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[tuple[Path, int, int], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path, stat_key: tuple[int, int]) -> bytes | None:
+        key = (path, *stat_key)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, path: Path, stat_key: tuple[int, int], data: bytes) -> None:
+        if len(data) > self.max_entry_bytes or self.max_bytes <= 0:
+            return
+        key = (path, *stat_key)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _cache_control_for(path: Path, content_type: str) -> str:
+    if content_type.startswith("text/html"):
+        return HTML_CACHE
+    if _FINGERPRINTED.search(path.name):
+        return IMMUTABLE_CACHE
+    return DEFAULT_CACHE
+
+
+def _accepted_encodings(header: str | None) -> set[str]:
+    accepted: set[str] = set()
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name)
+    if "*" in accepted:
+        accepted.update(_ENCODING_PREFERENCE)
+    return accepted
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2).
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+class StaticFileServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        root: Path,
+        *,
+        keepalive_timeout: float = 5.0,
+        max_keepalive_requests: int = 100,
+        cache: LRUFileCache | None = None,
+    ) -> None:
+        self.root = Path(root).resolve()
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        self.cache = cache if cache is not None else LRUFileCache()
+        self.manifest: dict[str, dict[str, Any]] = {}
+        self._manifest_stat: tuple[int, int] | None = None
+        self._entries: dict[Path, _FileEntry] = {}
+        self._entries_lock = threading.Lock()
+        self.reload_manifest()
+        super().__init__(address, StaticRequestHandler)
+
+    def _stat_manifest(self) -> tuple[int, int] | None:
+        try:
+            stat = (self.root / OUTPUT_MANIFEST_FILENAME).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload_manifest(self) -> None:
+        """Re-read the output manifest and forget every cached file entry."""
+        manifest_stat = self._stat_manifest()
+        manifest = load_output_manifest(self.root)
+        with self._entries_lock:
+            self.manifest = manifest
+            self._manifest_stat = manifest_stat
+            self._entries.clear()
+
+    def _etag_for(self, path: Path, stat_key: tuple[int, int]) -> str:
+        mtime_ns, size = stat_key
+        relative = path.relative_to(self.root).as_posix()
+        with self._entries_lock:
+            entry = self.manifest.get(relative)
+            manifest_stat = self._manifest_stat
+        # A file rewritten after the manifest may keep its size; only trust
+        # the recorded digest for files that have not changed since.
+        if (
+            isinstance(entry, dict)
+            and entry.get("size") == size
+            and entry.get("sha256")
+            and manifest_stat is not None
+            and mtime_ns <= manifest_stat[0]
+        ):
+            digest = str(entry["sha256"])
+        else:
+            digest = hash_file(path)
+        return f'"{digest[:32]}"'
+
+    def file_entry(self, path: Path) -> _FileEntry | None:
+        """Return cached metadata for ``path``, refreshed when its stat changes."""
+        if self._stat_manifest() != self._manifest_stat:
+            self.reload_manifest()
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        with self._entries_lock:
+            cached = self._entries.get(path)
+        if cached is not None and cached.stat_key == stat_key:
+            return cached
+
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in {"application/javascript", "application/json"}:
+            content_type += "; charset=utf-8"
+        identity = _Representation(path, stat.st_size, self._etag_for(path, stat_key))
+        entry = _FileEntry(
+            path=path,
+            stat_key=stat_key,
+            mtime=stat.st_mtime,
+            content_type=content_type,
+            cache_control=_cache_control_for(path, content_type),
+            identity=identity,
+        )
+        for encoding, suffix in SIDECAR_SUFFIXES.items():
+            sidecar = path.with_name(path.name + suffix)
+            try:
+                sidecar_stat = sidecar.stat()
+            except OSError:
+                continue
+            if sidecar_stat.st_mtime_ns < stat.st_mtime_ns:
+                continue  # stale sidecar from an older build
+            entry.encoded[encoding] = _Representation(
+                sidecar,
+                sidecar_stat.st_size,
+                identity.etag[:-1] + f"-{suffix.lstrip('.')}\"",
+                encoding,
+            )
+        with self._entries_lock:
+            self._entries[path] = entry
+        return entry
+
+
+class StaticRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StaticFileServer
+
+    def setup(self) -> None:
+        super().setup()
+        # Idle keep-alive connections are closed when a read times out.
+        self.connection.settimeout(self.server.keepalive_timeout)
+        self._served = 0
+
+    def do_GET(self) -> None:
+        self._serve(head_only=False)
+
+    def do_HEAD(self) -> None:
+        self._serve(head_only=True)
+
+    # -- resolution ---------------------------------------------------------------
+
+    def _resolve(self) -> tuple[Path | None, str | None]:
+        """Return ``(file, None)``, ``(None, redirect_location)`` or ``(None, None)``."""
+        url_path = unquote(urlsplit(self.path).path)
+        normalized = posixpath.normpath(url_path)
+        if normalized.startswith("..") or "\x00" in normalized:
+            return None, None
+        root = self.server.root
+        target = (root / normalized.lstrip("/")).resolve()
+        if target != root and root not in target.parents:
+            return None, None
+        if target.is_dir():
+            if not url_path.endswith("/"):
+                query = urlsplit(self.path).query
+                return None, url_path + "/" + (f"?{query}" if query else "")
+            target = target / "index.html"
+        if not target.is_file() or target.name == OUTPUT_MANIFEST_FILENAME:
+            return None, None
+        return target, None
+
+    # -- response -----------------------------------------------------------------
+
+    def _serve(self, *, head_only: bool) -> None:
+        self._served += 1
+        if self._served >= self.server.max_keepalive_requests:
+            self.close_connection = True
+
+        target, redirect = self._resolve()
+        if redirect is not None:
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header("Location", redirect)
+            self.send_header("Content-Length", "0")
+            self._end_headers()
+            return
+        entry = self.server.file_entry(target) if target is not None else None
+        if entry is None:
+            self._send_not_found(head_only)
+            return
+
+        range_header = self.headers.get("Range")
+        representation = entry.identity
+        if not range_header:
+            accepted = _accepted_encodings(self.headers.get("Accept-Encoding"))
+            for encoding in _ENCODING_PREFERENCE:
+                if encoding in accepted and encoding in entry.encoded:
+                    representation = entry.encoded[encoding]
+                    break
+
+        if self._not_modified(entry, representation):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_validators(entry, representation)
+            self._end_headers()
+            return
+
+        start, end = 0, representation.size - 1
+        status = HTTPStatus.OK
+        if range_header and self._range_applies(entry, representation):
+            parsed = self._parse_range(range_header, representation.size)
+            if parsed is None:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{representation.size}")
+                self.send_header("Content-Length", "0")
+                self._end_headers()
+                return
+            if parsed is not _WHOLE_BODY:
+                start, end = parsed
+                status = HTTPStatus.PARTIAL_CONTENT
+
+        length = max(end - start + 1, 0)
+        self.send_response(status)
+        self._send_validators(entry, representation)
+        self.send_header("Content-Type", entry.content_type)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if representation.encoding:
+            self.send_header("Content-Encoding", representation.encoding)
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{representation.size}")
+        self._end_headers()
+        if not head_only and length:
+            self._write_body(entry, representation, start, length)
+
+    def _send_validators(self, entry: _FileEntry, representation: _Representation) -> None:
+        self.send_header("ETag", representation.etag)
+        self.send_header("Last-Modified", formatdate(entry.mtime, usegmt=True))
+        self.send_header("Cache-Control", entry.cache_control)
+        if entry.encoded:
+            self.send_header("Vary", "Accept-Encoding")
+
+    def _end_headers(self) -> None:
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        else:
+            self.send_header(
+                "Keep-Alive",
+                f"timeout={int(self.server.keepalive_timeout)}, "
+                f"max={self.server.max_keepalive_requests - self._served}",
+            )
+        self.end_headers()
+
+    def _not_modified(self, entry: _FileEntry, representation: _Representation) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, representation.etag)
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return int(entry.mtime) <= since
+        return False
+
+    def _range_applies(self, entry: _FileEntry, representation: _Representation) -> bool:
+        if_range = self.headers.get("If-Range")
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == representation.etag  # strong comparison
+        try:
+            return int(entry.mtime) <= parsedate_to_datetime(if_range).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+
+    @staticmethod
+    def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+        """Parse a single ``bytes=`` range.
+
+        Returns ``None`` when unsatisfiable and :data:`_WHOLE_BODY` for
+        multi-range or malformed headers, which are answered with the full body.
+        """
+        match = _RANGE.match(header.strip())
+        if "," in header or match is None:
+            return _WHOLE_BODY
+        first, last = match.groups()
+        if not first and not last:
+            return _WHOLE_BODY
+        if not first:
+            suffix = int(last)
+            if suffix == 0:
+                return None
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            return None
+        return start, end
+
+    def _write_body(
+        self, entry: _FileEntry, representation: _Representation, start: int, length: int
+    ) -> None:
+        cache = self.server.cache
+        stat_key = (entry.stat_key[0], representation.size)
+        data = cache.get(representation.path, stat_key)
+        if data is None and representation.size <= cache.max_entry_bytes:
+            data = representation.path.read_bytes()
+            cache.put(representation.path, stat_key, data)
+        try:
+            if data is not None:
+                self.wfile.write(data[start : start + length])
+                return
+            with representation.path.open("rb") as handle:
+                self.wfile.flush()
+                self.connection.sendfile(handle, offset=start, count=length)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _send_not_found(self, head_only: bool) -> None:
+        not_found = self.server.root / "404.html"
+        body = not_found.read_bytes() if not_found.is_file() else b"404 Not Found"
+        content_type = "text/html; charset=utf-8" if not_found.is_file() else "text/plain"
+        self.send_response(HTTPStatus.NOT_FOUND)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self._end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def run_static_server(
+    output_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    **options: Any,
+) -> None:
+    """Serve ``output_dir`` until interrupted."""
+    server = StaticFileServer((host, port), output_dir, **options)
+    logger.info(
+        "Serving %s at http://%s:%s (%d manifest entries)",
+        server.root,
+        host,
+        server.server_address[1],
+        len(server.manifest),
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,189 @@
+"""Structured build instrumentation.
+
+A :class:`BuildTracer` records wall-clock and CPU time for named spans (build
+steps, plugin hook invocations, extension build hooks, per-page render phases)
+plus simple named counters (e.g. incremental cache hits/misses). At the end of a
+build it can export:
+
+- Chrome trace-event JSON (load it in ``chrome://tracing`` or Perfetto), and
+- an aggregated summary (JSON for CI trending, a text table for humans).
+
+Tracing is opt-in (``build.trace.enabled`` or ``wg build --trace``). When it is
+disabled the build uses :class:`NullTracer`, whose ``span`` is a shared no-op
+context manager, so the instrumented call sites cost next to nothing.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Iterator
+
+from wg_contracts.ports import FileSystemPort
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILENAME = "trace.json"
+SUMMARY_FILENAME = "summary.json"
+
+CATEGORY_STEP = "step"
+CATEGORY_PLUGIN_HOOK = "plugin_hook"
+CATEGORY_EXTENSION_HOOK = "extension_hook"
+CATEGORY_PAGE = "page"
+
+
+class NullTracer:
+    """Tracer that records nothing (the default for untraced builds)."""
+
+    enabled = False
+
+    _NULL_SPAN = nullcontext()
+
+    def span(self, name: str, category: str = CATEGORY_STEP, **args: Any):
+        return self._NULL_SPAN
+
+    def count(self, name: str, value: int = 1) -> None:
+        return None
+
+    def reset(self) -> None:
+        return None
+
+
+class BuildTracer:
+    """Collects timed spans and counters for one build."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self.events: list[dict[str, Any]] = []
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str, category: str = CATEGORY_STEP, **args: Any) -> Iterator[None]:
+        """Time the enclosed block (wall + thread CPU time)."""
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.thread_time_ns()
+        try:
+            yield
+        finally:
+            wall_ns = time.perf_counter_ns() - wall_start
+            cpu_ns = time.thread_time_ns() - cpu_start
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (wall_start - self._origin_ns) / 1000,
+                "dur": wall_ns / 1000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": {**args, "cpu_us": cpu_ns / 1000},
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment a named counter (e.g. ``build_cache.hit``)."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        """Drop recorded spans and counters so the next build is traced on its own."""
+        with self._lock:
+            self._origin_ns = time.perf_counter_ns()
+            self.events = []
+            self.counters = {}
+
+    # -- reporting ---------------------------------------------------------
+
+    def summary(self) -> dict[str, Any]:
+        """Aggregate spans by (category, name) into totals suitable for CI."""
+        rows: dict[tuple[str, str], dict[str, Any]] = {}
+        for event in self.events:
+            key = (event["cat"], event["name"])
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    "category": event["cat"],
+                    "name": event["name"],
+                    "count": 0,
+                    "wall_ms": 0.0,
+                    "cpu_ms": 0.0,
+                    "max_wall_ms": 0.0,
+                }
+            wall_ms = event["dur"] / 1000
+            row["count"] += 1
+            row["wall_ms"] += wall_ms
+            row["cpu_ms"] += event["args"]["cpu_us"] / 1000
+            row["max_wall_ms"] = max(row["max_wall_ms"], wall_ms)
+
+        ordered = sorted(rows.values(), key=lambda row: row["wall_ms"], reverse=True)
+        for row in ordered:
+            for field in ("wall_ms", "cpu_ms", "max_wall_ms"):
+                row[field] = round(row[field], 3)
+
+        total_wall_ms = sum(
+            row["wall_ms"] for row in ordered if row["category"] == CATEGORY_STEP
+        )
+        return {
+            "total_wall_ms": round(total_wall_ms, 3),
+            "spans": ordered,
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def format_summary_table(self, limit: int = 25) -> str:
+        """Render the summary as a fixed-width text table."""
+        summary = self.summary()
+        header = f"{'category':<16} {'name':<48} {'count':>7} {'wall ms':>11} {'cpu ms':>11} {'max ms':>10}"
+        lines = [header, "-" * len(header)]
+        for row in summary["spans"][:limit]:
+            lines.append(
+                f"{row['category']:<16} {row['name'][:48]:<48} {row['count']:>7} "
+                f"{row['wall_ms']:>11.2f} {row['cpu_ms']:>11.2f} {row['max_wall_ms']:>10.2f}"
+            )
+        for name, value in summary["counters"].items():
+            lines.append(f"{'counter':<16} {name[:48]:<48} {value:>7}")
+        lines.append(f"total build wall time: {summary['total_wall_ms']:.2f} ms")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Return the collected spans as a Chrome trace-event document."""
+        trace_events = list(self.events)
+        if self.counters:
+            end_ts = max((e["ts"] + e["dur"] for e in self.events), default=0)
+            trace_events.append(
+                {
+                    "name": "counters",
+                    "ph": "C",
+                    "ts": end_ts,
+                    "pid": self._pid,
+                    "args": dict(self.counters),
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export(self, output_dir: Path, fs_manager: FileSystemPort) -> tuple[Path, Path]:
+        """Write ``trace.json`` and ``summary.json`` into ``output_dir``."""
+        fs_manager.create_directory(output_dir)
+        trace_path = output_dir / TRACE_FILENAME
+        summary_path = output_dir / SUMMARY_FILENAME
+        fs_manager.write_file(trace_path, json.dumps(self.to_chrome_trace()))
+        fs_manager.write_file(
+            summary_path, json.dumps(self.summary(), indent=2, sort_keys=True)
+        )
+        return trace_path, summary_path
+
+
+def create_tracer(config) -> BuildTracer | NullTracer:
+    """Return a recording tracer when ``build.trace.enabled`` is set."""
+    trace_cfg = config.get("build.trace", {})
+    if isinstance(trace_cfg, dict) and trace_cfg.get("enabled", False):
+        return BuildTracer()
+    return NullTracer()
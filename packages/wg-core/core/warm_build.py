@@ -0,0 +1,427 @@
+"""Warm, incremental rebuilds for long-running processes (``wg watch``, dev servers).
+
+A :class:`WarmBuildSession` performs one full build and then keeps the
+:class:`~core.project.Project` alive: loaded extensions and plugins, the
+template engine and its compiled-template cache, and a
+:class:`~core.discovery.ParsedDocumentCache` of parsed source documents.
+
+On a change it classifies the changed paths:
+
+- config, theme settings or extension code -> cold rebuild (fresh ``Project``;
+  the parse cache survives),
+- templates -> template cache reset and every page re-rendered,
+- data files -> every page re-rendered,
+- content and assets -> warm rebuild.
+
+A warm rebuild re-runs the cheap model/routing steps over the cached documents
+and re-renders only the pages whose inputs changed (per-page fingerprint of
+layout, URL, metadata and processed content). Adding, removing or moving a
+page, or any change to navigation or site data, re-renders everything; stale
+outputs of removed pages are deleted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import logging
+from pathlib import Path
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Protocol, runtime_checkable
+
+from processor.factory import _PROCESSOR_MAP
+from wg_contracts.ports import FileSystemPort
+from .build_cache import compute_build_signature
+from .build_pipeline import StepCallback
+from .discovery import ParsedDocumentCache
+from .tracing import CATEGORY_STEP
+from .watcher import create_watcher, wait_for_changes
+
+if TYPE_CHECKING:
+    from .project import Project
+
+logger = logging.getLogger(__name__)
+
+FULL = "full"
+WARM = "warm"
+NOOP = "noop"
+
+# Steps a warm rebuild never repeats: clearing output would defeat partial
+# rendering, the catalog snapshot is fetched once per session, and frontend
+# bundles are built by their own toolchains.
+_WARM_SKIPPED_STEPS = {"prepare_output_dir", "fetch_runtime_catalog", "build_frontend_targets"}
+_ASSET_STEPS = {"build_tailwind", "copy_assets"}
+
+_CONTENT_SUFFIXES = {f".{ext}" for ext in _PROCESSOR_MAP}
+
+
+@runtime_checkable
+class _InMemoryOutputs(Protocol):
+    """File system that keeps rendered outputs in memory (the dev server's)."""
+
+    def discard(self, filepath: Path) -> bool: ...
+
+    def clear(self) -> None: ...
+
+
+@runtime_checkable
+class _ResettableTemplates(Protocol):
+    """Template engine with a compiled-template cache to drop on template edits."""
+
+    def reset(self) -> None: ...
+
+
+@dataclass
+class RebuildReport:
+    """Outcome of one (re)build."""
+
+    mode: str
+    changed: list[Path] = field(default_factory=list)
+    rendered: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _ChangeKinds:
+    cold: bool = False
+    templates: bool = False
+    data: bool = False
+    assets: bool = False
+    content: bool = False
+
+    @property
+    def any(self) -> bool:
+        return self.cold or self.templates or self.data or self.assets or self.content
+
+
+def _is_within(path: Path, root: Path) -> bool:
+    return path == root or root in path.parents
+
+
+class WarmBuildSession:
+    """Owns a long-lived project and rebuilds it incrementally on change."""
+
+    def __init__(
+        self, config_path: str | Path = "config.yaml", *, fs_manager: FileSystemPort | None = None
+    ) -> None:
+        self.config_path = Path(config_path).resolve()
+        self.fs_manager = fs_manager
+        self.parse_cache = ParsedDocumentCache()
+        self.project: Project | None = None
+        self.lock = threading.RLock()
+        self.last_report: RebuildReport | None = None
+        self._fingerprints: dict[str, str] = {}
+        self._site_signature = ""
+        self._needs_full = True
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def _load_project(self) -> Project:
+        from .bootstrap import bootstrap
+        from .composition import build_project
+
+        config = bootstrap(self.config_path)
+        project = build_project(config, fs_manager=self.fs_manager)
+        project.context.parse_cache = self.parse_cache
+        return project
+
+    def _require_project(self) -> Project:
+        """The project of the last cold build; warm steps only run after one."""
+        if self.project is None:
+            raise RuntimeError("The session has no project yet; call build() first.")
+        return self.project
+
+    def build(self, on_step: StepCallback | None = None) -> RebuildReport:
+        """Cold build: load config, create a fresh project and run the full pipeline.
+
+        ``on_step(name, index, total)`` reports progress before each pipeline step.
+        """
+        with self.lock:
+            started = time.perf_counter()
+            try:
+                self.project = self._load_project()
+                if isinstance(self.fs_manager, _InMemoryOutputs):
+                    self.fs_manager.clear()
+                rendered = self._cold_build(on_step)
+            except Exception as exc:
+                self._needs_full = True
+                logger.error("Build failed: %s", exc, exc_info=True)
+                return self._finish(FULL, [], [], [], started, error=str(exc))
+            self._needs_full = False
+            self._remember_state()
+            return self._finish(FULL, [], rendered, [], started)
+
+    def _cold_build(self, on_step: StepCallback | None) -> list[Path]:
+        project = self._require_project()
+        project.build(on_step=on_step)
+        return [path for page in project.site.pages if (path := page.get_output_path()) is not None]
+
+    def rebuild(
+        self, changed_paths: set[Path] | list[Path], on_step: StepCallback | None = None
+    ) -> RebuildReport:
+        """Bring the output up to date with ``changed_paths``."""
+        changed = sorted({Path(path).resolve() for path in changed_paths})
+        with self.lock:
+            if self.project is None or self._needs_full:
+                report = self.build(on_step)
+                report.changed = changed
+                return report
+
+            kinds = self.classify(changed)
+            if not kinds.any:
+                return self._finish(NOOP, changed, [], [], time.perf_counter())
+            if kinds.cold:
+                logger.info("Configuration or extension change detected; rebuilding from scratch.")
+                report = self.build(on_step)
+                report.changed = changed
+                return report
+
+            started = time.perf_counter()
+            try:
+                rendered, removed = self._warm_rebuild(kinds, on_step)
+            except Exception as exc:
+                self._needs_full = True
+                logger.error("Incremental rebuild failed: %s", exc, exc_info=True)
+                return self._finish(WARM, changed, [], [], started, error=str(exc))
+            return self._finish(WARM, changed, rendered, removed, started)
+
+    def _finish(self, mode, changed, rendered, removed, started, *, error=None) -> RebuildReport:
+        report = RebuildReport(
+            mode=mode,
+            changed=list(changed),
+            rendered=[Path(path) for path in rendered if path is not None],
+            removed=list(removed),
+            seconds=time.perf_counter() - started,
+            error=error,
+        )
+        self.last_report = report
+        return report
+
+    # -- change classification -------------------------------------------------
+
+    def watch_paths(self) -> list[Path]:
+        """Existing files and directories whose changes affect the build."""
+        if self.project is None:
+            return [self.config_path]
+        project = self.project
+        config = project.config
+        candidates: list[Path] = [
+            self.config_path,
+            Path(config.get("content.source_directory", "./source")),
+            Path(config.get("content.data_dir", "./source/data")),
+            Path(config.get("theme.settings", "./theme.settings.yaml")),
+            Path(config.get("theme.site_theme_dir", "./site-theme")),
+            Path("./styles"),
+            project.theme_manager.theme_dir,
+        ]
+        collections = config.get("content.collections", {})
+        if isinstance(collections, dict):
+            for cfg in collections.values():
+                if isinstance(cfg, dict) and cfg.get("path"):
+                    candidates.append(Path(cfg["path"]))
+        candidates.extend(Path(value) for value in config.get("build.asset_dirs", []) or [])
+        candidates.extend(self._extension_roots())
+        candidates.extend(Path(value) for value in project.extension_manager.get_template_dirs())
+
+        paths: list[Path] = []
+        for candidate in candidates:
+            resolved = candidate.resolve()
+            if resolved.exists() and resolved not in paths:
+                paths.append(resolved)
+        # Nested roots (e.g. ./source/shop inside ./source) are covered by their parent.
+        return [path for path in paths if not any(p != path and p in path.parents for p in paths)]
+
+    def _extension_roots(self) -> list[Path]:
+        return [
+            loaded.root_dir.resolve()
+            for loaded in self._require_project().extension_manager.loaded_extensions
+            if loaded.root_dir is not None
+        ]
+
+    def classify(self, changed: list[Path]) -> _ChangeKinds:
+        project = self._require_project()
+        config = project.config
+        kinds = _ChangeKinds()
+        output_dir = Path(config.get("build.output_directory")).resolve()
+        theme_settings = Path(config.get("theme.settings", "./theme.settings.yaml")).resolve()
+        template_roots = [
+            Path(config.get("theme.site_theme_dir", "./site-theme")).resolve(),
+            project.theme_manager.theme_dir.resolve(),
+            *(Path(value).resolve() for value in project.extension_manager.get_template_dirs()),
+        ]
+        data_dir = Path(config.get("content.data_dir", "./source/data")).resolve()
+        asset_roots = [Path("./styles").resolve()] + [
+            Path(value).resolve() for value in config.get("build.asset_dirs", []) or []
+        ]
+        extension_roots = self._extension_roots()
+
+        for path in changed:
+            if _is_within(path, output_dir):
+                continue
+            if path in (self.config_path, theme_settings) or path.name == "theme.yaml":
+                kinds.cold = True
+            elif any(_is_within(path, root) for root in template_roots):
+                if path.suffix == ".html":
+                    kinds.templates = True
+                else:
+                    kinds.assets = True
+            elif any(_is_within(path, root) for root in extension_roots):
+                kinds.cold = True
+            elif _is_within(path, data_dir):
+                kinds.data = True
+            elif any(_is_within(path, root) for root in asset_roots):
+                kinds.assets = True
+            elif path.suffix.lower() in _CONTENT_SUFFIXES or not path.exists():
+                kinds.content = True
+        return kinds
+
+    # -- warm rebuild ------------------------------------------------------------
+
+    def _warm_rebuild(
+        self, kinds: _ChangeKinds, on_step: StepCallback | None = None
+    ) -> tuple[list[Path], list[Path]]:
+        project = self._require_project()
+        ctx = project.context
+        ctx.tracer.reset()
+        if kinds.templates:
+            self._reset_templates()
+        previous_outputs = set(self._fingerprints)
+        self._reset_site()
+
+        skipped = set(_WARM_SKIPPED_STEPS)
+        if not (kinds.assets or kinds.templates):
+            skipped |= _ASSET_STEPS
+        steps = [step for step in project.pipeline.steps if step.name not in skipped]
+
+        rendered: list[Path] = []
+        removed: list[Path] = []
+        for index, step in enumerate(steps, start=1):
+            if on_step is not None:
+                on_step(step.name, index, len(steps))
+            with ctx.tracer.span(step.name, CATEGORY_STEP):
+                if step.name == "render_pages":
+                    pages = self._affected_pages(rerender_all=kinds.templates or kinds.data)
+                    project.pipeline.renderer.render_all(pages)
+                    rendered = [page.get_output_path() for page in pages]
+                    removed = self._remove_stale_outputs(previous_outputs)
+                else:
+                    step.run()
+
+        self._remember_state()
+        logger.info(
+            "Incremental rebuild: %d page(s) re-rendered, %d removed.", len(rendered), len(removed)
+        )
+        return rendered, removed
+
+    def _reset_templates(self) -> None:
+        engine = self._require_project().context.template_engine
+        if isinstance(engine, _ResettableTemplates):
+            engine.reset()
+
+    def _reset_site(self) -> None:
+        site = self._require_project().context.site
+        site.pages = []
+        site.data = {}
+        site.navigation_items = []
+        site.header = ""
+
+    def _page_fingerprint(self, page) -> str:
+        return compute_build_signature(
+            {
+                "layout": page.layout,
+                "url": page.root_rel_url,
+                "title": page.title,
+                "metadata": page.metadata,
+                "model_data": page.model_data,
+                "content": page.processed_content,
+            }
+        )
+
+    def _site_state_signature(self) -> str:
+        site = self._require_project().context.site
+        return compute_build_signature(
+            {
+                "outputs": sorted(str(page.get_output_path()) for page in site.pages),
+                "navigation": site.build_navigation(),
+                "data": json.dumps(site.data, sort_keys=True, default=str),
+            }
+        )
+
+    def _affected_pages(self, *, rerender_all: bool) -> list[Any]:
+        pages = self._require_project().context.site.pages
+        if rerender_all or self._site_state_signature() != self._site_signature:
+            return list(pages)
+        return [
+            page
+            for page in pages
+            if self._fingerprints.get(str(page.get_output_path())) != self._page_fingerprint(page)
+        ]
+
+    def _remove_stale_outputs(self, previous_outputs: set[str]) -> list[Path]:
+        current = {str(page.get_output_path()) for page in self._require_project().context.site.pages}
+        memory = self.fs_manager if isinstance(self.fs_manager, _InMemoryOutputs) else None
+        removed: list[Path] = []
+        for stale in sorted(previous_outputs - current):
+            path = Path(stale)
+            dropped = memory.discard(path) if memory is not None else False
+            if path.is_file():
+                path.unlink()
+                dropped = True
+            if dropped:
+                removed.append(path)
+        return removed
+
+    def _remember_state(self) -> None:
+        pages = self._require_project().context.site.pages
+        self._fingerprints = {
+            str(page.get_output_path()): self._page_fingerprint(page) for page in pages
+        }
+        self._site_signature = self._site_state_signature()
+
+
+def watch_and_rebuild(
+    session: WarmBuildSession,
+    *,
+    interval: float = 1.0,
+    force_polling: bool = False,
+    debounce: float = 0.15,
+    on_report: Callable[[RebuildReport], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> None:
+    """Watch ``session``'s inputs and rebuild on every change until ``should_stop``.
+
+    The watcher is recreated after a cold rebuild whose watch paths changed
+    (e.g. a collection or extension was added to the config).
+    """
+    watch_paths = session.watch_paths()
+    watcher = create_watcher(watch_paths, interval=interval, force_polling=force_polling)
+    logger.info("Watching %d path(s) with the %s backend.", len(watch_paths), watcher.backend)
+    try:
+        while True:
+            changed = wait_for_changes(watcher, debounce=debounce, should_stop=should_stop)
+            if not changed:
+                return
+            report = session.rebuild(changed)
+            if report.ok and report.mode != NOOP:
+                logger.info(
+                    "Rebuilt (%s) in %.2fs: %d page(s) rendered, %d removed.",
+                    report.mode,
+                    report.seconds,
+                    len(report.rendered),
+                    len(report.removed),
+                )
+            if on_report is not None:
+                on_report(report)
+            if report.mode == FULL and session.watch_paths() != watch_paths:
+                watcher.close()
+                watch_paths = session.watch_paths()
+                watcher = create_watcher(watch_paths, interval=interval, force_polling=force_polling)
+    finally:
+        watcher.close()
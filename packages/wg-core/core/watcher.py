@@ -0,0 +1,292 @@
+"""Filesystem change watchers for ``wg watch`` and the dev servers.
+
+:class:`InotifyWatcher` uses Linux inotify (through ``ctypes``, so no extra
+dependency) and reports changes as the kernel delivers them. Everywhere else, or
+when inotify is unavailable (e.g. the watch limit is exhausted),
+:class:`PollingWatcher` diffs ``stat`` snapshots of the watched trees.
+
+Both expose ``poll(timeout) -> set[Path]`` and ``close()``;
+:func:`wait_for_changes` adds debouncing so an editor's save burst (write
+temp file, rename, chmod) triggers one rebuild.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+from pathlib import Path
+import select
+import struct
+import sys
+import time
+from typing import Callable, Iterable, Protocol
+
+logger = logging.getLogger(__name__)
+
+_NOISE_SUFFIXES = (".swp", ".swx", ".swo", ".tmp", "~")
+_NOISE_PREFIXES = (".#",)
+_NOISE_NAMES = {"4913", ".DS_Store"}
+_NOISE_DIRS = {".git", "__pycache__", "node_modules", ".wg-trace"}
+
+
+def is_noise(path: Path) -> bool:
+    """Return True for editor swap/backup files and tool directories."""
+    name = path.name
+    if name in _NOISE_NAMES or name.endswith(_NOISE_SUFFIXES) or name.startswith(_NOISE_PREFIXES):
+        return True
+    return any(part in _NOISE_DIRS for part in path.parts)
+
+
+class FileWatcher(Protocol):
+    backend: str
+
+    def poll(self, timeout: float) -> set[Path]: ...
+
+    def close(self) -> None: ...
+
+
+class PollingWatcher:
+    """Detects changes by comparing ``(mtime_ns, size)`` snapshots."""
+
+    backend = "polling"
+
+    def __init__(self, paths: Iterable[Path], *, interval: float = 1.0) -> None:
+        self.paths = [Path(path).resolve() for path in paths]
+        self.interval = max(float(interval), 0.01)
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for root in self.paths:
+            candidates = [root] if root.is_file() else (root.rglob("*") if root.is_dir() else [])
+            for path in candidates:
+                if is_noise(path):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if path.is_file():
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> set[Path]:
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while True:
+            current = self._take_snapshot()
+            previous = self._snapshot
+            self._snapshot = current
+            changed = {
+                path
+                for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)
+            }
+            if changed:
+                return changed
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+
+# inotify(7) constants.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher (Linux only).
+
+    Directories are watched recursively, including directories created after
+    start-up. A watched *file* is tracked through its parent directory so that
+    editors which save by renaming a temp file over it are still seen.
+    """
+
+    backend = "inotify"
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._dirs: dict[int, Path] = {}
+        self._watched_dirs: set[Path] = set()
+        self._roots: list[Path] = []
+        # Directory -> file names of interest (None means every entry).
+        self._filters: dict[Path, set[str] | None] = {}
+        try:
+            for raw_path in paths:
+                path = Path(raw_path).resolve()
+                self._roots.append(path)
+                if path.is_dir():
+                    self._filters[path] = None
+                    self._watch_tree(path)
+                else:
+                    parent = path.parent
+                    names = self._filters.get(parent, set())
+                    if names is not None:
+                        names.add(path.name)
+                        self._filters[parent] = names
+                    if parent.is_dir():
+                        self._add_watch(parent)
+        except Exception:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: Path) -> None:
+        if directory in self._watched_dirs or is_noise(directory):
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+        self._watched_dirs.add(directory)
+
+    def _watch_tree(self, root: Path) -> None:
+        self._add_watch(root)
+        for directory, subdirs, _ in os.walk(root):
+            subdirs[:] = [name for name in subdirs if name not in _NOISE_DIRS]
+            for name in subdirs:
+                self._add_watch(Path(directory) / name)
+
+    def _is_relevant(self, directory: Path, name: str) -> bool:
+        for watched, names in self._filters.items():
+            if names is None and (directory == watched or watched in directory.parents):
+                return True
+            if names is not None and directory == watched and name in names:
+                return True
+        return False
+
+    def _read_events(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    logger.warning("inotify queue overflowed; treating every watched path as changed.")
+                    changed.update(self._roots)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    self._watched_dirs.discard(directory)
+                    continue
+                if not raw_name:
+                    continue
+                path = directory / os.fsdecode(raw_name)
+                if is_noise(path) or not self._is_relevant(directory, path.name):
+                    continue
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO) and path.is_dir():
+                        self._watch_tree(path)
+                        changed.update(p for p in path.rglob("*") if p.is_file() and not is_noise(p))
+                    changed.add(path)
+                    continue
+                changed.add(path)
+        return changed
+
+    def poll(self, timeout: float) -> set[Path]:
+        if self._fd < 0:
+            return set()
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0.0))
+        if not ready:
+            return set()
+        return self._read_events()
+
+    def close(self) -> None:
+        if getattr(self, "_fd", -1) >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    paths: Iterable[Path], *, interval: float = 1.0, force_polling: bool = False
+) -> FileWatcher:
+    """Return an inotify watcher when possible, otherwise a polling watcher."""
+    paths = list(paths)
+    if not force_polling:
+        try:
+            return InotifyWatcher(paths)
+        except OSError as exc:
+            logger.info("Falling back to polling file watcher: %s", exc)
+    return PollingWatcher(paths, interval=interval)
+
+
+def wait_for_changes(
+    watcher: FileWatcher,
+    *,
+    debounce: float = 0.15,
+    should_stop: Callable[[], bool] | None = None,
+    idle_timeout: float = 0.5,
+) -> set[Path]:
+    """Block until something changes, then collect until ``debounce`` seconds pass quietly.
+
+    Returns an empty set only when ``should_stop`` asks the caller to exit.
+    """
+    changed: set[Path] = set()
+    while not changed:
+        if should_stop is not None and should_stop():
+            return set()
+        changed = watcher.poll(idle_timeout)
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
@@ -32,6 +32,13 @@ class DjangoTemplateEngine(TemplateEngine):
             self.logger.error(msg)
             raise RuntimeError(msg) from exc
 
+    def reset(self) -> None:
+        """Drop compiled templates so edited template files are picked up."""
+        for loader in self.engine.template_loaders:
+            reset = getattr(loader, "reset", None)
+            if callable(reset):
+                reset()
+
     def render_from_string(self, template_string: str, context: dict) -> str:
         template = Template(template_string, engine=self.engine)
         return template.render(Context(context))
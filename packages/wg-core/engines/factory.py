@@ -1,14 +1,30 @@
-from .django_engine import DjangoTemplateEngine
 from .base_engine import TemplateEngine
+from collections.abc import Callable
+import importlib
 import logging
 
 logger = logging.getLogger(__name__)
 
-_TEMPLATE_ENGINES = {
-    "django": DjangoTemplateEngine,
+# Engines are constructed from the list of template directories; the abstract
+# base class does not declare that constructor, so type the registry by it.
+EngineFactory = Callable[[list[str]], TemplateEngine]
+
+# Engine name -> "module:Class". Engines are imported on first use so that
+# importing the factory (e.g. via ``core.project``) does not load Django.
+_TEMPLATE_ENGINES: dict[str, str | EngineFactory] = {
+    "django": "engines.django_engine:DjangoTemplateEngine",
 }
 
 
+def _load_engine_class(name: str) -> EngineFactory | None:
+    engine_class = _TEMPLATE_ENGINES.get(name)
+    if isinstance(engine_class, str):
+        module_name, _, class_name = engine_class.partition(":")
+        engine_class = getattr(importlib.import_module(module_name), class_name)
+        _TEMPLATE_ENGINES[name] = engine_class
+    return engine_class
+
+
 def create_template_engine(name: str, template_dirs: list[str]) -> TemplateEngine:
     """
     Looks up and returns an instance of the requested template engine.
@@ -24,7 +40,7 @@ def create_template_engine(name: str, template_dirs: list[str]) -> TemplateEngin
         ValueError: If no template engine is found for the given name.
     """
     logger.info(f"Attempting to create '{name}' template engine.")
-    engine_class = _TEMPLATE_ENGINES.get(name)
+    engine_class = _load_engine_class(name)
 
     if not engine_class:
         msg = f"Unknown template engine: '{name}'"
@@ -187,3 +187,54 @@ class FileSystemManager:
             ext.lower() if ext.startswith(".") else f".{ext.lower()}"
             for ext in extensions
         ]
+
+
+class OutputOverlayFileSystem(FileSystemManager):
+    """``FileSystemManager`` that keeps text written under the output directory in memory.
+
+    Used by the dev server: rendered pages, JSON exports and manifests are held
+    in an in-memory output map (resolved path -> UTF-8 bytes) and served from
+    there, so a rebuild never round-trips through the disk. Reads of mapped
+    paths are answered from memory; everything else, including binary asset
+    copies, goes to the real filesystem.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        super().__init__()
+        self.output_dir = Path(output_dir).resolve()
+        self._outputs: dict[Path, bytes] = {}
+
+    def _is_output(self, filepath: Path) -> bool:
+        return self.output_dir in filepath.parents
+
+    def write_file(self, filepath: Path, content: str) -> None:
+        resolved = Path(filepath).resolve()
+        if not self._is_output(resolved):
+            super().write_file(filepath, content)
+            return
+        normalized = content.replace("\r\n", "\n").replace("\r", "\n")
+        self._outputs[resolved] = normalized.encode("utf-8")
+        self.logger.debug("Stored in-memory output: %s", resolved)
+
+    def read_file(self, filepath: Path) -> str:
+        data = self._outputs.get(Path(filepath).resolve())
+        if data is not None:
+            return data.decode("utf-8")
+        return super().read_file(filepath)
+
+    def path_exists(self, path: Path) -> bool:
+        return Path(path).resolve() in self._outputs or super().path_exists(path)
+
+    def get_output(self, filepath: Path) -> bytes | None:
+        """Return the in-memory bytes for ``filepath`` or ``None`` if it is not mapped."""
+        return self._outputs.get(Path(filepath).resolve())
+
+    def output_paths(self) -> list[Path]:
+        return sorted(self._outputs)
+
+    def discard(self, filepath: Path) -> bool:
+        """Drop ``filepath`` from the output map; returns whether it was present."""
+        return self._outputs.pop(Path(filepath).resolve(), None) is not None
+
+    def clear(self) -> None:
+        self._outputs.clear()
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from django import forms
 from django.contrib import admin
+from django.db import transaction
 
-from .audit import get_actor_label, log_audit_event, log_model_audit_event
+from .audit import buffered_audit_events, get_actor_label, log_audit_event, log_model_audit_event
 from .integrations.outbox import requeue_dead_letter_event
 from .models import (
     AuditEvent,
@@ -58,16 +59,19 @@ class AdminAuditMixin:
         actor = get_actor_label(request.user)
         model_name = self.model.__name__
         object_ids = [str(value) for value in queryset.values_list("pk", flat=True)]
-        for object_id in object_ids:
-            log_audit_event(
-                action="admin.delete",
-                actor=actor,
-                model_name=model_name,
-                object_id=object_id,
-                description=f"{model_name} deleted from admin (bulk action).",
-                metadata={"source": "django_admin", "bulk": True},
-            )
-        super().delete_queryset(request, queryset)
+        # The deletes and their audit rows commit together; the rows are
+        # written with one bulk insert instead of one INSERT per object.
+        with transaction.atomic(), buffered_audit_events():
+            for object_id in object_ids:
+                log_audit_event(
+                    action="admin.delete",
+                    actor=actor,
+                    model_name=model_name,
+                    object_id=object_id,
+                    description=f"{model_name} deleted from admin (bulk action).",
+                    metadata={"source": "django_admin", "bulk": True},
+                )
+            super().delete_queryset(request, queryset)
 
 
 class ReadOnlyAdminMixin:
@@ -1,9 +1,39 @@
+"""Audit event logging.
+
+:func:`log_audit_event` does not INSERT one row per call. Inside a
+transaction, events are buffered and written with a single
+``bulk_create`` when the transaction commits (nothing is written if it rolls
+back). Each savepoint gets its own buffer, so events logged in a
+rolled-back savepoint are dropped with it. Outside a transaction the event is
+written straight away, and :func:`buffered_audit_events` collects a block of
+calls into one write.
+
+With ``WG_AUDIT_BACKGROUND_WRITER`` enabled, those writes go to a bounded
+queue (``WG_AUDIT_QUEUE_SIZE``) drained by one writer thread in batches of
+``WG_AUDIT_BATCH_SIZE``. If the queue stays full for
+``WG_AUDIT_QUEUE_TIMEOUT_SECONDS`` the caller writes the batch itself, so
+audit events are slowed down under load but never dropped. Queued events
+are flushed at exit; a crash can lose the events still in the queue.
+"""
+
 from __future__ import annotations
 
+import atexit
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+import os
+import queue
+import threading
 from typing import Any
 
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
 from .models import AuditEvent
 
+logger = logging.getLogger(__name__)
+
 
 def get_actor_label(user: Any) -> str:
     if user is None:
@@ -16,7 +46,7 @@ def get_actor_label(user: Any) -> str:
     return str(getattr(user, "username", "") or "")
 
 
-def log_audit_event(
+def build_audit_event(
     *,
     action: str,
     actor: str = "",
@@ -25,7 +55,8 @@ def log_audit_event(
     description: str = "",
     metadata: dict[str, Any] | None = None,
 ) -> AuditEvent:
-    return AuditEvent.objects.create(
+    """An unsaved :class:`AuditEvent` with fields truncated to fit their columns."""
+    return AuditEvent(
         actor=actor[:192],
         action=action[:120],
         model_name=model_name[:120],
@@ -35,6 +66,100 @@ def log_audit_event(
     )
 
 
+class _TransactionAuditBuffer:
+    """Events logged in one transaction (or savepoint); registered with ``on_commit``."""
+
+    def __init__(self) -> None:
+        self.events: list[AuditEvent] = []
+
+    def __call__(self) -> None:
+        write_audit_events(self.events)
+
+
+_local = threading.local()
+
+
+@contextmanager
+def buffered_audit_events() -> Iterator[list[AuditEvent]]:
+    """Collect the audit events logged in this block and write them together when it exits.
+
+    Inside a transaction the collected events still wait for the commit.
+    """
+    outer = getattr(_local, "events", None)
+    events: list[AuditEvent] = []
+    _local.events = events
+    try:
+        yield events
+    finally:
+        _local.events = outer
+        # Also on error: changes committed before it still need their audit trail.
+        if outer is not None:
+            outer.extend(events)
+        else:
+            _dispatch(events)
+
+
+def _transaction_buffers(connection: Any) -> dict[tuple[str, ...], _TransactionAuditBuffer]:
+    """This thread's buffers for the transaction open on ``connection``, by savepoint ids.
+
+    Django replaces ``connection.run_on_commit`` with a new list whenever the
+    transaction commits or rolls back (or a savepoint rolls back), so a change
+    of list means the buffers recorded for the old one were written or dropped.
+    """
+    state: dict[str, tuple[list, dict[tuple[str, ...], _TransactionAuditBuffer]]]
+    state = _local.__dict__.setdefault("buffers", {})
+    hooks, buffers = state.get(connection.alias, (None, {}))
+    if hooks is not connection.run_on_commit:
+        buffers = {}
+        # Keep the list itself, not its id(): a new list could reuse the id.
+        state[connection.alias] = (connection.run_on_commit, buffers)
+    return buffers
+
+
+def _dispatch(events: list[AuditEvent]) -> None:
+    if not events:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        write_audit_events(events)
+        return
+    # One buffer per savepoint, registered once; Django discards it together
+    # with the savepoint on rollback.
+    buffers = _transaction_buffers(connection)
+    key = tuple(connection.savepoint_ids)
+    buffer = buffers.get(key)
+    if buffer is None:
+        buffer = buffers[key] = _TransactionAuditBuffer()
+        transaction.on_commit(buffer)
+    buffer.events.extend(events)
+
+
+def log_audit_event(
+    *,
+    action: str,
+    actor: str = "",
+    model_name: str = "",
+    object_id: str = "",
+    description: str = "",
+    metadata: dict[str, Any] | None = None,
+) -> AuditEvent:
+    """Record an audit event; returns it unsaved when the write is deferred (see module docs)."""
+    event = build_audit_event(
+        action=action,
+        actor=actor,
+        model_name=model_name,
+        object_id=object_id,
+        description=description,
+        metadata=metadata,
+    )
+    collecting = getattr(_local, "events", None)
+    if collecting is not None:
+        collecting.append(event)
+    else:
+        _dispatch([event])
+    return event
+
+
 def log_model_audit_event(
     *,
     action: str,
@@ -53,3 +178,103 @@ def log_model_audit_event(
         description=description,
         metadata=metadata or {},
     )
+
+
+def write_audit_events(events: list[AuditEvent]) -> None:
+    """Write ``events`` now, or hand them to the background writer when it is enabled."""
+    if not events:
+        return
+    if getattr(settings, "WG_AUDIT_BACKGROUND_WRITER", False):
+        _background_writer().submit(events)
+    else:
+        _bulk_insert(events)
+
+
+def _bulk_insert(events: list[AuditEvent]) -> None:
+    AuditEvent.objects.bulk_create(events, batch_size=getattr(settings, "WG_AUDIT_BATCH_SIZE", 500))
+
+
+class AuditBackgroundWriter:
+    """One daemon thread writing queued audit events in batches."""
+
+    def __init__(self, *, max_events: int, batch_size: int, put_timeout: float) -> None:
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self._queue: queue.Queue[AuditEvent] = queue.Queue(maxsize=max_events)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid = 0
+
+    def submit(self, events: list[AuditEvent]) -> None:
+        """Queue ``events``; whatever does not fit within ``put_timeout`` is written inline."""
+        self._ensure_thread()
+        for index, event in enumerate(events):
+            try:
+                self._queue.put(event, timeout=self.put_timeout)
+            except queue.Full:
+                logger.warning("Audit queue is full; writing %d event(s) inline.", len(events) - index)
+                _bulk_insert(events[index:])
+                return
+
+    def flush(self) -> None:
+        """Write everything still queued from the calling thread."""
+        batch = self._drain(block=False)
+        while batch:
+            _bulk_insert(batch)
+            batch = self._drain(block=False)
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            # First use, or a forked child that did not inherit the thread.
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _drain(self, *, block: bool) -> list[AuditEvent]:
+        batch: list[AuditEvent] = []
+        try:
+            batch.append(self._queue.get(block=block))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(block=True)
+            try:
+                _bulk_insert(batch)
+            except Exception:
+                logger.exception("Could not write %d audit event(s)", len(batch))
+            finally:
+                close_old_connections()
+
+
+_writer: AuditBackgroundWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def _background_writer() -> AuditBackgroundWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = AuditBackgroundWriter(
+                max_events=getattr(settings, "WG_AUDIT_QUEUE_SIZE", 10_000),
+                batch_size=getattr(settings, "WG_AUDIT_BATCH_SIZE", 500),
+                put_timeout=getattr(settings, "WG_AUDIT_QUEUE_TIMEOUT_SECONDS", 1.0),
+            )
+        return _writer
+
+
+@atexit.register
+def flush_audit_events() -> None:
+    """Write any events the background writer has not written yet."""
+    if _writer is None:
+        return
+    try:
+        _writer.flush()
+    except Exception:
+        logger.exception("Could not flush queued audit events at exit")
@@ -0,0 +1,213 @@
+"""Catalog snapshot building, materialization and invalidation.
+
+The full snapshot (and each keyset page of it) is serialized once per catalog
+*version* and kept in the Django cache together with its gzip encoding and
+strong ETag. Saving or deleting a product or variant bumps the version (see
+``signals``). The version is bumped again once the transaction commits, so a
+snapshot materialized from pre-commit data is never served after the commit.
+Changes made with ``QuerySet.update()`` send no signals; call
+:func:`invalidate_catalog_snapshot` after such bulk edits.
+
+Multi-process deployments need a shared cache backend (``RUNTIME_CACHE_URL``)
+for invalidations to reach every worker.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+import gzip
+import hashlib
+import json
+import threading
+from typing import Any
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import CatalogTombstone, Product, ProductVariant
+
+CATALOG_VERSION_KEY = "wg:catalog:version"
+CATALOG_CHANGED_AT_KEY = "wg:catalog:changed-at"
+MIN_GZIP_BYTES = 1024
+
+_materialize_lock = threading.Lock()
+
+
+def published_catalog_queryset() -> QuerySet[Product]:
+    """Published products with their published variants prefetched."""
+    published_variants = Prefetch(
+        "variants",
+        queryset=ProductVariant.objects.filter(is_published=True),
+        to_attr="published_variants",
+    )
+    return Product.objects.filter(is_published=True).prefetch_related(published_variants)
+
+
+def product_snapshot(product: Product) -> dict[str, Any]:
+    """One product entry of the catalog snapshot (``price`` stays a ``Decimal``)."""
+    return {
+        "id": str(product.id),
+        "name": product.name,
+        "slug": product.slug,
+        "description": product.description,
+        "metadata": product.metadata,
+        "variants": [
+            {
+                "sku": variant.sku,
+                "label": variant.label,
+                "price": variant.price,
+                "currency": variant.currency,
+                "metadata": variant.metadata,
+            }
+            for variant in product.published_variants
+        ],
+    }
+
+
+def iter_catalog_snapshot(chunk_size: int = 500) -> Iterator[dict[str, Any]]:
+    """Yield snapshot entries, fetching products (and their variants) ``chunk_size`` at a time."""
+    for product in published_catalog_queryset().iterator(chunk_size=chunk_size):
+        yield product_snapshot(product)
+
+
+def snapshot_cursor() -> str:
+    """Cursor for a snapshot taken now; pass it back as ``updated_since``.
+
+    The cursor is moved back by ``WG_CATALOG_DELTA_OVERLAP_SECONDS`` (default
+    5) so rows saved by transactions still in flight when the snapshot was
+    taken show up in the next delta. Clients apply deltas idempotently, so
+    the overlap only costs a few repeated products.
+    """
+    overlap = float(getattr(settings, "WG_CATALOG_DELTA_OVERLAP_SECONDS", 5))
+    return (timezone.now() - timedelta(seconds=overlap)).isoformat()
+
+
+def catalog_delta(since: datetime) -> tuple[list[dict[str, Any]], list[str]]:
+    """Products changed at or after ``since`` and the IDs of products gone from the catalog.
+
+    A product counts as changed when it or any of its variants was saved (or a
+    variant was deleted, see ``signals``). Changed products that are no longer
+    published are reported as deleted, as are products removed outright
+    (recorded by :class:`CatalogTombstone`).
+    """
+    changed = Product.objects.filter(
+        Q(updated_at__gte=since)
+        | Q(pk__in=ProductVariant.objects.filter(updated_at__gte=since).values("product_id"))
+    )
+    products = [
+        product_snapshot(product)
+        for product in published_catalog_queryset().filter(pk__in=changed.values("pk"))
+    ]
+    deleted = {str(pk) for pk in changed.filter(is_published=False).values_list("pk", flat=True)}
+    deleted.update(
+        str(product_id)
+        for product_id in CatalogTombstone.objects.filter(deleted_at__gte=since).values_list(
+            "product_id", flat=True
+        )
+    )
+    return products, sorted(deleted)
+
+
+def catalog_page(*, after: int | None = None, limit: int | None = None) -> dict[str, Any]:
+    """The snapshot document, or one keyset page of it (ordered by primary key).
+
+    Paged documents carry ``next``: the ``after`` value for the following
+    page, or ``None`` on the last page.
+    """
+    cursor = snapshot_cursor()
+    queryset = published_catalog_queryset()
+    if limit is None:
+        return {"products": [product_snapshot(product) for product in queryset], "cursor": cursor}
+
+    queryset = queryset.order_by("pk")
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    products = list(queryset[: limit + 1])
+    has_more = len(products) > limit
+    products = products[:limit]
+    return {
+        "products": [product_snapshot(product) for product in products],
+        "cursor": cursor,
+        "next": str(products[-1].pk) if has_more else None,
+    }
+
+
+@dataclass(frozen=True)
+class EncodedSnapshot:
+    """A serialized snapshot document ready to be sent as-is."""
+
+    body: bytes
+    etag: str
+    gzipped: bytes | None = None
+
+
+def json_default(value: Any) -> str:
+    """``json.dumps`` fallback for snapshot values (prices are ``Decimal``)."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_snapshot(document: dict[str, Any]) -> EncodedSnapshot:
+    body = json.dumps(
+        document, ensure_ascii=False, separators=(",", ":"), default=json_default
+    ).encode("utf-8")
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= MIN_GZIP_BYTES else None
+    return EncodedSnapshot(body=body, etag=etag, gzipped=gzipped)
+
+
+def catalog_version() -> str:
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return str(version)
+
+
+def _bump_catalog_version() -> None:
+    cache.set_many(
+        {
+            CATALOG_VERSION_KEY: uuid.uuid4().hex,
+            CATALOG_CHANGED_AT_KEY: timezone.now().isoformat(),
+        },
+        None,
+    )
+
+
+def invalidate_catalog_snapshot() -> None:
+    """Drop every materialized snapshot now and again when the current transaction commits."""
+    _bump_catalog_version()
+    transaction.on_commit(_bump_catalog_version)
+
+
+def catalog_changed_since(since: datetime) -> bool:
+    """Whether the catalog may have changed at or after ``since`` (``True`` when unknown)."""
+    changed_at = cache.get(CATALOG_CHANGED_AT_KEY)
+    if changed_at is None:
+        return True
+    changed = parse_datetime(str(changed_at))
+    return changed is None or changed >= since
+
+
+def cached_catalog_snapshot(*, after: int | None = None, limit: int | None = None) -> EncodedSnapshot:
+    """Return the materialized snapshot (page) for the current catalog version."""
+    key = f"wg:catalog:snapshot:{catalog_version()}:{after or 0}:{limit or 0}"
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        return snapshot
+    # Concurrent requests after an invalidation materialize once per process.
+    with _materialize_lock:
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = encode_snapshot(catalog_page(after=after, limit=limit))
+            cache.set(key, snapshot, getattr(settings, "WG_CATALOG_CACHE_SECONDS", 3600))
+    return snapshot
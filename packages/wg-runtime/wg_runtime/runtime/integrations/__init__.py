@@ -8,11 +8,13 @@ from .context import (
 # Lazy exports via __getattr__; names are not module-level bindings.
 # pylint: disable=undefined-all-variable
 __all__ = [
+    "IntegrationEvent",
     "IntegrationResolutionError",
     "RuntimeIntegrationContext",
     "apply_payment_callback",
     "create_checkout_order",
     "enqueue_integration_event",
+    "enqueue_integration_events",
     "enqueue_refund_events",
     "get_runtime_integration_context",
     "process_outbox_event",
@@ -21,7 +23,9 @@ __all__ = [
 ]
 
 _lazy_exports = {
+    "IntegrationEvent": (".outbox", "IntegrationEvent"),
     "enqueue_integration_event": (".outbox", "enqueue_integration_event"),
+    "enqueue_integration_events": (".outbox", "enqueue_integration_events"),
     "process_outbox_event": (".outbox", "process_outbox_event"),
     "requeue_dead_letter_event": (".outbox", "requeue_dead_letter_event"),
     "apply_payment_callback": (".services", "apply_payment_callback"),
@@ -4,11 +4,18 @@ This module is independent of the static-site generator. It loads the
 integrations provider map and the adapter registry from runtime-local sources
 (Django settings / a directly-read YAML file), so a request never re-bootstraps
 the SSG.
+
+Resolution is cached per ``(domain, provider)`` for the life of the context:
+the binding, the registry lookup and the kind check run once, and adapter
+instances are reused. Adapters registered with ``metadata={"thread_safe":
+True}`` share one instance per context; any other adapter gets one instance
+per thread. ``reset_runtime_integration_context_cache`` drops all of it.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import threading
 from typing import Any
 
 from wg_contracts.integrations import (
@@ -45,10 +52,27 @@ class ProviderBinding:
     provider_config: dict[str, Any]
 
 
+@dataclass(frozen=True)
+class _ResolvedAdapter:
+    binding: ProviderBinding
+    adapter_cls: Any
+    # Set only for thread-safe adapters; the rest are pooled per thread.
+    shared_instance: Any = None
+
+
 @dataclass(frozen=True)
 class RuntimeIntegrationContext:
     integrations: dict[str, Any]
     adapter_registry: RuntimeAdapterRegistry
+    _resolved: dict[tuple[str, str], _ResolvedAdapter | None] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _resolve_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+    _thread_instances: threading.local = field(
+        default_factory=threading.local, init=False, repr=False, compare=False
+    )
 
     def _integration_domain_config(self, domain: str) -> tuple[str, dict[str, Any]]:
         domain_cfg = self.integrations.get(domain, {})
@@ -103,9 +127,42 @@ class RuntimeIntegrationContext:
         domain: str,
         provider_name: str = "",
     ) -> tuple[Any, ProviderBinding] | tuple[None, None]:
+        """Return the (pooled) adapter instance and binding for ``domain``.
+
+        The binding is shared between callers; copy ``provider_config`` before
+        changing it.
+        """
+        key = (domain, provider_name.strip())
+        try:
+            resolved = self._resolved[key]
+        except KeyError:
+            with self._resolve_lock:
+                if key not in self._resolved:
+                    resolved = self._resolve(domain=domain, provider_name=key[1])
+                    if resolved is not None:
+                        # "" (the default) and the provider's own name share one entry.
+                        bound_key = (domain, resolved.binding.name)
+                        resolved = self._resolved.setdefault(bound_key, resolved)
+                    self._resolved[key] = resolved
+                resolved = self._resolved[key]
+        if resolved is None:
+            return None, None
+        if resolved.shared_instance is not None:
+            return resolved.shared_instance, resolved.binding
+
+        instances = getattr(self._thread_instances, "adapters", None)
+        if instances is None:
+            instances = self._thread_instances.adapters = {}
+        bound_key = (domain, resolved.binding.name)
+        adapter = instances.get(bound_key)
+        if adapter is None:
+            adapter = instances[bound_key] = resolved.adapter_cls()
+        return adapter, resolved.binding
+
+    def _resolve(self, *, domain: str, provider_name: str) -> _ResolvedAdapter | None:
         binding = self.resolve_provider_binding(domain=domain, provider_name=provider_name)
         if binding is None:
-            return None, None
+            return None
 
         if not binding.adapter_name:
             raise IntegrationResolutionError(
@@ -130,7 +187,11 @@ class RuntimeIntegrationContext:
                 f"Adapter '{binding.adapter_name}' has kind '{actual_kind}', expected '{expected_kind}'."
             )
 
-        return adapter_cls(), binding
+        return _ResolvedAdapter(
+            binding=binding,
+            adapter_cls=adapter_cls,
+            shared_instance=adapter_cls() if metadata.get("thread_safe") is True else None,
+        )
 
 
 _context: RuntimeIntegrationContext | None = None
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+import os
+import socket
 from typing import Any
+import uuid
 
-from django.db import transaction
-from django.db.models import Q
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 
 from wg_runtime.runtime.models import IntegrationOutboxEvent
 from .context import IntegrationResolutionError, get_runtime_integration_context
+from .lanes import OutboxLane, lane_backlog
 from wg_contracts.integrations import AdapterResult, is_error_result
 
 
 RETRYABLE_DOMAINS = {"notifications", "shipping", "accounting"}
+# Optional adapter methods that deliver a list of payloads in one call.
+BATCH_METHODS = {"accounting": "export_records"}
 
 
 def _compute_backoff(attempts: int) -> timedelta:
@@ -20,6 +30,86 @@ def _compute_backoff(attempts: int) -> timedelta:
     return timedelta(seconds=seconds)
 
 
+@dataclass(frozen=True)
+class IntegrationEvent:
+    """One outbox event to enqueue (see :func:`enqueue_integration_events`)."""
+
+    event_type: str
+    provider_domain: str
+    payload: dict[str, Any]
+    provider_name: str = ""
+    idempotency_key: str = ""
+    metadata: dict[str, Any] | None = None
+    max_attempts: int = 5
+
+    def to_model(self, now: datetime) -> IntegrationOutboxEvent:
+        return IntegrationOutboxEvent(
+            event_type=str(self.event_type),
+            provider_domain=str(self.provider_domain),
+            provider_name=str(self.provider_name),
+            payload=self.payload or {},
+            metadata=self.metadata or {},
+            max_attempts=max(1, int(self.max_attempts)),
+            idempotency_key=self.idempotency_key.strip(),
+            next_attempt_at=now,
+        )
+
+
+def enqueue_integration_events(
+    events: Iterable[IntegrationEvent],
+) -> list[IntegrationOutboxEvent]:
+    """Insert the outbox events of one business action in bulk.
+
+    Events whose ``idempotency_key`` already exists are not inserted again;
+    the existing row is returned in their place. The unique constraint on the
+    key makes this safe against concurrent enqueues: the losing insert is
+    ignored, and only the rows this call inserted are dispatched: they are
+    tagged with a per-call token in ``locked_by`` until a worker claims them.
+    They are handed to the broker in one message once the surrounding
+    transaction commits, so workers never look for rows they cannot see yet.
+    The query count does not depend on the number of events.
+    """
+    now = timezone.now()
+    token = f"enqueue:{uuid.uuid4().hex}"
+    rows = [event.to_model(now) for event in events]
+    keys = {row.idempotency_key for row in rows if row.idempotency_key}
+
+    existing: dict[str, IntegrationOutboxEvent] = {}
+    if keys:
+        existing = {
+            event.idempotency_key: event
+            for event in IntegrationOutboxEvent.objects.filter(idempotency_key__in=keys)
+        }
+
+    keyed: dict[str, IntegrationOutboxEvent] = {}
+    unkeyed: list[IntegrationOutboxEvent] = []
+    for row in rows:
+        if not row.idempotency_key:
+            unkeyed.append(row)
+        elif row.idempotency_key not in existing:
+            row.locked_by = token
+            keyed.setdefault(row.idempotency_key, row)
+
+    dispatch_ids: list[int] = []
+    if unkeyed:
+        IntegrationOutboxEvent.objects.bulk_create(unkeyed)
+        dispatch_ids.extend(row.id for row in unkeyed)
+    if keyed:
+        # Conflicting rows (inserted concurrently since the lookup above) are
+        # skipped; ignore_conflicts leaves primary keys unset, so read back.
+        IntegrationOutboxEvent.objects.bulk_create(list(keyed.values()), ignore_conflicts=True)
+        for event in IntegrationOutboxEvent.objects.filter(idempotency_key__in=list(keyed)):
+            existing[event.idempotency_key] = event
+            # A concurrent enqueue's row is returned but dispatched by that call.
+            if event.locked_by == token:
+                dispatch_ids.append(event.id)
+
+    if dispatch_ids:
+        # Workers must not pick events up before the rows are visible to them.
+        transaction.on_commit(partial(_dispatch_outbox_events, dispatch_ids))
+    return [existing[row.idempotency_key] if row.idempotency_key else row for row in rows]
+
+
 def enqueue_integration_event(
     *,
     event_type: str,
@@ -30,34 +120,30 @@ def enqueue_integration_event(
     metadata: dict[str, Any] | None = None,
     max_attempts: int = 5,
 ) -> IntegrationOutboxEvent:
-    event_idempotency_key = idempotency_key.strip()
-    if event_idempotency_key:
-        existing = IntegrationOutboxEvent.objects.filter(
-            idempotency_key=event_idempotency_key
-        ).first()
-        if existing is not None:
-            return existing
-
-    event = IntegrationOutboxEvent.objects.create(
-        event_type=str(event_type),
-        provider_domain=str(provider_domain),
-        provider_name=str(provider_name),
-        payload=payload or {},
-        metadata=metadata or {},
-        max_attempts=max(1, int(max_attempts)),
-        idempotency_key=event_idempotency_key,
-        next_attempt_at=timezone.now(),
-    )
+    return enqueue_integration_events(
+        [
+            IntegrationEvent(
+                event_type=event_type,
+                provider_domain=provider_domain,
+                provider_name=provider_name,
+                payload=payload,
+                idempotency_key=idempotency_key,
+                metadata=metadata,
+                max_attempts=max_attempts,
+            )
+        ]
+    )[0]
+
 
+def _dispatch_outbox_events(event_ids: list[int]) -> None:
     # Import lazily to avoid Celery import cycles during Django startup.
     try:
-        from .tasks import dispatch_outbox_event
+        from .tasks import process_outbox_batch
 
-        dispatch_outbox_event.delay(event.id)
+        process_outbox_batch.delay(len(event_ids), event_ids=event_ids)
     except Exception:
         # Best effort enqueue: processing is retried by scanner task.
         pass
-    return event
 
 
 def _dispatch_with_adapter(
@@ -94,43 +180,72 @@ def _dispatch_with_adapter(
     raise IntegrationResolutionError(f"Unsupported outbox domain '{domain}'.")
 
 
-@transaction.atomic
-def process_outbox_event(event_id: int) -> IntegrationOutboxEvent:
-    event = (
-        IntegrationOutboxEvent.objects.select_for_update()
-        .filter(id=event_id)
-        .first()
-    )
-    if event is None:
-        raise ValueError(f"Outbox event '{event_id}' was not found.")
+def _exception_result(provider_name: str, exc: Exception, code: str = "dispatch_exception") -> AdapterResult:
+    return {
+        "status": "error",
+        "provider": provider_name,
+        "metadata": {},
+        "error": {
+            "code": code,
+            "message": str(exc),
+            "retryable": True,
+            "details": {"exception_type": exc.__class__.__name__},
+        },
+    }
 
-    if event.status == IntegrationOutboxEvent.STATUS_SUCCEEDED:
-        return event
-
-    event.status = IntegrationOutboxEvent.STATUS_PROCESSING
-    event.save(update_fields=["status", "updated_at"])
 
+def _deliver(event: IntegrationOutboxEvent) -> AdapterResult:
     try:
-        result = _dispatch_with_adapter(
+        return _dispatch_with_adapter(
             domain=event.provider_domain,
             event_type=event.event_type,
             payload=dict(event.payload or {}),
             provider_name=event.provider_name,
         )
     except Exception as exc:
-        result = {
-            "status": "error",
-            "provider": event.provider_name,
-            "metadata": {},
-            "error": {
-                "code": "dispatch_exception",
-                "message": str(exc),
-                "retryable": True,
-                "details": {"exception_type": exc.__class__.__name__},
-            },
-        }
+        return _exception_result(event.provider_name, exc)
+
+
+def _deliver_batch(events: list[IntegrationOutboxEvent]) -> list[AdapterResult]:
+    """Deliver events of one domain/provider, in one adapter call when the adapter allows.
 
-    event.result_payload = dict(result.get("metadata", {}) or {})
+    Adapters opt in by implementing the domain's method in
+    :data:`BATCH_METHODS`. It takes the list of payloads and returns one
+    result per payload, in order.
+    """
+    first = events[0]
+    method_name = BATCH_METHODS.get(first.provider_domain)
+    if not method_name or len(events) < 2:
+        return [_deliver(event) for event in events]
+    try:
+        adapter, binding = get_runtime_integration_context().resolve_adapter(
+            domain=first.provider_domain, provider_name=first.provider_name
+        )
+    except IntegrationResolutionError:
+        # Per-event delivery records the resolution error on each event.
+        return [_deliver(event) for event in events]
+    batch_method = getattr(adapter, method_name, None)
+    if binding is None or batch_method is None:
+        return [_deliver(event) for event in events]
+
+    try:
+        results = batch_method(
+            [dict(event.payload or {}) for event in events], dict(binding.provider_config)
+        )
+    except Exception as exc:
+        return [_exception_result(first.provider_name, exc)] * len(events)
+    if not isinstance(results, list) or len(results) != len(events):
+        mismatch = ValueError(
+            f"{method_name}() returned {len(results) if isinstance(results, list) else 'no'} "
+            f"result(s) for {len(events)} record(s)."
+        )
+        return [_exception_result(first.provider_name, mismatch, "batch_result_mismatch")] * len(events)
+    return results
+
+
+def _apply_delivery_result(event: IntegrationOutboxEvent, result: AdapterResult) -> list[str]:
+    """Record ``result`` on ``event``; returns the fields that changed."""
+    event.result_payload = dict(result.get("metadata", {}) or {}) if isinstance(result, dict) else {}
     error_cfg = result.get("error", {}) if isinstance(result, dict) else {}
     retryable = bool(error_cfg.get("retryable", False))
     if not isinstance(result, dict) or is_error_result(result):
@@ -145,52 +260,174 @@ def process_outbox_event(event_id: int) -> IntegrationOutboxEvent:
                 event.next_attempt_at = timezone.now() + _compute_backoff(event.attempts)
             else:
                 event.next_attempt_at = None
-        event.save(
-            update_fields=[
-                "status",
-                "attempts",
-                "last_error",
-                "result_payload",
-                "next_attempt_at",
-                "updated_at",
-            ]
-        )
-        return event
+        return ["status", "attempts", "last_error", "result_payload", "next_attempt_at"]
 
     event.status = IntegrationOutboxEvent.STATUS_SUCCEEDED
     event.last_error = ""
     event.next_attempt_at = None
-    event.save(
-        update_fields=[
-            "status",
-            "last_error",
-            "result_payload",
-            "next_attempt_at",
-            "updated_at",
+    return ["status", "last_error", "result_payload", "next_attempt_at"]
+
+
+def _is_leased(event: IntegrationOutboxEvent, now: datetime) -> bool:
+    return (
+        event.status == IntegrationOutboxEvent.STATUS_PROCESSING
+        and event.next_attempt_at is not None
+        and event.next_attempt_at > now
+    )
+
+
+@transaction.atomic
+def process_outbox_event(event_id: int) -> IntegrationOutboxEvent:
+    event = (
+        IntegrationOutboxEvent.objects.select_for_update()
+        .filter(id=event_id)
+        .first()
+    )
+    if event is None:
+        raise ValueError(f"Outbox event '{event_id}' was not found.")
+
+    if event.status == IntegrationOutboxEvent.STATUS_SUCCEEDED:
+        return event
+    # A batch worker holds it (see claim_due_outbox_events).
+    if _is_leased(event, timezone.now()):
+        return event
+
+    event.status = IntegrationOutboxEvent.STATUS_PROCESSING
+    event.save(update_fields=["status", "updated_at"])
+
+    update_fields = _apply_delivery_result(event, _deliver(event))
+    event.locked_by = ""
+    event.save(update_fields=[*update_fields, "locked_by", "updated_at"])
+    return event
+
+
+def _due_outbox_events(now: datetime) -> QuerySet[IntegrationOutboxEvent]:
+    """Events ready for delivery, including ones whose worker lease has expired."""
+    retryable = Q(
+        status__in=[
+            IntegrationOutboxEvent.STATUS_PENDING,
+            IntegrationOutboxEvent.STATUS_FAILED,
         ]
+    ) & (Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+    lease_expired = Q(
+        status=IntegrationOutboxEvent.STATUS_PROCESSING, next_attempt_at__lte=now
+    )
+    return IntegrationOutboxEvent.objects.filter(retryable | lease_expired)
+
+
+def claim_due_outbox_events(
+    *,
+    limit: int = 100,
+    lease_seconds: float | None = None,
+    exclude_ids: Collection[int] = (),
+    lane: OutboxLane | None = None,
+    event_ids: Collection[int] | None = None,
+) -> list[IntegrationOutboxEvent]:
+    """Lease up to ``limit`` due events to the calling worker.
+
+    Claimed events are marked ``processing`` and carry a ``locked_by`` token.
+    Their ``next_attempt_at`` is set to the lease expiry
+    (``WG_OUTBOX_LEASE_SECONDS``, default 300). If a worker dies before it
+    records an outcome, the event becomes due again once the lease expires.
+    Databases that support ``SELECT ... FOR UPDATE SKIP LOCKED`` let
+    concurrent workers claim disjoint batches without waiting on each other.
+    Elsewhere (SQLite) the claiming ``UPDATE`` re-checks that the rows are
+    still due, so a row is never handed to two workers. ``lane`` restricts
+    the claim to the lane's domains; ``exclude_ids`` skips events the caller
+    has already attempted, and ``event_ids`` limits it to the given events.
+    """
+    if lease_seconds is None:
+        lease_seconds = float(getattr(settings, "WG_OUTBOX_LEASE_SECONDS", 300))
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:12]}"[-120:]
+    now = timezone.now()
+    with transaction.atomic():
+        due = _due_outbox_events(now).order_by("created_at")
+        if lane is not None:
+            due = lane.scope(due)
+        if exclude_ids:
+            due = due.exclude(id__in=list(exclude_ids))
+        if event_ids is not None:
+            due = due.filter(id__in=list(event_ids))
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list("id", flat=True)[: max(1, int(limit))])
+        if not ids:
+            return []
+        _due_outbox_events(now).filter(id__in=ids).update(
+            status=IntegrationOutboxEvent.STATUS_PROCESSING,
+            locked_by=token,
+            next_attempt_at=now + timedelta(seconds=lease_seconds),
+            updated_at=now,
+        )
+    return list(
+        IntegrationOutboxEvent.objects.filter(id__in=ids, locked_by=token).order_by("created_at")
+    )
+
+
+def _release_claimed(event: IntegrationOutboxEvent, result: AdapterResult) -> IntegrationOutboxEvent:
+    token = event.locked_by
+    update_fields = _apply_delivery_result(event, result)
+    event.locked_by = ""
+    event.updated_at = timezone.now()
+    IntegrationOutboxEvent.objects.filter(
+        id=event.id,
+        locked_by=token,
+        status=IntegrationOutboxEvent.STATUS_PROCESSING,
+    ).update(
+        locked_by="",
+        updated_at=event.updated_at,
+        **{field: getattr(event, field) for field in update_fields},
     )
     return event
 
 
+def process_claimed_outbox_event(event: IntegrationOutboxEvent) -> IntegrationOutboxEvent:
+    """Deliver an event leased by :func:`claim_due_outbox_events` and release it.
+
+    No row lock is held while the adapter runs. The outcome is only written
+    while the worker still owns the lease; an event whose lease expired
+    and was claimed again by another worker is left to that worker.
+    """
+    return _release_claimed(event, _deliver(event))
+
+
+def process_claimed_outbox_events(
+    events: list[IntegrationOutboxEvent],
+) -> list[IntegrationOutboxEvent]:
+    """Deliver a claimed batch, grouping events per domain and provider.
+
+    Groups whose adapter implements a batch method (:data:`BATCH_METHODS`)
+    are handed over in a single call; the rest are delivered one by one.
+    """
+    groups: dict[tuple[str, str], list[IntegrationOutboxEvent]] = {}
+    for event in events:
+        groups.setdefault((event.provider_domain, event.provider_name), []).append(event)
+    processed: list[IntegrationOutboxEvent] = []
+    for group in groups.values():
+        for event, result in zip(group, _deliver_batch(group)):
+            processed.append(_release_claimed(event, result))
+    return processed
+
+
 def requeue_dead_letter_event(event_id: int) -> IntegrationOutboxEvent:
     event = IntegrationOutboxEvent.objects.filter(id=event_id).first()
     if event is None:
         raise ValueError(f"Outbox event '{event_id}' was not found.")
     event.status = IntegrationOutboxEvent.STATUS_PENDING
     event.last_error = ""
+    event.locked_by = ""
     event.next_attempt_at = timezone.now()
-    event.save(update_fields=["status", "last_error", "next_attempt_at", "updated_at"])
+    event.save(update_fields=["status", "last_error", "locked_by", "next_attempt_at", "updated_at"])
     return event
 
 
-def list_due_outbox_event_ids(*, limit: int = 100) -> list[int]:
-    now = timezone.now()
-    due_qs = IntegrationOutboxEvent.objects.filter(
-        status__in=[
-            IntegrationOutboxEvent.STATUS_PENDING,
-            IntegrationOutboxEvent.STATUS_FAILED,
-        ],
-    ).filter(
-        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
-    )
+def list_due_outbox_event_ids(*, limit: int = 100, lane: OutboxLane | None = None) -> list[int]:
+    due_qs = _due_outbox_events(timezone.now())
+    if lane is not None:
+        due_qs = lane.scope(due_qs)
     return list(due_qs.order_by("created_at").values_list("id", flat=True)[: max(1, int(limit))])
+
+
+def outbox_backlog() -> list[dict[str, Any]]:
+    """Due events and lag (age of the oldest due event) per lane."""
+    return lane_backlog(_due_outbox_events(timezone.now()))
@@ -3,12 +3,13 @@ from __future__ import annotations
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
+from django.db import transaction
 from django.urls import reverse
 
-from wg_runtime.runtime.models import Order, OrderLine, PaymentAttempt, Refund
+from wg_runtime.runtime.models import Order, OrderLine, PaymentAttempt, ProductVariant, Refund
 from .context import IntegrationResolutionError, get_runtime_integration_context
 from wg_contracts.integrations import is_error_result
-from .outbox import enqueue_integration_event
+from .outbox import IntegrationEvent, enqueue_integration_event, enqueue_integration_events
 from .state_machine import transition_order_status
 
 
@@ -59,49 +60,54 @@ def _enqueue_payment_events(order: Order, payment_attempt: PaymentAttempt) -> No
         "provider": payment_attempt.provider,
     }
     if payment_attempt.status == PaymentAttempt.STATUS_PAID:
-        enqueue_integration_event(
-            event_type="payment_succeeded",
-            provider_domain="notifications",
-            provider_name="",
-            payload={"event": "payment_succeeded", **base_payload},
-            idempotency_key=f"payment_succeeded:{order.order_id}:{payment_attempt.attempt_id}",
-        )
-        enqueue_integration_event(
-            event_type="payment_succeeded",
-            provider_domain="accounting",
-            provider_name="",
-            payload={"event": "payment_succeeded", **base_payload},
-            idempotency_key=f"acct_payment_succeeded:{order.order_id}:{payment_attempt.attempt_id}",
-        )
-        enqueue_integration_event(
-            event_type="order_paid",
-            provider_domain="shipping",
-            provider_name="",
-            payload={"event": "order_paid", **base_payload},
-            idempotency_key=f"shipping_order_paid:{order.order_id}",
-        )
-        enqueue_integration_event(
-            event_type="order_paid",
-            provider_domain="accounting",
-            provider_name="",
-            payload={"event": "order_paid", **base_payload},
-            idempotency_key=f"acct_order_paid:{order.order_id}",
+        succeeded_payload = {"event": "payment_succeeded", **base_payload}
+        paid_payload = {"event": "order_paid", **base_payload}
+        enqueue_integration_events(
+            [
+                IntegrationEvent(
+                    event_type="payment_succeeded",
+                    provider_domain="notifications",
+                    payload=succeeded_payload,
+                    idempotency_key=f"payment_succeeded:{order.order_id}:{payment_attempt.attempt_id}",
+                ),
+                IntegrationEvent(
+                    event_type="payment_succeeded",
+                    provider_domain="accounting",
+                    payload=succeeded_payload,
+                    idempotency_key=f"acct_payment_succeeded:{order.order_id}:{payment_attempt.attempt_id}",
+                ),
+                IntegrationEvent(
+                    event_type="order_paid",
+                    provider_domain="shipping",
+                    payload=paid_payload,
+                    idempotency_key=f"shipping_order_paid:{order.order_id}",
+                ),
+                IntegrationEvent(
+                    event_type="order_paid",
+                    provider_domain="accounting",
+                    payload=paid_payload,
+                    idempotency_key=f"acct_order_paid:{order.order_id}",
+                ),
+            ]
         )
         return
 
-    enqueue_integration_event(
-        event_type="payment_failed",
-        provider_domain="notifications",
-        provider_name="",
-        payload={"event": "payment_failed", **base_payload},
-        idempotency_key=f"payment_failed:{order.order_id}:{payment_attempt.attempt_id}",
-    )
-    enqueue_integration_event(
-        event_type="payment_failed",
-        provider_domain="accounting",
-        provider_name="",
-        payload={"event": "payment_failed", **base_payload},
-        idempotency_key=f"acct_payment_failed:{order.order_id}:{payment_attempt.attempt_id}",
+    failed_payload = {"event": "payment_failed", **base_payload}
+    enqueue_integration_events(
+        [
+            IntegrationEvent(
+                event_type="payment_failed",
+                provider_domain="notifications",
+                payload=failed_payload,
+                idempotency_key=f"payment_failed:{order.order_id}:{payment_attempt.attempt_id}",
+            ),
+            IntegrationEvent(
+                event_type="payment_failed",
+                provider_domain="accounting",
+                payload=failed_payload,
+                idempotency_key=f"acct_payment_failed:{order.order_id}:{payment_attempt.attempt_id}",
+            ),
+        ]
     )
 
 
@@ -116,19 +122,21 @@ def enqueue_refund_events(refund: Refund, *, settled: bool = False) -> None:
         "currency": refund.currency,
         "status": refund.status,
     }
-    enqueue_integration_event(
-        event_type=event_name,
-        provider_domain="accounting",
-        provider_name="",
-        payload=payload,
-        idempotency_key=f"acct_{event_name}:{refund.refund_id}",
-    )
-    enqueue_integration_event(
-        event_type=event_name,
-        provider_domain="notifications",
-        provider_name="",
-        payload=payload,
-        idempotency_key=f"notify_{event_name}:{refund.refund_id}",
+    enqueue_integration_events(
+        [
+            IntegrationEvent(
+                event_type=event_name,
+                provider_domain="accounting",
+                payload=payload,
+                idempotency_key=f"acct_{event_name}:{refund.refund_id}",
+            ),
+            IntegrationEvent(
+                event_type=event_name,
+                provider_domain="notifications",
+                payload=payload,
+                idempotency_key=f"notify_{event_name}:{refund.refund_id}",
+            ),
+        ]
     )
 
 
@@ -188,11 +196,30 @@ def _calculate_totals_with_adapters(
     return subtotal_amount, tax_amount, shipping_amount, total_amount
 
 
+def _resolve_line_variants(lines: list[dict[str, Any]]) -> dict[str, ProductVariant]:
+    """Variants referenced by ``lines``, keyed by SKU, fetched in one query."""
+    skus = {str(line.get("sku", ""))[:120] for line in lines}
+    skus.discard("")
+    if not skus:
+        return {}
+    return {
+        variant.sku: variant
+        for variant in ProductVariant.objects.filter(sku__in=skus).only("id", "sku")
+    }
+
+
 def create_checkout_order(
     *,
     request_base_url: str,
     validated_data: dict[str, Any],
 ) -> tuple[Order, PaymentAttempt, str]:
+    """Create the order, its lines and the pending payment attempt.
+
+    Provider calls (totals, checkout session) happen before any row is
+    written. The rows and the ``order_created`` outbox event are then saved
+    in one transaction with a constant number of queries, whatever the line
+    count. Outbox dispatch waits for the commit.
+    """
     lines = validated_data.pop("lines")
     success_url = validated_data.pop("success_url", "")
     failure_url = validated_data.pop("failure_url", "")
@@ -231,27 +258,10 @@ def create_checkout_order(
         },
     }
     order_kwargs.update(validated_data)
-    order = Order.objects.create(**order_kwargs)
-
-    for line in lines:
-        OrderLine.objects.create(
-            order=order,
-            title=str(line.get("title", ""))[:240],
-            sku=str(line.get("sku", ""))[:120],
-            quantity=int(line.get("quantity", 1)),
-            price=normalize_amount(line.get("price", 0)),
-            currency=str(line.get("currency", order.currency)),
-            metadata=dict(line.get("metadata", {}) or {}),
-        )
-
-    payment_attempt = PaymentAttempt.objects.create(
-        order=order,
-        provider=provider_name,
-        amount=order.total_amount,
-        currency=order.currency,
-        status=PaymentAttempt.STATUS_PENDING,
-        metadata={"source": "checkout_session"},
-    )
+    # ``order_id`` is assigned on instantiation, so the session can be opened
+    # before the order is saved and no network call runs inside the transaction.
+    order = Order(**order_kwargs)
+    attempt_metadata: dict[str, Any] = {"source": "checkout_session"}
 
     callback_url = f"{request_base_url.rstrip('/')}{reverse('payment-callback')}"
     gateway_url = callback_url
@@ -280,13 +290,35 @@ def create_checkout_order(
         if isinstance(session_result, dict) and not is_error_result(session_result):
             session_meta = dict(session_result.get("metadata", {}) or {})
             redirect_url = str(session_meta.get("redirect_url", redirect_url))
-            payment_attempt.metadata = {
-                **payment_attempt.metadata,
-                "adapter_session": session_meta,
-            }
-            payment_attempt.save(update_fields=["metadata"])
-
-    _enqueue_order_created_events(order)
+            attempt_metadata["adapter_session"] = session_meta
+
+    with transaction.atomic():
+        order.save(force_insert=True)
+        variants = _resolve_line_variants(lines)
+        OrderLine.objects.bulk_create(
+            [
+                OrderLine(
+                    order=order,
+                    variant=variants.get(str(line.get("sku", ""))[:120]),
+                    title=str(line.get("title", ""))[:240],
+                    sku=str(line.get("sku", ""))[:120],
+                    quantity=int(line.get("quantity", 1)),
+                    price=normalize_amount(line.get("price", 0)),
+                    currency=str(line.get("currency", order.currency)),
+                    metadata=dict(line.get("metadata", {}) or {}),
+                )
+                for line in lines
+            ]
+        )
+        payment_attempt = PaymentAttempt.objects.create(
+            order=order,
+            provider=provider_name,
+            amount=order.total_amount,
+            currency=order.currency,
+            status=PaymentAttempt.STATUS_PENDING,
+            metadata=attempt_metadata,
+        )
+        _enqueue_order_created_events(order)
     return order, payment_attempt, redirect_url
 
 
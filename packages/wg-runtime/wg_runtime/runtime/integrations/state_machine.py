@@ -30,6 +30,8 @@ ALLOWED_TRANSITIONS: dict[str, set[str]] = {
     Order.STATUS_CANCELLED: set(),
     Order.STATUS_FAILED: {Order.STATUS_PENDING_PAYMENT, Order.STATUS_CANCELLED},
 }
+# States an order never leaves.
+TERMINAL_STATUSES = frozenset(status for status, targets in ALLOWED_TRANSITIONS.items() if not targets)
 
 
 def transition_order_status(
@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from celery import shared_task
 
-from .outbox import list_due_outbox_event_ids, process_outbox_event
+from .lanes import get_outbox_lane, outbox_lanes
+from .outbox import (
+    claim_due_outbox_events,
+    list_due_outbox_event_ids,
+    process_claimed_outbox_events,
+    process_outbox_event,
+)
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=5)
@@ -12,9 +18,38 @@ def dispatch_outbox_event(self, event_id: int) -> str:
 
 
 @shared_task(bind=True)
-def retry_due_outbox_events(self, limit: int = 100) -> int:
-    processed = 0
-    for event_id in list_due_outbox_event_ids(limit=limit):
-        dispatch_outbox_event.delay(event_id)
-        processed += 1
-    return processed
+def process_outbox_batch(
+    self, limit: int = 25, lane: str = "", event_ids: list[int] | None = None
+) -> int:
+    """Claim up to ``limit`` due events (of one lane, if given) and deliver them in this task.
+
+    ``event_ids`` restricts the claim to those events; :func:`enqueue_integration_events`
+    uses it to hand over the events of one business action in a single message.
+    """
+    events = claim_due_outbox_events(
+        limit=limit,
+        lane=get_outbox_lane(lane) if lane else None,
+        event_ids=[int(event_id) for event_id in event_ids] if event_ids is not None else None,
+    )
+    process_claimed_outbox_events(events)
+    return len(events)
+
+
+@shared_task(bind=True)
+def retry_due_outbox_events(self, limit: int = 100, batch_size: int | None = None) -> int:
+    """Fan due events out as batch tasks, per lane: one broker message per batch.
+
+    Each batch task claims its own events (``SKIP LOCKED`` where supported),
+    so batches run in parallel on however many Celery workers are available.
+    Lanes with a ``queue`` are routed to it, so a dedicated worker pool can
+    serve them.
+    """
+    due_total = 0
+    for lane in outbox_lanes():
+        due = len(list_due_outbox_event_ids(limit=limit, lane=lane))
+        size = max(1, int(batch_size or lane.batch_size))
+        for _ in range(0, due, size):
+            options = {"queue": lane.queue} if lane.queue else {}
+            process_outbox_batch.apply_async(args=(size, lane.name), **options)
+        due_total += due
+    return due_total
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import IO, Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wg_runtime.runtime.catalog import iter_catalog_snapshot, json_default, snapshot_cursor
+
+FORMATS = ("json", "ndjson")
+
+
+def _infer_format(path: Path) -> str:
+    suffixes = [suffix.lower() for suffix in path.suffixes if suffix.lower() != ".gz"]
+    return "ndjson" if suffixes and suffixes[-1] in {".ndjson", ".jsonl"} else "json"
+
+
+def _dumps(entry: dict[str, Any]) -> str:
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=json_default)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the published catalog snapshot straight from the ORM to a JSON or "
+        "NDJSON file that builds can read with runtime.catalog_snapshot.source: file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Destination file (a .gz suffix gzips the output).")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default=None,
+            help="Snapshot format. Defaults to ndjson for .ndjson/.jsonl files, else json.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Products fetched per database round trip. Defaults to 500.",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        snapshot_format = options.get("format") or _infer_format(output)
+        chunk_size = options.get("chunk_size") or 500
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to the destination and swap it in, so readers never see a
+        # half-written artifact.
+        partial = output.with_name(output.name + ".part")
+        try:
+            with self._open(partial) as handle:
+                count = self._write(handle, snapshot_format, chunk_size)
+            os.replace(partial, output)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {count} product(s) as {snapshot_format} to {output}"
+            )
+        )
+
+    @staticmethod
+    def _open(path: Path) -> IO[str]:
+        if path.name.endswith(".gz.part"):
+            return gzip.open(path, "wt", encoding="utf-8")
+        return path.open("w", encoding="utf-8")
+
+    @staticmethod
+    def _write(handle: IO[str], snapshot_format: str, chunk_size: int) -> int:
+        count = 0
+        if snapshot_format == "ndjson":
+            for entry in iter_catalog_snapshot(chunk_size):
+                handle.write(_dumps(entry))
+                handle.write("\n")
+                count += 1
+            return count
+
+        # The cursor lets a build request deltas from the runtime afterwards.
+        handle.write('{"cursor":%s,"products":[' % json.dumps(snapshot_cursor()))
+        for entry in iter_catalog_snapshot(chunk_size):
+            if count:
+                handle.write(",")
+            handle.write(_dumps(entry))
+            count += 1
+        handle.write("]}\n")
+        return count
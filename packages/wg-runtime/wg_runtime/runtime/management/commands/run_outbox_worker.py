@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+import json
+import logging
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from wg_runtime.runtime.integrations.lanes import LaneMetrics, OutboxLane, outbox_lanes
+from wg_runtime.runtime.integrations.outbox import (
+    claim_due_outbox_events,
+    outbox_backlog,
+    process_claimed_outbox_events,
+)
+from wg_runtime.runtime.models import IntegrationOutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _log_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        # The batch keeps its lease and is retried once the lease expires.
+        logger.error("Outbox batch delivery failed", exc_info=exc)
+
+
+def _deliver(events: list[IntegrationOutboxEvent], metrics: LaneMetrics) -> None:
+    lag = max((timezone.now() - event.created_at).total_seconds() for event in events)
+    started = time.monotonic()
+    try:
+        results = process_claimed_outbox_events(events)
+    finally:
+        # Pool threads each hold their own connection; honour CONN_MAX_AGE.
+        close_old_connections()
+    failed = sum(1 for event in results if event.status != IntegrationOutboxEvent.STATUS_SUCCEEDED)
+    metrics.record_batch(
+        delivered=len(results) - failed,
+        failed=failed,
+        seconds=time.monotonic() - started,
+        lag_seconds=lag,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver outbox events without Celery. Each lane (WG_OUTBOX_LANES) claims due "
+        "events in batches (SELECT ... FOR UPDATE SKIP LOCKED where supported) and "
+        "delivers them on its own thread pool. Run several workers side by side to scale out."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lane",
+            action="append",
+            dest="lanes",
+            help="Serve only this lane (repeatable). Defaults to every lane.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=None, help="Override every lane's batch_size."
+        )
+        parser.add_argument(
+            "--threads", type=int, default=None, help="Override every lane's concurrency."
+        )
+        parser.add_argument(
+            "--lease-seconds",
+            type=float,
+            default=None,
+            help="How long claimed events stay reserved (default: WG_OUTBOX_LEASE_SECONDS).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when no events are due. Defaults to 1.",
+        )
+        parser.add_argument(
+            "--stats-interval",
+            type=float,
+            default=60.0,
+            help="Seconds between per-lane metrics lines. Defaults to 60.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Attempt every due event at most once, then exit.",
+        )
+        parser.add_argument(
+            "--backlog",
+            action="store_true",
+            help="Print due events and lag per lane as JSON, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["backlog"]:
+            self.stdout.write(json.dumps(outbox_backlog(), indent=2))
+            return
+
+        lanes = self._lanes(options)
+        metrics = {lane.name: LaneMetrics(lane.name) for lane in lanes}
+        stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                # Finish the batches in hand, then exit.
+                signal.signal(signum, lambda *_: stop.set())
+
+        # Events that fail without a retry delay are due again immediately; a
+        # one-shot run attempts each event at most once.
+        attempted: set[int] | None = set() if options["once"] else None
+        # Every lane delivers on its own pool, even with a concurrency of 1,
+        # so this loop only claims and a slow lane never delays the others.
+        pools = {
+            lane.name: ThreadPoolExecutor(
+                max_workers=lane.concurrency, thread_name_prefix=f"outbox-{lane.name}"
+            )
+            for lane in lanes
+        }
+        in_flight: dict[str, set[Future]] = {lane.name: set() for lane in lanes}
+        last_stats = time.monotonic()
+        try:
+            while not stop.is_set():
+                claimed = False
+                for lane in lanes:
+                    # Lanes claim in priority order, each up to its own concurrency.
+                    pending = in_flight[lane.name]
+                    pending.difference_update({future for future in pending if future.done()})
+                    if len(pending) >= lane.concurrency:
+                        continue
+                    events = claim_due_outbox_events(
+                        limit=lane.batch_size,
+                        lease_seconds=options["lease_seconds"],
+                        exclude_ids=attempted or (),
+                        lane=lane,
+                    )
+                    if not events:
+                        continue
+                    claimed = True
+                    if attempted is not None:
+                        attempted.update(event.id for event in events)
+                    future = pools[lane.name].submit(_deliver, events, metrics[lane.name])
+                    future.add_done_callback(_log_failure)
+                    pending.add(future)
+
+                busy = [future for pending in in_flight.values() for future in pending]
+                if time.monotonic() - last_stats >= options["stats_interval"]:
+                    self._write_metrics(metrics)
+                    last_stats = time.monotonic()
+                if claimed:
+                    continue
+                if busy:
+                    wait(busy, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                elif attempted is not None:
+                    break
+                else:
+                    stop.wait(options["poll_interval"])
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+
+        self._write_metrics(metrics)
+        processed = sum(m.delivered + m.failed for m in metrics.values())
+        self.stdout.write(self.style.SUCCESS(f"Outbox worker processed {processed} event(s)."))
+
+    @staticmethod
+    def _lanes(options) -> list[OutboxLane]:
+        lanes = outbox_lanes()
+        if options["lanes"]:
+            known = {lane.name for lane in lanes}
+            unknown = sorted(set(options["lanes"]) - known)
+            if unknown:
+                raise CommandError(
+                    f"Unknown outbox lane(s): {', '.join(unknown)}. Known: {', '.join(sorted(known))}."
+                )
+            lanes = [lane for lane in lanes if lane.name in options["lanes"]]
+        overrides = {}
+        for option, field_name in (("batch_size", "batch_size"), ("threads", "concurrency")):
+            if options[option] is not None:
+                if options[option] < 1:
+                    raise CommandError(f"--{option.replace('_', '-')} must be a positive integer.")
+                overrides[field_name] = options[option]
+        return [replace(lane, **overrides) for lane in lanes]
+
+    def _write_metrics(self, metrics: dict[str, LaneMetrics]) -> None:
+        for lane_metrics in metrics.values():
+            snapshot = lane_metrics.snapshot()
+            if not snapshot["batches"]:
+                continue
+            self.stdout.write(
+                "lane={lane} delivered={delivered} failed={failed} batches={batches} "
+                "rate={events_per_second}/s busy={busy_seconds}s "
+                "lag={last_lag_seconds}s max_lag={max_lag_seconds}s".format(**snapshot)
+            )
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:01
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def release_duplicate_idempotency_keys(apps, schema_editor):
+    # The old select-then-insert enqueue could race; keep the key on the
+    # oldest row and blank it on the duplicates so the constraint applies.
+    event_model = apps.get_model("runtime", "IntegrationOutboxEvent")
+    duplicated = (
+        event_model.objects.exclude(idempotency_key="")
+        .values("idempotency_key")
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+        .values_list("idempotency_key", flat=True)
+    )
+    for key in list(duplicated):
+        ids = list(
+            event_model.objects.filter(idempotency_key=key).order_by("id").values_list("id", flat=True)
+        )
+        event_model.objects.filter(id__in=ids[1:]).update(idempotency_key="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runtime', '0005_catalog_delta_snapshots'),
+    ]
+
+    operations = [
+        migrations.RunPython(release_duplicate_idempotency_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='integrationoutboxevent',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key', ''), _negated=True), fields=('idempotency_key',), name='runtime_outbox_unique_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runtime', '0006_outbox_unique_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='integrationoutboxevent',
+            name='locked_by',
+            field=models.CharField(blank=True, default='', max_length=120),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('runtime', '0007_outbox_worker_leases'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'id'], name='runtime_ord_created_aaba2e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='runtime_ord_status_d4ec94_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['provider', 'created_at', 'id'], name='runtime_ord_provide_bbb50f_idx'),
+        ),
+    ]
@@ -14,6 +14,7 @@ class Product(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self) -> str:
         return self.name
@@ -32,11 +33,26 @@ class ProductVariant(models.Model):
 
     class Meta:
         ordering = ["sku"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self) -> str:
         return f"{self.product.name} ({self.sku})"
 
 
+class CatalogTombstone(models.Model):
+    """Records a deleted product so delta catalog snapshots can report it."""
+
+    product_id = models.BigIntegerField()
+    slug = models.SlugField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-deleted_at"]
+
+    def __str__(self) -> str:
+        return f"Deleted product {self.product_id} ({self.slug})"
+
+
 class InventoryItem(models.Model):
     variant = models.OneToOneField(ProductVariant, on_delete=models.CASCADE, related_name="inventory")
     sku = models.CharField(max_length=120)
@@ -119,6 +135,12 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # Keyset pagination of the staff order list, unfiltered and per filter.
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["status", "created_at", "id"]),
+            models.Index(fields=["provider", "created_at", "id"]),
+        ]
 
     def __str__(self) -> str:
         return self.order_id
@@ -243,7 +265,9 @@ class IntegrationOutboxEvent(models.Model):
     idempotency_key = models.CharField(max_length=160, blank=True, default="", db_index=True)
     attempts = models.PositiveIntegerField(default=0)
     max_attempts = models.PositiveIntegerField(default=5)
+    # For ``processing`` events claimed by a batch worker this is the lease expiry.
     next_attempt_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=120, blank=True, default="")
     last_error = models.TextField(blank=True)
     metadata = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -255,6 +279,14 @@ class IntegrationOutboxEvent(models.Model):
             models.Index(fields=["status", "next_attempt_at"]),
             models.Index(fields=["provider_domain", "status"]),
         ]
+        constraints = [
+            # Blank keys opt out of deduplication.
+            models.UniqueConstraint(
+                fields=["idempotency_key"],
+                condition=~models.Q(idempotency_key=""),
+                name="runtime_outbox_unique_idempotency_key",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.event_type} ({self.status})"
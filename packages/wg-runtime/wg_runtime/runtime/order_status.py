@@ -0,0 +1,258 @@
+"""Materialized public order status documents.
+
+The storefront polls ``/orders/<order_id>`` while a payment is in flight, so
+the status document is serialized once per order *version* and kept in the
+Django cache with its ETag, the same way as the catalog snapshot (see
+``runtime.catalog``). This needs a cache shared by every process
+(``RUNTIME_CACHE_URL``); without one, statuses are not cached. Saving an order, one of its lines or payment attempts
+bumps the order's version (see ``signals``), and again once the transaction
+commits. Lines written with ``bulk_create`` send no signals; they are covered
+by saving their order in the same transaction. Call
+:func:`invalidate_order_status` after ``QuerySet.update()`` edits.
+
+Clients can also wait for the next change instead of polling (long-poll and
+server-sent events, see ``views``). Waiting requests block on the configured
+:class:`OrderStatusNotifier` (``WG_ORDER_STATUS_NOTIFIER``):
+
+- ``cache`` (default with ``RUNTIME_CACHE_URL``): polls the order's version
+  in the cache, with backoff. It only works across processes when the cache
+  is shared.
+- ``database`` (default otherwise): polls the order row's ``updated_at``,
+  with backoff. It needs no shared cache but only notices changes saved on
+  the order itself, such as ``transition_order_status``.
+- ``memory``: wakes waiters through a condition variable the moment a change
+  commits. It only sees changes made in the same process, so it is meant for
+  development servers.
+
+A dotted ``module:Class`` path selects a custom notifier.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import importlib
+import threading
+import time
+from typing import Any
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .catalog import EncodedSnapshot, encode_snapshot
+from .integrations.state_machine import TERMINAL_STATUSES
+from .models import Order
+from .serializers import OrderStatusSerializer
+
+
+@dataclass(frozen=True)
+class CachedOrderStatus:
+    snapshot: EncodedSnapshot
+    status: str
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+def _version_key(order_id: str) -> str:
+    return f"wg:order-status:version:{order_id}"
+
+
+def order_status_version(order_id: str) -> str:
+    key = _version_key(order_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return str(version)
+
+
+def invalidate_order_status(order_id: str) -> None:
+    """Drop the order's materialized status now and again when the current transaction commits."""
+    key = _version_key(order_id)
+
+    def bump() -> None:
+        cache.set(key, uuid.uuid4().hex, None)
+
+    def bump_and_notify() -> None:
+        bump()
+        get_order_status_notifier().notify(order_id)
+
+    bump()
+    transaction.on_commit(bump_and_notify)
+
+
+def order_status_document(order: Order) -> dict[str, Any]:
+    """The public status payload; expects ``lines`` to be prefetched."""
+    return OrderStatusSerializer(
+        {
+            "order_id": order.order_id,
+            "status": order.status,
+            "subtotal_amount": order.subtotal_amount,
+            "tax_amount": order.tax_amount,
+            "shipping_amount": order.shipping_amount,
+            "total_amount": order.total_amount,
+            "currency": order.currency,
+            "provider": order.provider,
+            "lines": [
+                {
+                    "title": line.title,
+                    "sku": line.sku,
+                    "quantity": line.quantity,
+                    "price": line.price,
+                    "currency": line.currency,
+                }
+                for line in order.lines.all()
+            ],
+            "metadata": order.metadata,
+        }
+    ).data
+
+
+def _materialize_order_status(order_id: str) -> CachedOrderStatus | None:
+    order = Order.objects.filter(order_id=order_id).prefetch_related("lines").first()
+    if order is None:
+        return None
+    return CachedOrderStatus(
+        snapshot=encode_snapshot(order_status_document(order)), status=order.status
+    )
+
+
+def cached_order_status(order_id: str) -> CachedOrderStatus | None:
+    """The materialized status for the order's current version, or ``None`` if there is no such order.
+
+    With ``WG_ORDER_STATUS_CACHE_SECONDS`` at 0 (the default unless
+    ``RUNTIME_CACHE_URL`` configures a shared cache) the status is read from
+    the database on every call: a per-process cache would keep serving a
+    status that another worker has since changed.
+    """
+    timeout = int(getattr(settings, "WG_ORDER_STATUS_CACHE_SECONDS", 0))
+    if timeout <= 0:
+        return _materialize_order_status(order_id)
+    key = f"wg:order-status:{order_id}:{order_status_version(order_id)}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    cached = _materialize_order_status(order_id)
+    if cached is not None:
+        cache.set(key, cached, timeout)
+    return cached
+
+
+class OrderStatusNotifier:
+    """Lets a request wait until an order may have changed.
+
+    :meth:`token` captures the order's current state before the status is
+    read. :meth:`wait` then blocks until the token changes or ``timeout``
+    passes, and returns whether it changed. A change of token is only a
+    hint; callers re-read the status and wait again if it is the same.
+    This base class polls :meth:`token` with exponential backoff.
+    """
+
+    poll_interval = 0.1
+    max_poll_interval = 2.0
+
+    def token(self, order_id: str) -> str:
+        raise NotImplementedError
+
+    def notify(self, order_id: str) -> None:
+        """Called after a change to the order commits."""
+
+    def wait(self, order_id: str, token: str, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        interval = self.poll_interval
+        while True:
+            if self.token(order_id) != token:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.max_poll_interval)
+
+
+class CacheOrderStatusNotifier(OrderStatusNotifier):
+    def token(self, order_id: str) -> str:
+        return order_status_version(order_id)
+
+
+class DatabaseOrderStatusNotifier(OrderStatusNotifier):
+    def token(self, order_id: str) -> str:
+        updated_at = (
+            Order.objects.filter(order_id=order_id).values_list("updated_at", flat=True).first()
+        )
+        return updated_at.isoformat() if updated_at else ""
+
+
+class InProcessOrderStatusNotifier(OrderStatusNotifier):
+    """Wakes every waiter in this process whenever any order changes."""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._generation = 0
+
+    def token(self, order_id: str) -> str:
+        with self._condition:
+            return str(self._generation)
+
+    def notify(self, order_id: str) -> None:
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def wait(self, order_id: str, token: str, timeout: float) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: str(self._generation) != token, timeout)
+
+
+ORDER_STATUS_NOTIFIERS = {
+    "cache": CacheOrderStatusNotifier,
+    "database": DatabaseOrderStatusNotifier,
+    "memory": InProcessOrderStatusNotifier,
+}
+
+_notifier: tuple[str, OrderStatusNotifier] | None = None
+_notifier_lock = threading.Lock()
+
+
+def get_order_status_notifier() -> OrderStatusNotifier:
+    """The process-wide notifier selected by ``WG_ORDER_STATUS_NOTIFIER``."""
+    global _notifier
+    name = str(getattr(settings, "WG_ORDER_STATUS_NOTIFIER", "database") or "database")
+    with _notifier_lock:
+        if _notifier is None or _notifier[0] != name:
+            if name in ORDER_STATUS_NOTIFIERS:
+                notifier_cls = ORDER_STATUS_NOTIFIERS[name]
+            else:
+                module_name, _, attr = name.partition(":")
+                if not attr:
+                    raise ValueError(
+                        f"WG_ORDER_STATUS_NOTIFIER must be one of "
+                        f"{', '.join(ORDER_STATUS_NOTIFIERS)} or a 'module:Class' path; got '{name}'."
+                    )
+                notifier_cls = getattr(importlib.import_module(module_name), attr)
+            _notifier = (name, notifier_cls())
+        return _notifier[1]
+
+
+def wait_for_order_status(
+    order_id: str, *, known_etags: set[str], timeout: float
+) -> CachedOrderStatus | None:
+    """The order's status once its ETag is not in ``known_etags``, or when ``timeout`` passes.
+
+    Returns right away for orders in a terminal state, and ``None`` if there
+    is no such order.
+    """
+    notifier = get_order_status_notifier()
+    deadline = time.monotonic() + timeout
+    while True:
+        token = notifier.token(order_id)
+        cached = cached_order_status(order_id)
+        if cached is None or cached.terminal or cached.snapshot.etag not in known_etags:
+            return cached
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return cached
+        notifier.wait(order_id, token, remaining)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
+from .catalog import invalidate_catalog_snapshot
 from .integrations.services import enqueue_refund_events
-from .models import Refund
+from .models import CatalogTombstone, Order, OrderLine, PaymentAttempt, Product, ProductVariant, Refund
+from .order_status import invalidate_order_status
 
 
 @receiver(post_save, sender=Refund)
@@ -14,3 +17,41 @@ def emit_refund_events(sender, instance: Refund, created: bool, **kwargs):
         return
     if str(instance.status).strip().lower() == "settled":
         enqueue_refund_events(instance, settled=True)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_delete, sender=ProductVariant)
+def invalidate_catalog_on_change(sender, instance, **kwargs):
+    invalidate_catalog_snapshot()
+
+
+@receiver(post_delete, sender=Product)
+def record_catalog_tombstone(sender, instance: Product, **kwargs):
+    CatalogTombstone.objects.create(product_id=instance.pk, slug=instance.slug)
+    invalidate_catalog_snapshot()
+
+
+@receiver(post_delete, sender=ProductVariant)
+def touch_product_on_variant_delete(sender, instance: ProductVariant, **kwargs):
+    # Deleting a variant changes its product's snapshot entry.
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_order_status_on_change(sender, instance: Order, **kwargs):
+    invalidate_order_status(instance.order_id)
+
+
+@receiver(post_save, sender=OrderLine)
+@receiver(post_delete, sender=OrderLine)
+@receiver(post_save, sender=PaymentAttempt)
+@receiver(post_delete, sender=PaymentAttempt)
+def invalidate_order_status_on_child_change(sender, instance, **kwargs):
+    if sender.order.is_cached(instance):
+        order_id = instance.order.order_id
+    else:
+        order_id = Order.objects.filter(pk=instance.order_id).values_list("order_id", flat=True).first()
+    if order_id:
+        invalidate_order_status(order_id)
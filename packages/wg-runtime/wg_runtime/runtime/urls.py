@@ -5,6 +5,7 @@ from .views import (
     CatalogSnapshotAPIView,
     CheckoutSessionAPIView,
     OrderListAPIView,
+    OrderStatusEventsAPIView,
     PaymentCallbackAPIView,
     PublicOrderStatusAPIView,
 )
@@ -16,5 +17,10 @@ urlpatterns = [
     path("catalog/snapshot", CatalogSnapshotAPIView.as_view(), name="catalog-snapshot"),
     path("payments/callback", PaymentCallbackAPIView.as_view(), name="payment-callback"),
     path("orders/<str:order_id>", PublicOrderStatusAPIView.as_view(), name="public-order-status"),
+    path(
+        "orders/<str:order_id>/events",
+        OrderStatusEventsAPIView.as_view(),
+        name="public-order-status-events",
+    ),
     path("staff/orders", OrderListAPIView.as_view(), name="staff-order-list"),
 ]
@@ -1,29 +1,46 @@
+from collections.abc import Iterator
 import hashlib
 import hmac
+import json
+import time
 from typing import Any
 
 from django.conf import settings
-from django.db.models import Prefetch
-from django.http import HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .auth import IsStaffUser, PUBLIC_STOREFRONT
+from .catalog import (
+    EncodedSnapshot,
+    cached_catalog_snapshot,
+    catalog_changed_since,
+    catalog_delta,
+    encode_snapshot,
+    snapshot_cursor,
+)
 from .integrations import (  # pylint: disable=no-name-in-module
     IntegrationResolutionError,
     apply_payment_callback,
     create_checkout_order,
 )
-from .models import Order, Product, ProductVariant
-from .serializers import (
-    CatalogSnapshotSerializer,
-    CheckoutSessionInputSerializer,
-    OrderStatusSerializer,
-)
+from .models import Order
+from .orders import EXPORT_FORMATS, OrderListFilters, iter_order_export, order_list_page
+from .order_status import CachedOrderStatus, cached_order_status, wait_for_order_status
+from .serializers import CheckoutSessionInputSerializer
 
 
 def _request_base_url(request: Request) -> str:
@@ -134,94 +151,260 @@ class PaymentCallbackAPIView(APIView):
         return Response({"order_id": order.order_id, "status": order.status})
 
 
+def _order_status_wait_seconds(request: Request, default: float = 0.0) -> float:
+    raw = str(request.query_params.get("wait", "")).strip()
+    try:
+        seconds = float(raw) if raw else default
+    except ValueError:
+        seconds = default
+    return max(0.0, min(seconds, float(getattr(settings, "WG_ORDER_STATUS_MAX_WAIT_SECONDS", 30))))
+
+
+def _order_status_cache_control(cached: CachedOrderStatus) -> str:
+    if cached.terminal:
+        return f"private, max-age={getattr(settings, 'WG_ORDER_STATUS_TERMINAL_MAX_AGE', 60)}"
+    return "private, no-cache"
+
+
 class PublicOrderStatusAPIView(APIView):
+    """Public order status, served from the per-order status cache (see ``runtime.order_status``).
+
+    Responses carry a strong ETag; clients polling with ``If-None-Match`` get
+    a ``304`` until the order changes. Orders in a terminal state may also be
+    reused by the client for ``WG_ORDER_STATUS_TERMINAL_MAX_AGE`` seconds.
+
+    Long-poll: with ``?wait=<seconds>`` (capped by
+    ``WG_ORDER_STATUS_MAX_WAIT_SECONDS``) a request whose ``If-None-Match``
+    (or ``?etag=``) matches holds until the order changes, and only answers
+    ``304`` once the wait is over.
+    """
+
     permission_classes = PUBLIC_STOREFRONT
 
-    def get(self, request: Request, order_id: str) -> Response:
-        order = get_object_or_404(Order, order_id=order_id)
-        serializer = OrderStatusSerializer(
-            {
-                "order_id": order.order_id,
-                "status": order.status,
-                "subtotal_amount": order.subtotal_amount,
-                "tax_amount": order.tax_amount,
-                "shipping_amount": order.shipping_amount,
-                "total_amount": order.total_amount,
-                "currency": order.currency,
-                "provider": order.provider,
-                "lines": [
-                    {
-                        "title": line.title,
-                        "sku": line.sku,
-                        "quantity": line.quantity,
-                        "price": line.price,
-                        "currency": line.currency,
-                    }
-                    for line in order.lines.all()
-                ],
-                "metadata": order.metadata,
-            }
+    def get(self, request: Request, order_id: str) -> HttpResponse:
+        wait = _order_status_wait_seconds(request)
+        known = request.META.get("HTTP_IF_NONE_MATCH", "") or str(request.query_params.get("etag", ""))
+        if wait and known:
+            known_etags = {etag.removesuffix("-gz") for etag in _parse_etags(known)}
+            cached = wait_for_order_status(order_id, known_etags=known_etags, timeout=wait)
+        else:
+            cached = cached_order_status(order_id)
+        if cached is None:
+            raise Http404("No Order matches the given query.")
+        return _snapshot_response(
+            request,
+            cached.snapshot,
+            cache_control=_order_status_cache_control(cached),
+            if_none_match=known,
         )
-        return Response(serializer.data)
 
 
-class CatalogSnapshotAPIView(APIView):
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode("utf-8")
+
+
+class OrderStatusEventsAPIView(APIView):
+    """Server-sent events for one order's status.
+
+    Sends the current status right away, then one ``status`` event each time
+    it changes. Event IDs are status ETags, so a reconnecting ``EventSource``
+    (which sends ``Last-Event-ID``) only receives what it has not seen. A
+    stream lasts up to ``?wait=<seconds>`` (default and cap
+    ``WG_ORDER_STATUS_MAX_WAIT_SECONDS``); clients reconnect after that. Once
+    the order reaches a terminal state an ``end`` event closes the stream.
+    """
+
     permission_classes = PUBLIC_STOREFRONT
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+    keepalive_seconds = 15.0
 
-    def get(self, request: Request) -> Response:
-        products = []
-        published_variants = Prefetch(
-            "variants",
-            queryset=ProductVariant.objects.filter(is_published=True),
-            to_attr="published_variants",
+    def get(self, request: Request, order_id: str) -> HttpResponse:
+        cached = cached_order_status(order_id)
+        if cached is None:
+            raise Http404("No Order matches the given query.")
+        duration = _order_status_wait_seconds(
+            request, default=float(getattr(settings, "WG_ORDER_STATUS_MAX_WAIT_SECONDS", 30))
         )
-        product_qs = Product.objects.filter(is_published=True).prefetch_related(
-            published_variants
+        last_event_id = str(request.headers.get("Last-Event-ID", "")).strip()
+        response = StreamingHttpResponse(
+            self._events(order_id, last_event_id, duration), content_type="text/event-stream"
         )
-        for product in product_qs:
-            variants = []
-            for variant in product.published_variants:
-                variants.append(
-                    {
-                        "sku": variant.sku,
-                        "label": variant.label,
-                        "price": variant.price,
-                        "currency": variant.currency,
-                        "metadata": variant.metadata,
-                    }
-                )
+        response["Cache-Control"] = "no-cache"
+        # Stop reverse proxies (nginx) from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
 
-            products.append(
-                {
-                    "id": str(product.id),
-                    "name": product.name,
-                    "slug": product.slug,
-                    "description": product.description,
-                    "metadata": product.metadata,
-                    "variants": variants,
-                }
+    def _events(self, order_id: str, last_event_id: str, duration: float) -> Iterator[bytes]:
+        yield b"retry: 2000\n\n"
+        deadline = time.monotonic() + duration
+        seen = last_event_id
+        while True:
+            remaining = deadline - time.monotonic()
+            cached = wait_for_order_status(
+                order_id,
+                known_etags={seen},
+                timeout=max(0.0, min(remaining, self.keepalive_seconds)),
             )
+            if cached is None:
+                return
+            if cached.snapshot.etag != seen:
+                seen = cached.snapshot.etag
+                yield b"id: %s\nevent: status\ndata: %s\n\n" % (seen.encode("ascii"), cached.snapshot.body)
+            if cached.terminal:
+                yield b"event: end\ndata: {}\n\n"
+                return
+            if deadline - time.monotonic() <= 0:
+                return
+            # Lets the server notice clients that have gone away.
+            yield b": keepalive\n\n"
+
+
+def _parse_etags(header: str) -> set[str]:
+    return {candidate.strip().removeprefix("W/").strip('"') for candidate in header.split(",")}
 
-        serializer = CatalogSnapshotSerializer({"products": products})
-        return Response(serializer.data)
+
+def _etag_matches(header: str, etags: set[str]) -> bool:
+    candidates = _parse_etags(header)
+    return "*" in candidates or bool(candidates & etags)
+
+
+def _snapshot_response(
+    request: Request,
+    snapshot: EncodedSnapshot,
+    *,
+    cache_control: str = "public, no-cache",
+    if_none_match: str | None = None,
+) -> HttpResponse:
+    """Send a materialized snapshot with a strong ETag, 304 handling and optional gzip."""
+    use_gzip = snapshot.gzipped is not None and "gzip" in request.META.get(
+        "HTTP_ACCEPT_ENCODING", ""
+    )
+    etag = f"{snapshot.etag}-gz" if use_gzip else snapshot.etag
+    if if_none_match is None:
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if _etag_matches(if_none_match, {snapshot.etag, f"{snapshot.etag}-gz"}):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(
+            snapshot.gzipped if use_gzip else snapshot.body, content_type="application/json"
+        )
+        if use_gzip:
+            response["Content-Encoding"] = "gzip"
+    response["ETag"] = f'"{etag}"'
+    response["Vary"] = "Accept-Encoding"
+    response["Cache-Control"] = cache_control
+    return response
+
+
+def _optional_positive_int(request: Request, name: str) -> int | None:
+    raw = str(request.query_params.get(name, "")).strip()
+    if not raw:
+        return None
+    value = int(raw)
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer.")
+    return value
+
+
+class CatalogSnapshotAPIView(APIView):
+    """Published catalog, or only what changed since ``?updated_since=<cursor>``.
+
+    Every response carries a ``cursor``. A delta response (``"delta": true``)
+    lists changed products under ``products`` and removed product IDs under
+    ``deleted``. ``?limit=N`` pages the full snapshot by product ID: follow the
+    ``next`` value with ``&after=<next>`` until it is ``null``, and use the
+    first page's cursor for later deltas. Full snapshots and pages are served
+    from the catalog cache (see ``runtime.catalog``).
+    """
+
+    permission_classes = PUBLIC_STOREFRONT
+
+    def get(self, request: Request) -> HttpResponse:
+        raw_since = str(request.query_params.get("updated_since", "")).strip()
+        if raw_since:
+            return self._delta(request, raw_since)
+
+        try:
+            limit = _optional_positive_int(request, "limit")
+            after = _optional_positive_int(request, "after")
+        except ValueError:
+            return Response({"detail": "limit and after must be positive integers."}, status=400)
+        if limit is not None:
+            limit = min(limit, getattr(settings, "WG_CATALOG_PAGE_MAX", 1000))
+        return _snapshot_response(request, cached_catalog_snapshot(after=after, limit=limit))
+
+    def _delta(self, request: Request, raw_since: str) -> HttpResponse:
+        try:
+            since = parse_datetime(raw_since)
+        except ValueError:
+            since = None
+        if since is None:
+            return Response(
+                {"detail": "updated_since must be an ISO 8601 timestamp."}, status=400
+            )
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        products: list[dict[str, Any]] = []
+        deleted: list[str] = []
+        if catalog_changed_since(since):
+            products, deleted = catalog_delta(since)
+        document = {
+            "products": products,
+            "deleted": deleted,
+            "delta": True,
+            "cursor": snapshot_cursor(),
+        }
+        return _snapshot_response(request, encode_snapshot(document))
 
 
 class OrderListAPIView(APIView):
-    """Staff-only order listing (requires JWT from ``/token/obtain/``)."""
+    """Staff-only order listing (requires JWT from ``/token/obtain/``).
+
+    Filters: ``status`` (comma-separated), ``provider``, ``created_after`` and
+    ``created_before`` (ISO 8601). Pages hold ``?limit=N`` orders (default
+    100, capped by ``WG_STAFF_ORDER_PAGE_MAX``), newest first; follow
+    ``next_cursor`` with ``&cursor=<next_cursor>`` until it is ``null``.
+    ``?export=csv`` or ``?export=ndjson`` streams every matching order
+    instead (see ``runtime.orders``).
+    """
 
     permission_classes = [IsStaffUser]
 
-    def get(self, request: Request) -> Response:
-        orders = []
-        for order in Order.objects.order_by("-created_at")[:100]:
-            orders.append(
-                {
-                    "order_id": order.order_id,
-                    "status": order.status,
-                    "total_amount": str(order.total_amount),
-                    "currency": order.currency,
-                    "provider": order.provider,
-                    "created_at": order.created_at.isoformat() if order.created_at else "",
-                }
+    def get(self, request: Request) -> HttpResponse:
+        try:
+            filters = OrderListFilters.from_params(request.query_params)
+            limit = _optional_positive_int(request, "limit") or 100
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+
+        export_format = str(request.query_params.get("export", "")).strip().lower()
+        if export_format:
+            if export_format not in EXPORT_FORMATS:
+                return Response(
+                    {"detail": f"export must be one of {', '.join(EXPORT_FORMATS)}."}, status=400
+                )
+            return self._export(filters, export_format)
+
+        limit = min(limit, getattr(settings, "WG_STAFF_ORDER_PAGE_MAX", 500))
+        try:
+            orders, next_cursor = order_list_page(
+                filters, limit=limit, cursor=str(request.query_params.get("cursor", "")).strip()
             )
-        return Response({"orders": orders})
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+        return Response({"orders": orders, "next_cursor": next_cursor})
+
+    @staticmethod
+    def _export(filters: OrderListFilters, export_format: str) -> StreamingHttpResponse:
+        chunk_size = getattr(settings, "WG_STAFF_ORDER_EXPORT_CHUNK_SIZE", 2000)
+        content_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+        response = StreamingHttpResponse(
+            iter_order_export(filters, export_format, chunk_size),
+            content_type=f"{content_type}; charset=utf-8",
+        )
+        response["Content-Disposition"] = f'attachment; filename="orders.{export_format}"'
+        return response
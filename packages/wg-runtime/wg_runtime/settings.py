@@ -52,6 +52,55 @@ WG_CORS_ALLOWED_ORIGINS = _env_list("WG_CORS_ALLOWED_ORIGINS")
 WG_REQUIRE_SIGNED_CALLBACKS = _env_flag("WG_REQUIRE_SIGNED_CALLBACKS", "False")
 WG_PAYMENT_CALLBACK_SECRET = os.environ.get("WG_PAYMENT_CALLBACK_SECRET", "")
 
+# Catalog snapshot caching (see runtime/catalog.py). Invalidation goes through
+# the Django cache, so multi-process deployments need a shared backend.
+RUNTIME_CACHE_URL = os.environ.get("RUNTIME_CACHE_URL", "")
+if RUNTIME_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": RUNTIME_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wg-runtime",
+        }
+    }
+WG_CATALOG_CACHE_SECONDS = int(os.environ.get("WG_CATALOG_CACHE_SECONDS", "3600"))
+WG_CATALOG_PAGE_MAX = int(os.environ.get("WG_CATALOG_PAGE_MAX", "1000"))
+WG_CATALOG_DELTA_OVERLAP_SECONDS = float(os.environ.get("WG_CATALOG_DELTA_OVERLAP_SECONDS", "5"))
+# Order statuses are only cached in a shared cache: another process's local
+# copy would outlive the change (0 disables caching).
+WG_ORDER_STATUS_CACHE_SECONDS = int(
+    os.environ.get("WG_ORDER_STATUS_CACHE_SECONDS", "300" if RUNTIME_CACHE_URL else "0")
+)
+# Client max-age for status responses of orders in a terminal state (refunded, cancelled).
+WG_ORDER_STATUS_TERMINAL_MAX_AGE = int(os.environ.get("WG_ORDER_STATUS_TERMINAL_MAX_AGE", "60"))
+# How long order status long-polls and event streams may wait (see runtime.order_status).
+WG_ORDER_STATUS_MAX_WAIT_SECONDS = float(os.environ.get("WG_ORDER_STATUS_MAX_WAIT_SECONDS", "30"))
+# The cache notifier only sees other processes' changes through a shared cache.
+WG_ORDER_STATUS_NOTIFIER = os.environ.get(
+    "WG_ORDER_STATUS_NOTIFIER", "cache" if RUNTIME_CACHE_URL else "database"
+)
+WG_STAFF_ORDER_PAGE_MAX = int(os.environ.get("WG_STAFF_ORDER_PAGE_MAX", "500"))
+WG_STAFF_ORDER_EXPORT_CHUNK_SIZE = int(os.environ.get("WG_STAFF_ORDER_EXPORT_CHUNK_SIZE", "2000"))
+# Audit events are buffered per transaction (see runtime/audit.py); the
+# background writer also takes the inserts off the request thread.
+WG_AUDIT_BACKGROUND_WRITER = _env_flag("WG_AUDIT_BACKGROUND_WRITER", "False")
+WG_AUDIT_QUEUE_SIZE = int(os.environ.get("WG_AUDIT_QUEUE_SIZE", "10000"))
+WG_AUDIT_BATCH_SIZE = int(os.environ.get("WG_AUDIT_BATCH_SIZE", "500"))
+WG_AUDIT_QUEUE_TIMEOUT_SECONDS = float(os.environ.get("WG_AUDIT_QUEUE_TIMEOUT_SECONDS", "1"))
+WG_OUTBOX_LEASE_SECONDS = float(os.environ.get("WG_OUTBOX_LEASE_SECONDS", "300"))
+# Per-domain outbox delivery lanes (see runtime.integrations.lanes); lower priority claims first.
+WG_OUTBOX_LANES = {
+    "notifications": {"domains": ["notifications"], "concurrency": 4, "priority": 0, "batch_size": 50},
+    "shipping": {"domains": ["shipping"], "concurrency": 2, "priority": 1, "batch_size": 50},
+    "accounting": {"domains": ["accounting"], "concurrency": 1, "priority": 2, "batch_size": 200},
+}
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -57,3 +57,13 @@ def _reset_runtime_integration_cache():
     reset_runtime_integration_context_cache()
     yield
     reset_runtime_integration_context_cache()
+
+
+@pytest.fixture(autouse=True)
+def _clear_django_cache():
+    """Materialized runtime responses must not leak between tests (rollbacks send no signals)."""
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
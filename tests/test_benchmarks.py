@@ -0,0 +1,84 @@
+"""Smoke tests for the benchmark suite (tiny synthetic sites only)."""
+
+from __future__ import annotations
+
+from benchmarks.runner import (
+    BenchmarkResult,
+    Measurement,
+    check_budgets,
+    load_budgets,
+    run_benchmark,
+)
+from benchmarks.synth import SiteSpec, synthesize_site
+
+
+def test_synthesize_site_writes_documents_and_catalog(tmp_path):
+    site = synthesize_site(tmp_path, SiteSpec(collections=2, pages_per_collection=3, products=4))
+
+    documents = sorted(site.content_dir.rglob("*.md"))
+    assert len(documents) == 6
+    assert documents[0].read_text(encoding="utf-8").startswith("---\n")
+    assert len(site.catalog_snapshot["products"]) == 4
+
+    config = site.make_config()
+    assert config.get("build.output_directory") == str(site.output_dir)
+    assert config.get("content.collections.catalog.type") == "runtime_catalog"
+
+
+def test_run_benchmark_measures_every_stage_on_both_filesystems(tmp_path):
+    spec = SiteSpec(collections=1, pages_per_collection=3, blocks_per_page=2, products=2)
+    result = run_benchmark("unit", spec, workdir=tmp_path)
+
+    keys = {m.key for m in result.measurements}
+    for stage in ("discover", "render", "export", "full_build"):
+        assert f"{stage}.disk" in keys
+        assert f"{stage}.memory" in keys
+    assert all(m.seconds > 0 for m in result.measurements)
+    assert all(m.peak_mb is not None for m in result.measurements)
+
+
+def test_check_budgets_reports_exceeded_limits():
+    result = BenchmarkResult(
+        profile="tiny",
+        spec={},
+        measurements=[
+            Measurement("render", "disk", seconds=2.0, peak_mb=1.0),
+            Measurement("export", "disk", seconds=0.1, peak_mb=50.0),
+            Measurement("discover", "disk", seconds=0.1, peak_mb=1.0),
+        ],
+    )
+    budgets = {
+        "profiles": {
+            "tiny": {
+                "render.disk": {"max_seconds": 1.0},
+                "export.disk": {"max_seconds": 1.0, "max_peak_mb": 10},
+                "discover.disk": {"max_seconds": 1.0, "max_peak_mb": 10},
+            }
+        }
+    }
+
+    violations = check_budgets(result, budgets)
+
+    assert len(violations) == 2
+    assert "render.disk" in violations[0]
+    assert "export.disk" in violations[1]
+    assert result.violations == violations
+
+
+def test_checked_in_budgets_cover_tiny_profile():
+    budgets = load_budgets()
+    tiny = budgets["profiles"]["tiny"]
+    assert set(tiny) == {
+        f"{stage}.{fs}"
+        for stage in ("discover", "render", "export", "full_build")
+        for fs in ("disk", "memory")
+    }
+
+
+def test_ingest_benchmark_builds_one_page_per_product(tmp_path):
+    from benchmarks.ingest import run_ingest_benchmark
+
+    result = run_ingest_benchmark(5, memory=False, output_dir=tmp_path)
+
+    assert result["pages"] == 5
+    assert result["seconds"] > 0
@@ -0,0 +1,95 @@
+"""Tests for opt-in build tracing (Chrome trace + summary export)."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import tempfile
+
+from core.config import Config
+from core.project import Project
+from core.tracing import BuildTracer, NullTracer, create_tracer
+from tests.fakes.in_memory_fs import InMemoryFileSystem
+
+
+def _write_markdown(path: Path, title: str, page_type: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"---\ntitle: {title}\ntype: {page_type}\n---\n\n# {title}\n",
+        encoding="utf-8",
+    )
+
+
+def test_tracer_is_disabled_by_default():
+    assert isinstance(create_tracer(Config()), NullTracer)
+
+
+def test_tracer_records_spans_counters_and_chrome_trace():
+    tracer = BuildTracer()
+    with tracer.span("discover_pages", "step"):
+        with tracer.span("page.context", "page", page="index.html"):
+            pass
+    with tracer.span("page.context", "page", page="about.html"):
+        pass
+    tracer.count("build_cache.hit")
+    tracer.count("build_cache.hit")
+
+    summary = tracer.summary()
+    rows = {(row["category"], row["name"]): row for row in summary["spans"]}
+    assert rows[("page", "page.context")]["count"] == 2
+    assert rows[("step", "discover_pages")]["count"] == 1
+    assert summary["counters"] == {"build_cache.hit": 2}
+
+    trace = tracer.to_chrome_trace()
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(complete) == 3
+    assert all("cpu_us" in event["args"] for event in complete)
+    assert trace["traceEvents"][-1]["ph"] == "C"
+
+    fs = InMemoryFileSystem()
+    trace_path, summary_path = tracer.export(Path("trace-out"), fs)
+    assert json.loads(fs.read_file(trace_path))["traceEvents"]
+    assert json.loads(fs.read_file(summary_path))["counters"]["build_cache.hit"] == 2
+    assert "page.context" in tracer.format_summary_table()
+
+
+def test_traced_build_writes_step_hook_and_page_spans():
+    with tempfile.TemporaryDirectory(dir=os.getcwd()) as temp_dir:
+        temp_path = Path(temp_dir)
+        pages_dir = temp_path / "pages"
+        trace_dir = temp_path / "trace"
+        _write_markdown(pages_dir / "home.md", "Home", "index")
+        _write_markdown(pages_dir / "about.md", "About", "page")
+
+        config = Config()
+        config.settings["build"]["output_directory"] = str(temp_path / "output")
+        config.settings["build"]["trace"] = {"enabled": True, "output_dir": str(trace_dir)}
+        config.settings["content"]["collections"] = {
+            "pages": {
+                "path": str(pages_dir),
+                "type": "page",
+                "route": {"prefix": ""},
+                "layout": "document",
+            }
+        }
+        config.settings["site"]["navigation"] = []
+        config.settings["plugins"] = ["SpecialPagesPlugin"]
+
+        project = Project(config)
+        # Left over from an earlier build of the same (warm) project.
+        with project.tracer.span("stale_step", "step"):
+            project.tracer.count("stale.counter")
+        project.build()
+
+        summary = json.loads((trace_dir / "summary.json").read_text(encoding="utf-8"))
+        names = {(row["category"], row["name"]) for row in summary["spans"]}
+        assert ("step", "render_pages") in names
+        assert ("page", "page.template") in names
+        assert ("plugin_hook", "SpecialPagesPlugin.after_page_parsed") in names
+        assert summary["counters"]["pages.rendered"] == 2
+        assert ("step", "stale_step") not in names
+        assert "stale.counter" not in summary["counters"]
+
+        trace = json.loads((trace_dir / "trace.json").read_text(encoding="utf-8"))
+        assert any(event["name"] == "page.write" for event in trace["traceEvents"])
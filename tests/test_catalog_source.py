@@ -0,0 +1,184 @@
+"""Tests for conditional, cached catalog snapshot fetching."""
+
+from __future__ import annotations
+
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.catalog_source import FileCatalogSource, HttpCatalogSource, merge_catalog_delta
+from core.config import Config
+from core.runtime_manager import RuntimeManager
+from utils.fs_manager import FileSystemManager
+
+SNAPSHOT = {"products": [{"name": f"Product {index}", "slug": f"p-{index}"} for index in range(50)]}
+ETAG = '"catalog-v1"'
+
+
+class _CatalogHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        body = json.dumps(SNAPSHOT).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", ETAG)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+
+class _DeltaCatalogHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        query = parse_qs(urlsplit(self.path).query)
+        self.server.requests.append(query)
+        if "updated_since" not in query:
+            payload = {"cursor": "c1", "products": [{"id": "1", "name": "A"}, {"id": "2", "name": "B"}]}
+        elif query["updated_since"] == ["c1"]:
+            payload = {
+                "cursor": "c2",
+                "delta": True,
+                "products": [{"id": "2", "name": "B2"}, {"id": "3", "name": "C"}],
+                "deleted": ["1"],
+            }
+        else:
+            payload = {"cursor": "c3", "delta": True, "products": [{"id": "3", "name": "C"}], "deleted": []}
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def catalog_url(request):
+    handler = getattr(request, "param", _CatalogHandler)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_conditional_get_reuses_cached_snapshot(tmp_path, catalog_url):
+    server, base_url = catalog_url
+    source = HttpCatalogSource(f"{base_url}/catalog/snapshot", cache_dir=tmp_path / "cache")
+
+    assert source.fetch_snapshot() == SNAPSHOT
+    assert source.not_modified is False
+    assert server.requests[0]["Accept-Encoding"] == "gzip"
+    assert "If-None-Match" not in server.requests[0]
+
+    assert source.fetch_snapshot() == SNAPSHOT
+    assert source.not_modified is True
+    assert server.requests[1]["If-None-Match"] == ETAG
+
+    # A corrupt cache falls back to an unconditional download.
+    source.snapshot_path.write_text("{not json", encoding="utf-8")
+    assert source.fetch_snapshot() == SNAPSHOT
+    assert "If-None-Match" not in server.requests[-1]
+
+
+def test_uncached_source_decodes_gzip_stream(catalog_url):
+    _, base_url = catalog_url
+    source = HttpCatalogSource(f"{base_url}/catalog/snapshot")
+    assert source.fetch_snapshot() == SNAPSHOT
+    assert source.snapshot_path is None
+
+
+def test_unchanged_catalog_skips_rewriting_output(tmp_path, catalog_url):
+    _, base_url = catalog_url
+    config = Config()
+    config.settings["runtime"]["targets"] = [{"name": "api", "public_base_url": base_url}]
+    config.settings["runtime"]["catalog_snapshot"].update(
+        enabled=True,
+        output_dir=str(tmp_path / "runtime"),
+        cache_dir=str(tmp_path / "cache"),
+    )
+    manager = RuntimeManager(config, FileSystemManager(), MagicMock())
+
+    snapshot, output_path = manager.fetch_catalog_snapshot()
+    assert snapshot == SNAPSHOT
+    assert json.loads(output_path.read_text(encoding="utf-8")) == SNAPSHOT
+
+    output_path.write_text("untouched", encoding="utf-8")
+    snapshot, _ = manager.fetch_catalog_snapshot()
+    assert snapshot == SNAPSHOT
+    assert output_path.read_text(encoding="utf-8") == "untouched"
+
+
+def test_file_catalog_source_reads_json_and_ndjson(tmp_path):
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(SNAPSHOT), encoding="utf-8")
+    ndjson_path = tmp_path / "catalog.ndjson"
+    ndjson_path.write_text(
+        "\n".join(json.dumps(product) for product in SNAPSHOT["products"]) + "\n\n",
+        encoding="utf-8",
+    )
+
+    assert FileCatalogSource(json_path).fetch_snapshot() == SNAPSHOT
+    assert FileCatalogSource(ndjson_path).fetch_snapshot() == SNAPSHOT
+
+    config = Config()
+    config.settings["runtime"]["catalog_snapshot"].update(
+        enabled=True, source="file", path=str(ndjson_path), output_dir=str(tmp_path / "out")
+    )
+    manager = RuntimeManager(config, FileSystemManager(), MagicMock())
+    snapshot, output_path = manager.fetch_catalog_snapshot()
+    assert snapshot == SNAPSHOT
+    assert output_path == tmp_path / "out" / "catalog.json"
+
+
+def test_merge_catalog_delta_replaces_appends_and_drops():
+    snapshot = {"products": [{"id": "1", "price": "5"}, {"slug": "legacy"}, {"id": "3"}]}
+    delta = {"products": [{"id": "3", "price": "7"}, {"id": "4"}], "deleted": ["1"], "cursor": "c9"}
+
+    assert merge_catalog_delta(snapshot, delta) is True
+    assert snapshot == {
+        "products": [{"slug": "legacy"}, {"id": "3", "price": "7"}, {"id": "4"}],
+        "cursor": "c9",
+    }
+    # Re-applying the same delta (e.g. an overlapping cursor) changes nothing.
+    assert merge_catalog_delta(snapshot, delta) is False
+
+
+@pytest.mark.parametrize("catalog_url", [_DeltaCatalogHandler], indirect=True)
+def test_http_source_requests_and_merges_deltas(tmp_path, catalog_url):
+    server, base_url = catalog_url
+    source = HttpCatalogSource(f"{base_url}/catalog/snapshot", cache_dir=tmp_path)
+
+    assert [product["id"] for product in source.fetch_snapshot()["products"]] == ["1", "2"]
+
+    snapshot = source.fetch_snapshot()
+    assert server.requests[1] == {"updated_since": ["c1"]}
+    assert snapshot["products"] == [{"id": "2", "name": "B2"}, {"id": "3", "name": "C"}]
+    assert source.not_modified is False
+    # The merged snapshot is what the next build starts from.
+    assert json.loads(source.snapshot_path.read_text(encoding="utf-8")) == snapshot
+
+    source.fetch_snapshot()
+    assert server.requests[2] == {"updated_since": ["c2"]}
+    assert source.not_modified is True
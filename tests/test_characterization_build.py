@@ -4,7 +4,9 @@ This locks the byte-for-byte output of the demo build (`config.yaml`) so that
 the refactoring roadmap can proceed with provable behavior preservation.
 
 The build is deterministic (verified: two consecutive builds produce identical
-hashes for all output files), so a SHA-256 manifest is a reliable oracle.
+hashes for all output files), so a SHA-256 manifest is a reliable oracle. The
+sitemap stamps undated pages with today's date, so the build runs with
+``date.today()`` pinned to the day the manifest was generated.
 
 If an intentional change alters output, regenerate the manifest on Linux (matches CI)
 after ensuring ``.gitattributes`` enforces LF line endings::
@@ -21,12 +23,20 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+from datetime import date
 from pathlib import Path
 
 import pytest
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 GOLDEN_MANIFEST = Path(__file__).resolve().parent / "golden" / "demo_output_manifest.json"
+GOLDEN_BUILD_DATE = date(2026, 6, 27)
+
+
+class _GoldenBuildDate(date):
+    @classmethod
+    def today(cls) -> date:
+        return GOLDEN_BUILD_DATE
 
 
 def _hash_tree(root: Path) -> dict[str, str]:
@@ -52,7 +62,9 @@ def _build_demo_site() -> Path:
 
     config = bootstrap(str(PROJECT_ROOT / "config.yaml"))
     project = Project(config)
-    project.build()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr("plugins.sitemap_generator.date", _GoldenBuildDate)
+        project.build()
 
     output_dir = PROJECT_ROOT / "output"
     assert output_dir.is_dir(), "build did not produce an output directory"
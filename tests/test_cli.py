@@ -1,11 +1,12 @@
 import os
+import subprocess
 import sys
 from pathlib import Path
 import tempfile
 
 import pytest
 
-from cli import build_parser, cmd_init, cmd_new_post, cmd_theme_create, cmd_theme_eject  # noqa: E402
+from cli import _parse_importtime, build_parser, cmd_init, cmd_new_post, cmd_theme_create, cmd_theme_eject, main  # noqa: E402
 
 
 def test_cli_parser_supports_theme_eject():
@@ -129,3 +130,43 @@ theme:
                 )
         finally:
             monkeypatch.chdir(original_cwd)
+
+
+def test_importing_cli_defers_heavy_modules():
+    probe = (
+        "import sys, cli; "
+        "print(','.join(m for m in ('django', 'core.project', 'wg_runtime', 'markdown', 'slugify') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_parse_importtime_reads_depth_and_timings():
+    entries = _parse_importtime(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     yaml.reader",
+            "import time:       300 |        420 |   yaml",
+            "import time:        50 |        470 | core.config",
+            "unrelated log line",
+        ]
+    )
+    assert entries == [
+        ("yaml.reader", 2, 120, 120),
+        ("yaml", 1, 300, 420),
+        ("core.config", 0, 50, 470),
+    ]
+
+
+def test_startup_profile_reports_import_breakdown(monkeypatch, tmp_path, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    assert main(["--startup-profile", "theme", "create", "profiled"]) == 0
+
+    report = capsys.readouterr().err
+    assert "startup imports (before dispatch)" in report
+    assert "command imports (deferred)" in report
+    assert (tmp_path / "themes" / "profiled" / "theme.yaml").exists()
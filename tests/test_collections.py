@@ -6,6 +6,7 @@ import pytest
 
 
 from core.config import Config  # noqa: E402
+from core.discovery import normalize_catalog_products  # noqa: E402
 from core.page import Page  # noqa: E402
 from core.project import Project  # noqa: E402
 
@@ -331,6 +332,27 @@ def test_runtime_catalog_collection_generates_pages_from_snapshot():
         assert page.get_output_path() is not None
 
 
+def test_normalize_catalog_products_shares_nested_values_and_slugifies_names_once():
+    variant = {"sku": "V-1", "price": "5.00", "currency": "EUR"}
+    products = [
+        {"name": "Copper Lantern", "metadata": {"badge": "new"}, "variants": [variant]},
+        {"name": "Copper Lantern", "slug": "copper-lantern-2"},
+        {"title": ""},
+        "not a product",
+    ]
+
+    normalized = normalize_catalog_products(products, {"model": "product", "layout": "product"})
+
+    first, second, missing, invalid = normalized
+    assert first["slug"] == "copper-lantern"
+    assert first["variants"][0] is variant
+    assert (first["sku"], first["price"], first["currency"]) == ("V-1", "5.00", "EUR")
+    assert first["badge"] == "new" and first["layout"] == "product"
+    assert products[0]["metadata"] == {"badge": "new"}
+    assert second["slug"] == "copper-lantern-2"
+    assert missing is None and invalid is None
+
+
 def test_build_ingests_runtime_catalog_and_keeps_editorial_pages_file_based():
     if not _supports_python_dir_creation():
         pytest.skip("Current interpreter cannot create directories in this environment.")
@@ -419,3 +441,54 @@ def test_build_ingests_runtime_catalog_and_keeps_editorial_pages_file_based():
         ).read_text(encoding="utf-8")
         assert "Runtime Product" in runtime_product_html
         assert "USD" in runtime_product_html
+
+
+def test_incremental_build_applies_catalog_delta_to_product_pages():
+    from core.catalog_source import merge_catalog_delta
+
+    if not _supports_python_dir_creation():
+        pytest.skip("Current interpreter cannot create directories in this environment.")
+
+    with tempfile.TemporaryDirectory(dir=os.getcwd()) as temp_dir:
+        output_dir = Path(temp_dir) / "output"
+        config = Config()
+        config.settings["build"]["output_directory"] = str(output_dir)
+        config.settings["build"]["incremental"] = True
+        config.settings["content"]["collections"] = {
+            "shop": {
+                "type": "runtime_catalog",
+                "model": "product",
+                "route": {"prefix": "shop"},
+                "layout": "document",
+            }
+        }
+        snapshot = {
+            "products": [
+                {
+                    "id": str(index),
+                    "name": f"Product {index}",
+                    "slug": f"product-{index}",
+                    "variants": [{"sku": f"SKU-{index}", "price": "10.00", "currency": "USD"}],
+                }
+                for index in range(3)
+            ]
+        }
+
+        def build() -> None:
+            project = Project(config)
+            project.runtime_manager.fetch_catalog_snapshot = lambda: (snapshot, None)
+            project.build()
+
+        build()
+        pages = {index: output_dir / "shop" / f"product-{index}" / "index.html" for index in range(3)}
+        for path in pages.values():
+            path.write_text("previous render", encoding="utf-8")
+
+        repriced = [{"sku": "SKU-1", "price": "12.00", "currency": "USD"}]
+        changed = dict(snapshot["products"][1], variants=repriced)
+        merge_catalog_delta(snapshot, {"delta": True, "products": [changed], "deleted": ["0"]})
+        build()
+
+        assert not pages[0].exists()
+        assert pages[2].read_text(encoding="utf-8") == "previous render"
+        assert pages[1].read_text(encoding="utf-8") != "previous render"
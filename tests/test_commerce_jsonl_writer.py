@@ -0,0 +1,84 @@
+"""Tests for the buffered, rotating accounting JSONL writer."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+import time
+
+import pytest
+
+from wg_commerce.extension import JsonlAccountingExporterAdapter
+from wg_commerce.jsonl_writer import (
+    JsonlWriterOptions,
+    RotatingJsonlWriter,
+    close_jsonl_writers,
+    get_jsonl_writer,
+)
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_export_records_appends_batches_through_one_shared_writer(tmp_path):
+    output = tmp_path / "acct" / "export.jsonl"
+    config = {"output_file": str(output), "fsync": "always"}
+    adapter = JsonlAccountingExporterAdapter()
+
+    results = adapter.export_records([{"n": 1}, {"n": 2}], config)
+    single = JsonlAccountingExporterAdapter().export_record({"n": 3}, config)
+
+    assert [result["status"] for result in results] == ["ok", "ok"]
+    assert results[0]["metadata"]["durability"] == "fsynced"
+    assert single["metadata"]["output_file"] == str(output.resolve())
+    # Records are readable as soon as the call returns, before any close.
+    assert _lines(output) == [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert get_jsonl_writer(output, JsonlWriterOptions.from_config(config)) is get_jsonl_writer(
+        output, JsonlWriterOptions(fsync="always")
+    )
+    close_jsonl_writers()
+
+
+def test_writer_rotates_by_size_and_gzips_segments(tmp_path):
+    output = tmp_path / "export.jsonl"
+    writer = get_jsonl_writer(output, JsonlWriterOptions(fsync="never", max_bytes=40, compress=True))
+
+    assert writer.write_records([{"batch": 1, "pad": "x" * 10}]) == "flushed"
+    writer.write_records([{"batch": 2, "pad": "y" * 10}])
+
+    deadline = time.monotonic() + 5
+    while not list(tmp_path.glob("export.*.jsonl.gz")) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    (segment,) = tmp_path.glob("export.*.jsonl.gz")
+    assert json.loads(gzip.decompress(segment.read_bytes()))["batch"] == 1
+    assert _lines(output) == [{"batch": 2, "pad": "y" * 10}]
+    close_jsonl_writers()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="cross-process locking needs fcntl")
+def test_two_writers_share_one_rotation(tmp_path):
+    # Two writers on one path stand in for two worker processes.
+    output = tmp_path / "export.jsonl"
+    options = JsonlWriterOptions(fsync="never", max_bytes=60)
+    first, second = RotatingJsonlWriter(output, options), RotatingJsonlWriter(output, options)
+
+    first.write_records([{"n": 1, "pad": "x" * 10}])
+    second.write_records([{"n": 2, "pad": "x" * 10}])
+    first.write_records([{"n": 3, "pad": "x" * 10}])  # rotates the file both have open
+    second.write_records([{"n": 4, "pad": "x" * 10}])  # follows the new file instead
+
+    (segment,) = tmp_path.glob("export.*.jsonl")
+    assert [record["n"] for record in _lines(segment)] == [1, 2]
+    assert [record["n"] for record in _lines(output)] == [3, 4]
+    first.close()
+    second.close()
+
+
+def test_invalid_fsync_policy_is_a_non_retryable_error(tmp_path):
+    (result,) = JsonlAccountingExporterAdapter().export_records(
+        [{"n": 1}], {"output_file": str(tmp_path / "x.jsonl"), "fsync": "sometimes"}
+    )
+    assert result["status"] == "error"
+    assert result["error"]["retryable"] is False
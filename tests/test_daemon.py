@@ -0,0 +1,129 @@
+"""Tests for the persistent build daemon."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+
+import pytest
+
+if not hasattr(socket, "AF_UNIX"):
+    pytest.skip("wg daemon requires Unix domain sockets", allow_module_level=True)
+
+from core.daemon import BuildDaemon, create_daemon_server  # noqa: E402
+from core.daemon_client import default_socket_path, request_daemon  # noqa: E402
+
+
+def _write_markdown(path: Path, title: str, body: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {title}\n---\n\n# {title}\n\n{body}\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _write_site(root: Path) -> None:
+    # Builds run from the project directory, which needs the repository's themes.
+    shutil.copytree(Path(__file__).resolve().parents[1] / "themes", root / "themes")
+    _write_markdown(root / "posts" / "first.md", "First")
+    _write_markdown(root / "posts" / "second.md", "Second")
+    (root / "config.yaml").write_text(
+        """version: 2
+site:
+  name: Daemon Test
+  navigation: []
+content:
+  source_directory: ./posts
+  data_dir: ./data
+  collections:
+    blog:
+      path: ./posts
+      type: blog
+      route:
+        prefix: blog
+      layout: document
+build:
+  output_directory: ./output
+plugins: []
+""",
+        encoding="utf-8",
+    )
+
+
+def test_daemon_builds_cold_then_rebuilds_only_changes(tmp_path):
+    _write_site(tmp_path)
+    daemon = BuildDaemon()
+    events: list[dict] = []
+    try:
+        first = daemon.dispatch({"command": "build", "cwd": str(tmp_path)}, events.append)
+        assert first["ok"] and first["mode"] == "full" and first["rendered"] == 2
+        assert (tmp_path / "output" / "blog" / "first" / "index.html").exists()
+        assert events[0] == {"event": "step", "name": "before_build_hooks", "index": 1, "total": 20}
+
+        _write_markdown(tmp_path / "posts" / "first.md", "First", "Edited.")
+        second = daemon.dispatch(
+            {"command": "partial", "cwd": str(tmp_path), "paths": ["posts/first.md"]}, events.append
+        )
+        assert second["ok"] and second["mode"] == "warm" and second["rendered"] == 1
+
+        status = daemon.status()
+        assert status["projects"][0]["builds"] == 2
+        assert status["projects"][0]["pages"] == 2
+    finally:
+        daemon.close()
+
+
+def test_daemon_socket_round_trip_streams_progress(tmp_path):
+    if not hasattr(os, "getuid"):
+        pytest.skip("Unix domain sockets unavailable")
+    _write_site(tmp_path)
+    socket_path = tmp_path / "wg.sock"
+    server = create_daemon_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        steps: list[str] = []
+        result = request_daemon(
+            {"command": "build", "cwd": str(tmp_path)},
+            socket_path,
+            on_event=lambda event: steps.append(event["name"]),
+            timeout=30,
+        )
+        assert result["event"] == "result" and result["ok"]
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+        assert steps[0] == "before_build_hooks" and steps[-1] == "write_output_manifest"
+
+        unknown = request_daemon({"command": "explode"}, socket_path, timeout=5)
+        assert unknown["event"] == "error"
+
+        assert request_daemon({"command": "stop"}, socket_path, timeout=5)["stopping"] is True
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    finally:
+        server.server_close()
+    assert not socket_path.exists()
+
+
+def test_default_socket_lives_in_a_private_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    path = default_socket_path()
+
+    server = create_daemon_server()
+    try:
+        assert server.socket_path == path
+        assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    finally:
+        server.server_close()
+
+    # A directory others can enter (e.g. created by another user) is refused.
+    path.parent.chmod(0o755)
+    with pytest.raises(PermissionError):
+        create_daemon_server()
+    with pytest.raises(PermissionError):
+        request_daemon({"command": "status"}, timeout=1)
@@ -0,0 +1,108 @@
+"""Tests for the live-reload dev server and its in-memory output map."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+from pathlib import Path
+import threading
+
+from core.dev_server import LIVE_RELOAD_PATH, LIVE_RELOAD_SNIPPET, create_dev_server, inject_live_reload
+from utils.fs_manager import OutputOverlayFileSystem
+
+
+def _write_site(root: Path) -> Path:
+    posts = root / "posts"
+    posts.mkdir(parents=True)
+    (posts / "first.md").write_text("---\ntitle: First\n---\n\n# First\n", encoding="utf-8")
+    config_path = root / "config.yaml"
+    config_path.write_text(
+        f"""version: 2
+site:
+  name: Dev Server Test
+  navigation: []
+content:
+  source_directory: {posts}
+  data_dir: {root / "data"}
+  collections:
+    blog:
+      path: {posts}
+      type: blog
+      route:
+        prefix: blog
+      layout: document
+build:
+  output_directory: {root / "output"}
+plugins: []
+""",
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def test_overlay_keeps_output_in_memory_and_passes_other_writes_through(tmp_path):
+    overlay = OutputOverlayFileSystem(tmp_path / "output")
+    page = tmp_path / "output" / "blog" / "index.html"
+    elsewhere = tmp_path / "notes.txt"
+
+    overlay.write_file(page, "<p>hi</p>\r\n")
+    overlay.write_file(elsewhere, "note")
+
+    assert not page.exists()
+    assert overlay.get_output(page) == b"<p>hi</p>\n"
+    assert overlay.read_file(page) == "<p>hi</p>\n"
+    assert overlay.path_exists(page)
+    assert elsewhere.read_text(encoding="utf-8") == "note"
+    assert overlay.discard(page) is True
+    assert overlay.get_output(page) is None
+
+
+def test_inject_live_reload_places_client_before_body_close():
+    html = b"<html><body><p>x</p></body></html>"
+    injected = inject_live_reload(html)
+    assert injected.endswith(LIVE_RELOAD_SNIPPET.encode("utf-8") + b"</body></html>")
+    assert inject_live_reload(b"<p>fragment</p>").startswith(b"<p>fragment</p><script>")
+
+
+def test_dev_server_serves_memory_output_and_pushes_reload(tmp_path):
+    config_path = _write_site(tmp_path)
+    server = create_dev_server(config_path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/blog/first/")
+        response = connection.getresponse()
+        body = response.read().decode("utf-8")
+        assert response.status == 200
+        assert response.getheader("Cache-Control") == "no-store"
+        assert "First" in body and LIVE_RELOAD_PATH in body
+        assert not (tmp_path / "output" / "blog" / "first" / "index.html").exists()
+
+        events = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        events.request("GET", LIVE_RELOAD_PATH)
+        stream = events.getresponse()
+        assert stream.getheader("Content-Type") == "text/event-stream"
+        assert stream.fp.readline() == b"retry: 1000\n"
+        stream.fp.readline()
+
+        source = tmp_path / "posts" / "first.md"
+        source.write_text("---\ntitle: First\n---\n\n# First\n\nUpdated.\n", encoding="utf-8")
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        report = server.apply_changes({source})
+        assert report.ok
+
+        event_line = stream.fp.readline().decode("utf-8")
+        assert event_line.startswith("data: ")
+        assert json.loads(event_line[len("data: ") :])["type"] == "reload"
+
+        connection.request("GET", "/blog/first/index.html")
+        assert "Updated." in connection.getresponse().read().decode("utf-8")
+        events.close()
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
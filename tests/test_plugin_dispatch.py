@@ -0,0 +1,87 @@
+"""PluginManager dispatch tables and per-plugin hook timing."""
+
+from __future__ import annotations
+
+import pytest
+
+from core.config import Config
+from core.errors import PluginError
+from core.plugin_manager import PluginManager
+from core.site import Site
+from plugins.base_plugin import BasePlugin, LifecycleEvent
+from tests.support_plugins import TestPluginA, TestPluginB
+
+
+class _RecordingPlugin(BasePlugin):
+    __test__ = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    def before_page_rendered(self, **kwargs):
+        self.calls.append(kwargs["page"])
+
+
+class _FailingPlugin(BasePlugin):
+    __test__ = False
+
+    def after_build(self, **kwargs):
+        raise RuntimeError("boom")
+
+
+def _manager(*plugins, strict: bool = True) -> PluginManager:
+    config = Config()
+    manager = PluginManager(config, Site(config), strict=strict)
+    manager.plugins = list(plugins)
+    return manager
+
+
+def test_dispatch_tables_only_include_overriding_plugins():
+    recorder = _RecordingPlugin()
+    manager = _manager(TestPluginA(), recorder, TestPluginB())
+
+    assert [p for p, _ in manager._hook_table("inject_css")] == manager.plugins[::2]
+    assert [p for p, _ in manager._hook_table("before_page_rendered")] == [recorder]
+    assert manager._hook_table(LifecycleEvent.AFTER_BUILD.value) == []
+    assert manager.has_hook(LifecycleEvent.INJECT_CSS)
+    assert not manager.has_hook("inject_js")
+
+    manager.run_hook("before_page_rendered", page="p1")
+    assert recorder.calls == ["p1"]
+    assert manager.run_hook_collect("inject_css") == [["/a.css"], ["/b.css"]]
+
+
+def test_reassigning_plugins_rebuilds_dispatch_tables():
+    manager = _manager(TestPluginA())
+    assert manager.run_hook_collect("modify_template_context") == [{"order": "a"}]
+
+    manager.plugins = [TestPluginB()]
+
+    assert manager.run_hook_collect("modify_template_context") == [{"order": "b"}]
+
+
+def test_plugin_timings_accumulate_per_plugin_and_hook():
+    manager = _manager(TestPluginA(), _RecordingPlugin())
+    for page in range(3):
+        manager.run_hook("before_page_rendered", page=page)
+        manager.run_hook_collect("inject_css", page=page)
+
+    timings = {row["plugin"]: row for row in manager.plugin_timings()}
+
+    assert timings["TestPluginA"]["calls"] == 3
+    assert timings["TestPluginA"]["hooks"]["inject_css"]["calls"] == 3
+    assert timings["_RecordingPlugin"]["hooks"]["before_page_rendered"]["calls"] == 3
+    assert "_RecordingPlugin" in manager.format_timing_report()
+
+    manager.reset_timings()
+    assert manager.plugin_timings() == []
+
+
+def test_error_policy_is_preserved():
+    with pytest.raises(PluginError, match="_FailingPlugin"):
+        _manager(_FailingPlugin()).run_hook("after_build")
+
+    lenient = _manager(_FailingPlugin(), strict=False)
+    lenient.run_hook("after_build")
+    assert lenient.plugin_timings()[0]["calls"] == 1
@@ -0,0 +1,76 @@
+"""Lazy plugin resolution through the plugin registry."""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import sys
+
+from core import plugin_registry
+from core.config import Config
+from core.plugin_manager import PluginManager
+from core.plugin_registry import BUILTIN_PLUGINS, PluginRegistry
+from core.site import Site
+from plugins.base_plugin import BasePlugin
+from tests.support_plugins import TestPluginA, TestPluginB
+
+
+def _manager(plugin_names, registry=None) -> PluginManager:
+    config = Config()
+    config.settings["plugins"] = list(plugin_names)
+    return PluginManager(config, Site(config), registry=registry or PluginRegistry())
+
+
+def test_builtin_index_matches_plugin_modules():
+    for name, target in BUILTIN_PLUGINS.items():
+        module_name, _, attr = target.partition(":")
+        plugin_class = getattr(importlib.import_module(module_name), attr)
+        assert plugin_class.__name__ == name
+        assert issubclass(plugin_class, BasePlugin)
+
+    indexed = {target.partition(":")[0] for target in BUILTIN_PLUGINS.values()}
+    for module_name in indexed:
+        module = importlib.import_module(module_name)
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, BasePlugin) and obj.__module__ == module_name:
+                assert obj.__name__ in BUILTIN_PLUGINS
+
+
+def test_only_configured_plugin_modules_are_imported(monkeypatch):
+    monkeypatch.delitem(sys.modules, "plugins.keywords_extractor", raising=False)
+    monkeypatch.delitem(sys.modules, "plugins.sitemap_generator", raising=False)
+
+    plugins = _manager(["SpecialPagesPlugin"]).detect_and_load_plugins()
+
+    assert [type(p).__name__ for p in plugins] == ["SpecialPagesPlugin"]
+    assert "plugins.keywords_extractor" not in sys.modules
+    assert "plugins.sitemap_generator" not in sys.modules
+
+
+def test_third_party_plugins_register_outside_plugins_package(monkeypatch):
+    registry = PluginRegistry()
+    registry.register("Alpha", TestPluginA)
+    monkeypatch.setattr(
+        plugin_registry,
+        "_plugin_entry_points",
+        lambda: {"Beta": "tests.support_plugins:TestPluginB"},
+    )
+
+    plugins = _manager(
+        ["Alpha", "Beta", "tests.support_plugins:TestPluginA"], registry
+    ).detect_and_load_plugins()
+
+    assert [type(p) for p in plugins] == [TestPluginA, TestPluginB, TestPluginA]
+    assert {"Alpha", "Beta", "SitemapPlugin"} <= set(registry.names())
+
+
+def test_unknown_and_invalid_plugins_are_skipped(caplog):
+    registry = PluginRegistry()
+    registry.register("NotAPlugin", "core.site:Site")
+
+    manager = _manager(["Missing", "NotAPlugin", "SpecialPagesPlugin"], registry)
+    plugins = manager.detect_and_load_plugins()
+
+    assert [type(p).__name__ for p in plugins] == ["SpecialPagesPlugin"]
+    assert "Plugin 'Missing' was listed in config but not found." in caplog.text
+    assert "Failed to load plugin 'NotAPlugin'" in caplog.text
@@ -0,0 +1,103 @@
+"""Tests for the on-demand preview server."""
+
+from __future__ import annotations
+
+import http.client
+import os
+from pathlib import Path
+import threading
+
+from core.preview_server import PreviewSession, create_preview_server
+
+
+def _write_markdown(path: Path, title: str, body: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {title}\n---\n\n# {title}\n\n{body}\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _write_site(root: Path) -> Path:
+    posts = root / "posts"
+    _write_markdown(posts / "first.md", "First")
+    _write_markdown(posts / "second.md", "Second")
+    config_path = root / "config.yaml"
+    config_path.write_text(
+        f"""version: 2
+site:
+  name: Preview Test
+  navigation: []
+content:
+  source_directory: {posts}
+  data_dir: {root / "data"}
+  collections:
+    blog:
+      path: {posts}
+      type: blog
+      route:
+        prefix: blog
+      layout: document
+build:
+  output_directory: {root / "output"}
+plugins: []
+""",
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def test_preview_indexes_without_rendering_and_memoizes_renders(tmp_path):
+    config_path = _write_site(tmp_path)
+    # Output from an earlier full build is left in place.
+    kept = tmp_path / "output" / "downloads" / "guide.pdf"
+    kept.parent.mkdir(parents=True)
+    kept.write_bytes(b"%PDF")
+    session = PreviewSession(config_path)
+    assert session.build().ok
+
+    assert session.page_count() == 2
+    assert session.render_count == 0
+    assert not (tmp_path / "output" / "blog" / "first" / "index.html").exists()
+    assert kept.read_bytes() == b"%PDF"
+
+    first = session.render("/blog/first/")
+    assert "First" in first
+    assert session.render("/blog/first/index.html") == first
+    assert session.render_count == 1
+    assert session.render("/blog/missing/") is None
+
+
+def test_preview_invalidates_only_changed_pages(tmp_path):
+    session = PreviewSession(_write_site(tmp_path))
+    session.build()
+    session.render("/blog/first/")
+    session.render("/blog/second/")
+
+    source = tmp_path / "posts" / "first.md"
+    _write_markdown(source, "First", "Edited.")
+    assert session.rebuild({source}).ok
+
+    assert "Edited." in session.render("/blog/first/")
+    session.render("/blog/second/")
+    assert session.render_count == 3
+
+
+def test_preview_server_renders_on_request(tmp_path):
+    server = create_preview_server(_write_site(tmp_path), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        connection.request("GET", "/blog/second/")
+        response = connection.getresponse()
+        assert response.status == 200
+        assert "Second" in response.read().decode("utf-8")
+
+        connection.request("GET", "/blog/nope/")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 404
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -118,7 +118,9 @@ def test_bootstrap_runtime_roles_is_idempotent_and_assigns_expected_permissions(
     assert assigned_user.groups.filter(name="support").exists()
 
 
-def test_inventory_admin_change_creates_adjustment_and_audit_event():
+def test_inventory_admin_change_creates_adjustment_and_audit_event(
+    django_capture_on_commit_callbacks,
+):
     superuser = _create_user(
         username=_unique_username("inventory_superuser"),
         is_staff=True,
@@ -145,20 +147,22 @@ def test_inventory_admin_change_creates_adjustment_and_audit_event():
     client.force_login(superuser)
 
     change_url = reverse("admin:runtime_inventoryitem_change", args=[inventory.pk])
-    response = client.post(
-        change_url,
-        {
-            "variant": variant.pk,
-            "sku": inventory.sku,
-            "available_quantity": 14,
-            "reserved_quantity": 2,
-            "policy": "manual",
-            "metadata": "{}",
-            "adjustment_reason": "Cycle count correction",
-            "_save": "Save",
-        },
-        follow=True,
-    )
+    # Audit events are written when the admin's transaction commits.
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            change_url,
+            {
+                "variant": variant.pk,
+                "sku": inventory.sku,
+                "available_quantity": 14,
+                "reserved_quantity": 2,
+                "policy": "manual",
+                "metadata": "{}",
+                "adjustment_reason": "Cycle count correction",
+                "_save": "Save",
+            },
+            follow=True,
+        )
 
     assert response.status_code == 200
 
@@ -326,3 +330,62 @@ def test_outbox_admin_views_and_requeue_action_for_dead_letter_events():
     assert action_response.status_code == 200
     event.refresh_from_db()
     assert event.status == IntegrationOutboxEvent.STATUS_PENDING
+
+
+def test_bulk_admin_delete_writes_audit_events_in_one_insert(django_capture_on_commit_callbacks):
+    from django.contrib import admin
+    from django.db import connection, transaction
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+
+    from wg_runtime.runtime.audit import _TransactionAuditBuffer, log_audit_event
+
+    superuser = _create_user(username=_unique_username("bulk_delete"), is_staff=True, is_superuser=True)
+    for index in range(25):
+        MediaAsset.objects.create(title=f"Asset {index}", file_name=f"asset-{index}.png")
+    request = RequestFactory().post("/admin/runtime/mediaasset/")
+    request.user = superuser
+
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            admin.site._registry[MediaAsset].delete_queryset(request, MediaAsset.objects.all())
+
+    audit_inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "runtime_auditevent"')]
+    assert len(audit_inserts) == 1
+    assert AuditEvent.objects.filter(action="admin.delete", model_name="MediaAsset").count() == 25
+    assert not MediaAsset.objects.exists()
+
+    # Events logged in a rolled-back savepoint are dropped with it.
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            log_audit_event(action="kept")
+            try:
+                with transaction.atomic():
+                    log_audit_event(action="rolled_back")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+    assert AuditEvent.objects.filter(action="kept").exists()
+    assert not AuditEvent.objects.filter(action="rolled_back").exists()
+
+    # Later blocks get a fresh buffer, registered once however many events they log.
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            log_audit_event(action="first")
+            log_audit_event(action="second")
+    assert len([callback for callback in callbacks if isinstance(callback, _TransactionAuditBuffer)]) == 1
+    assert AuditEvent.objects.filter(action__in=["first", "second"]).count() == 2
+
+
+def test_audit_background_writer_applies_backpressure(monkeypatch):
+    from wg_runtime.runtime.audit import AuditBackgroundWriter, build_audit_event
+
+    writer = AuditBackgroundWriter(max_events=1, batch_size=10, put_timeout=0.01)
+    # Drive the queue from this thread (and its test transaction) only.
+    monkeypatch.setattr(writer, "_ensure_thread", lambda: None)
+
+    writer.submit([build_audit_event(action=f"queued-{index}") for index in range(3)])
+    # One event fits the queue; the caller wrote the others itself.
+    assert AuditEvent.objects.filter(action__startswith="queued-").count() == 2
+    writer.flush()
+    assert AuditEvent.objects.filter(action__startswith="queued-").count() == 3
@@ -1,7 +1,7 @@
 import json
 
 import pytest
-from django.test import Client
+from django.test import Client, override_settings
 
 from wg_runtime.runtime.models import IntegrationOutboxEvent
 
@@ -67,6 +67,141 @@ def test_django_runtime_checkout_flow():
     assert "order_paid" in outbox_types
 
 
+def test_create_checkout_order_is_atomic_with_constant_query_count(
+    django_capture_on_commit_callbacks,
+):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from wg_runtime.runtime.integrations.outbox import _dispatch_outbox_events
+    from wg_runtime.runtime.integrations.services import create_checkout_order
+    from wg_runtime.runtime.models import Product, ProductVariant
+
+    product = Product.objects.create(name="Lamp", slug="lamp", is_published=True)
+    variants = [
+        ProductVariant.objects.create(product=product, sku=f"LAMP-{index}", price="10.00")
+        for index in range(10)
+    ]
+
+    def checkout(line_count):
+        lines = [
+            {"title": "Lamp", "sku": f"LAMP-{index}", "quantity": 1, "price": "10.00"}
+            for index in range(line_count)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks() as callbacks:
+                order, _, _ = create_checkout_order(
+                    request_base_url="http://testserver",
+                    validated_data={"provider": "local_gateway", "currency": "USD", "lines": lines},
+                )
+        return order, len(queries), callbacks
+
+    _, single_line_queries, callbacks = checkout(1)
+    order, ten_line_queries, _ = checkout(10)
+
+    assert ten_line_queries == single_line_queries
+    # Outbox dispatch waits for the commit instead of racing it.
+    dispatches = [c for c in callbacks if getattr(c, "func", None) is _dispatch_outbox_events]
+    assert len(dispatches) == 1
+    assert [line.variant_id for line in order.lines.all()] == [variant.id for variant in variants]
+    assert order.payment_attempts.get().metadata["adapter_session"]["redirect_url"]
+
+
+def test_enqueue_integration_events_inserts_in_bulk_and_skips_known_keys(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    from wg_runtime.runtime.integrations.outbox import (
+        IntegrationEvent,
+        enqueue_integration_events,
+    )
+
+    existing = IntegrationOutboxEvent.objects.create(
+        event_type="order_paid", provider_domain="shipping", idempotency_key="ship:1"
+    )
+    events = [
+        IntegrationEvent("order_paid", "shipping", {"n": 0}, idempotency_key="ship:1"),
+        IntegrationEvent("order_paid", "accounting", {"n": 1}, idempotency_key="acct:1"),
+        IntegrationEvent("order_paid", "accounting", {"n": 2}, idempotency_key="acct:1"),
+        IntegrationEvent("order_paid", "notifications", {"n": 3}),
+    ]
+
+    # Lookup, unkeyed insert, keyed insert, read-back.
+    with django_assert_num_queries(4):
+        with django_capture_on_commit_callbacks() as callbacks:
+            rows = enqueue_integration_events(events)
+
+    assert rows[0] == existing
+    assert rows[1] == rows[2] and rows[1].payload == {"n": 1}
+    assert rows[3].pk is not None
+    assert IntegrationOutboxEvent.objects.count() == 3
+    # New events are handed to the broker in a single post-commit batch.
+    assert len(callbacks) == 1
+
+
+def test_enqueue_integration_events_does_not_dispatch_a_concurrent_insert(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    from wg_runtime.runtime.integrations.outbox import (
+        IntegrationEvent,
+        _dispatch_outbox_events,
+        enqueue_integration_events,
+    )
+
+    bulk_create = IntegrationOutboxEvent.objects.bulk_create
+    racing: list[IntegrationOutboxEvent] = []
+
+    def bulk_create_after_concurrent_enqueue(objs, **kwargs):
+        # Another request commits the same key between the lookup and our insert.
+        if kwargs.get("ignore_conflicts") and not racing:
+            racing.append(
+                IntegrationOutboxEvent.objects.create(
+                    event_type="order_paid", provider_domain="shipping", idempotency_key="ship:9"
+                )
+            )
+        return bulk_create(objs, **kwargs)
+
+    monkeypatch.setattr(IntegrationOutboxEvent.objects, "bulk_create", bulk_create_after_concurrent_enqueue)
+    events = [
+        IntegrationEvent("order_paid", "shipping", {"n": 0}, idempotency_key="ship:9"),
+        IntegrationEvent("order_paid", "accounting", {"n": 1}, idempotency_key="acct:9"),
+    ]
+    with django_capture_on_commit_callbacks() as callbacks:
+        rows = enqueue_integration_events(events)
+
+    assert rows[0] == racing[0] and rows[0].payload == {}
+    dispatches = [c for c in callbacks if getattr(c, "func", None) is _dispatch_outbox_events]
+    assert [dispatch.args[0] for dispatch in dispatches] == [[rows[1].id]]
+
+
+def test_enqueued_events_are_dispatched_in_one_batch_message(monkeypatch):
+    from wg_runtime.runtime.integrations import tasks
+    from wg_runtime.runtime.integrations.outbox import (
+        IntegrationEvent,
+        _dispatch_outbox_events,
+        claim_due_outbox_events,
+        enqueue_integration_events,
+    )
+
+    rows = enqueue_integration_events(
+        [
+            IntegrationEvent("order_paid", "accounting", {"n": 0}, idempotency_key="acct:7"),
+            IntegrationEvent("order_paid", "accounting", {"n": 1}),
+        ]
+    )
+    other = IntegrationOutboxEvent.objects.create(event_type="order_paid", provider_domain="shipping")
+    messages = []
+    monkeypatch.setattr(
+        tasks.process_outbox_batch, "delay", lambda *args, **kwargs: messages.append((args, kwargs))
+    )
+
+    _dispatch_outbox_events([row.id for row in rows])
+
+    assert messages == [((2,), {"event_ids": [rows[0].id, rows[1].id]})]
+    claimed = claim_due_outbox_events(event_ids=messages[0][1]["event_ids"])
+    assert sorted(event.id for event in claimed) == sorted(row.id for row in rows)
+    assert IntegrationOutboxEvent.objects.get(id=other.id).status == IntegrationOutboxEvent.STATUS_PENDING
+
+
 def test_django_runtime_cors_preflight_echoes_allowed_origin_only():
     """CORS is scoped to an allow-list (no blanket ``*`` in production)."""
     from django.test import override_settings
@@ -169,6 +304,212 @@ def test_django_runtime_catalog_snapshot_endpoint_returns_published_products():
     assert payload["products"][0]["variants"][0]["sku"] == "SNAP-001"
 
 
+def test_export_catalog_snapshot_command_matches_endpoint(tmp_path):
+    from django.core.management import call_command
+
+    from core.catalog_source import FileCatalogSource
+    from wg_runtime.runtime.models import Product, ProductVariant
+
+    for index in range(5):
+        product = Product.objects.create(name=f"Export {index}", slug=f"export-{index}")
+        ProductVariant.objects.create(
+            product=product, sku=f"EXP-{index}", label="Default", price="10.50", currency="USD"
+        )
+    Product.objects.create(name="Draft", slug="draft", is_published=False)
+
+    endpoint_products = Client().get("/catalog/snapshot").json()["products"]
+    for filename in ("catalog.json", "catalog.ndjson.gz"):
+        call_command("export_catalog_snapshot", str(tmp_path / filename), chunk_size=2)
+        snapshot = FileCatalogSource(tmp_path / filename).fetch_snapshot()
+        assert snapshot["products"] == endpoint_products
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_catalog_snapshot_delta_reports_changed_and_deleted_products():
+    from wg_runtime.runtime.models import Product, ProductVariant
+
+    products = [
+        Product.objects.create(name=f"Delta {index}", slug=f"delta-{index}") for index in range(4)
+    ]
+    variants = [
+        ProductVariant.objects.create(
+            product=product, sku=f"DLT-{index}", label="Default", price="5.00", currency="USD"
+        )
+        for index, product in enumerate(products)
+    ]
+    client = Client()
+    with override_settings(WG_CATALOG_DELTA_OVERLAP_SECONDS=0):
+        cursor = client.get("/catalog/snapshot").json()["cursor"]
+
+    variants[0].price = "6.00"
+    variants[0].save()
+    products[1].is_published = False
+    products[1].save()
+    variants[2].delete()
+    deleted_id = str(products[3].pk)
+    products[3].delete()
+
+    response = client.get("/catalog/snapshot", {"updated_since": cursor})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["delta"] is True and payload["cursor"]
+    changed = {product["slug"]: product for product in payload["products"]}
+    assert set(changed) == {"delta-0", "delta-2"}
+    assert changed["delta-0"]["variants"][0]["price"] == "6.00"
+    assert changed["delta-2"]["variants"] == []
+    assert payload["deleted"] == sorted([str(products[1].pk), deleted_id])
+
+    assert client.get("/catalog/snapshot", {"updated_since": "yesterday"}).status_code == 400
+
+
+def test_catalog_snapshot_is_cached_etagged_and_invalidated(django_assert_num_queries):
+    import gzip
+
+    from wg_runtime.runtime.models import Product, ProductVariant
+
+    product = Product.objects.create(name="Cached", slug="cached", description="x" * 2000)
+    variant = ProductVariant.objects.create(
+        product=product, sku="CACHE-1", label="Default", price="3.00", currency="USD"
+    )
+    client = Client()
+    first = client.get("/catalog/snapshot", HTTP_ACCEPT_ENCODING="gzip")
+    assert first["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in first["Vary"]
+    assert json.loads(gzip.decompress(first.content))["products"][0]["slug"] == "cached"
+    etag = first["ETag"]
+
+    # Served from the cache: no queries, and a matching ETag short-circuits to 304.
+    with django_assert_num_queries(0):
+        revalidated = client.get("/catalog/snapshot", HTTP_IF_NONE_MATCH=etag)
+    assert revalidated.status_code == 304
+
+    variant.price = "4.00"
+    variant.save()
+    changed = client.get("/catalog/snapshot", HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed.json()["products"][0]["variants"][0]["price"] == "4.00"
+
+
+# As with a shared cache (RUNTIME_CACHE_URL).
+@override_settings(WG_ORDER_STATUS_CACHE_SECONDS=300)
+def test_order_status_is_cached_etagged_and_invalidated(django_assert_num_queries):
+    from decimal import Decimal
+
+    from wg_runtime.runtime.integrations.state_machine import transition_order_status
+    from wg_runtime.runtime.models import Order, OrderLine
+
+    order = Order.objects.create(status=Order.STATUS_PENDING_PAYMENT, total_amount=Decimal("5.00"))
+    OrderLine.objects.create(order=order, title="Mug", sku="MUG-1", quantity=1, price=Decimal("5.00"))
+    client = Client()
+    with django_assert_num_queries(2):
+        first = client.get(f"/orders/{order.order_id}")
+    assert first.json()["lines"][0]["sku"] == "MUG-1"
+    assert first["Cache-Control"] == "private, no-cache"
+    etag = first["ETag"]
+
+    with django_assert_num_queries(0):
+        polled = client.get(f"/orders/{order.order_id}", HTTP_IF_NONE_MATCH=etag)
+    assert polled.status_code == 304
+
+    OrderLine.objects.create(order=order, title="Lid", sku="LID-1", quantity=1, price=Decimal("1.00"))
+    assert len(client.get(f"/orders/{order.order_id}").json()["lines"]) == 2
+
+    transition_order_status(order=order, next_status=Order.STATUS_CANCELLED)
+    cancelled = client.get(f"/orders/{order.order_id}", HTTP_IF_NONE_MATCH=etag)
+    assert cancelled.status_code == 200
+    assert cancelled.json()["status"] == "cancelled"
+    assert cancelled["Cache-Control"] == "private, max-age=60"
+    assert client.get("/orders/missing").status_code == 404
+
+
+@override_settings(WG_ORDER_STATUS_CACHE_SECONDS=0)
+def test_order_status_is_not_cached_without_a_shared_cache(django_assert_num_queries):
+    from decimal import Decimal
+
+    from wg_runtime.runtime.models import Order
+
+    order = Order.objects.create(status=Order.STATUS_PENDING_PAYMENT, total_amount=Decimal("5.00"))
+    client = Client()
+    etag = client.get(f"/orders/{order.order_id}")["ETag"]
+
+    # Another worker's change, unseen by this process's cache.
+    Order.objects.filter(pk=order.pk).update(status=Order.STATUS_CANCELLED)
+    with django_assert_num_queries(2):
+        changed = client.get(f"/orders/{order.order_id}", HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "cancelled"
+
+
+def test_order_status_long_poll_and_event_stream():
+    from decimal import Decimal
+
+    from wg_runtime.runtime.integrations.state_machine import transition_order_status
+    from wg_runtime.runtime.models import Order
+
+    order = Order.objects.create(status=Order.STATUS_PENDING_PAYMENT, total_amount=Decimal("5.00"))
+    client = Client()
+    etag = client.get(f"/orders/{order.order_id}")["ETag"]
+
+    held = client.get(f"/orders/{order.order_id}", {"wait": "0.2"}, HTTP_IF_NONE_MATCH=etag)
+    assert held.status_code == 304
+    assert client.get(f"/orders/{order.order_id}", {"wait": "5", "etag": "stale"}).status_code == 200
+
+    stream = client.get(f"/orders/{order.order_id}/events", {"wait": "0"})
+    assert stream["Content-Type"] == "text/event-stream"
+    body = b"".join(stream.streaming_content).decode("utf-8")
+    assert f"id: {etag.strip(chr(34))}\nevent: status\n" in body
+    assert "event: end" not in body
+
+    transition_order_status(order=order, next_status=Order.STATUS_CANCELLED)
+    stream = client.get(f"/orders/{order.order_id}/events", HTTP_LAST_EVENT_ID=etag.strip('"'))
+    events = [chunk for chunk in b"".join(stream.streaming_content).decode("utf-8").split("\n\n") if chunk]
+    assert json.loads(events[1].split("data: ", 1)[1])["status"] == "cancelled"
+    assert events[-1].startswith("event: end")
+    assert client.get("/orders/missing/events").status_code == 404
+
+
+def test_order_status_notifier_defaults_to_the_database_without_a_shared_cache():
+    from django.conf import settings
+
+    from wg_runtime.runtime.order_status import DatabaseOrderStatusNotifier, get_order_status_notifier
+
+    assert not settings.RUNTIME_CACHE_URL
+    assert isinstance(get_order_status_notifier(), DatabaseOrderStatusNotifier)
+
+
+def test_in_process_order_status_notifier_wakes_waiters():
+    import threading
+
+    from wg_runtime.runtime.order_status import InProcessOrderStatusNotifier
+
+    notifier = InProcessOrderStatusNotifier()
+    token = notifier.token("A")
+    assert notifier.wait("A", token, 0.01) is False
+    timer = threading.Timer(0.05, notifier.notify, args=("A",))
+    timer.start()
+    assert notifier.wait("A", token, 5) is True
+    timer.join()
+
+
+def test_catalog_snapshot_keyset_pagination():
+    from wg_runtime.runtime.models import Product
+
+    for index in range(5):
+        Product.objects.create(name=f"Paged {index}", slug=f"paged-{index}")
+    client = Client()
+
+    slugs: list[str] = []
+    params = {"limit": 2}
+    while True:
+        page = client.get("/catalog/snapshot", params).json()
+        slugs.extend(product["slug"] for product in page["products"])
+        if page["next"] is None:
+            break
+        params["after"] = page["next"]
+    assert slugs == [f"paged-{index}" for index in range(5)]
+    assert client.get("/catalog/snapshot", {"limit": "0"}).status_code == 400
+
+
 def test_django_runtime_callback_is_idempotent_for_duplicate_event_key():
     client = Client()
     payload = {
@@ -289,3 +630,262 @@ def test_staff_orders_returns_list_for_staff_jwt(jwt_client):
     payload = response.json()
     assert "orders" in payload
     assert any(item["order_id"] == "ORD-TEST-001" for item in payload["orders"])
+
+
+def test_staff_orders_keyset_pages_filters_and_streams_exports(jwt_client):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from wg_runtime.runtime.models import Order
+
+    start = timezone.now() - timedelta(days=10)
+    for index in range(5):
+        order = Order.objects.create(
+            order_id=f"ORD-{index}",
+            status=Order.STATUS_PAID if index % 2 == 0 else Order.STATUS_FAILED,
+            provider="local_gateway",
+            total_amount="10.00",
+        )
+        Order.objects.filter(pk=order.pk).update(created_at=start + timedelta(days=index))
+
+    first = jwt_client.get("/staff/orders", {"limit": 2}).json()
+    assert [item["order_id"] for item in first["orders"]] == ["ORD-4", "ORD-3"]
+    second = jwt_client.get("/staff/orders", {"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [item["order_id"] for item in second["orders"]] == ["ORD-2", "ORD-1"]
+    last = jwt_client.get("/staff/orders", {"limit": 2, "cursor": second["next_cursor"]}).json()
+    assert [item["order_id"] for item in last["orders"]] == ["ORD-0"]
+    assert last["next_cursor"] is None
+
+    filtered = jwt_client.get(
+        "/staff/orders",
+        {"status": "paid", "created_after": (start + timedelta(days=1)).isoformat()},
+    ).json()
+    assert [item["order_id"] for item in filtered["orders"]] == ["ORD-4", "ORD-2"]
+    assert jwt_client.get("/staff/orders", {"cursor": "not-a-cursor"}).status_code == 400
+    assert jwt_client.get("/staff/orders", {"created_before": "yesterday"}).status_code == 400
+
+    export = jwt_client.get("/staff/orders", {"export": "csv", "status": "failed"})
+    assert export["Content-Type"].startswith("text/csv")
+    lines = b"".join(export.streaming_content).decode("utf-8").splitlines()
+    assert lines[0] == "order_id,status,total_amount,currency,provider,created_at"
+    assert [line.split(",")[0] for line in lines[1:]] == ["ORD-3", "ORD-1"]
+
+    export = jwt_client.get("/staff/orders", {"export": "ndjson", "provider": "local_gateway"})
+    records = [json.loads(line) for line in b"".join(export.streaming_content).splitlines()]
+    assert len(records) == 5 and records[0]["total_amount"] == "10.00"
+
+
+def _due_outbox_events(count, domain="notifications"):
+    from django.utils import timezone
+
+    return [
+        IntegrationOutboxEvent.objects.create(
+            event_type="order_created",
+            provider_domain=domain,
+            payload={"event": "order_created", "order_id": f"o-{index}"},
+            next_attempt_at=timezone.now(),
+        )
+        for index in range(count)
+    ]
+
+
+def test_outbox_batch_claims_are_disjoint_and_leases_expire():
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from wg_runtime.runtime.integrations.outbox import (
+        claim_due_outbox_events,
+        process_claimed_outbox_event,
+    )
+
+    _due_outbox_events(3)
+
+    first = claim_due_outbox_events(limit=2)
+    second = claim_due_outbox_events(limit=5)
+    assert len(first) == 2 and len(second) == 1
+    assert {event.status for event in first + second} == {IntegrationOutboxEvent.STATUS_PROCESSING}
+    assert first[0].locked_by and first[0].locked_by != second[0].locked_by
+    assert claim_due_outbox_events(limit=5) == []
+
+    # A crashed worker's lease runs out and another worker takes the event over.
+    IntegrationOutboxEvent.objects.filter(id=first[0].id).update(
+        next_attempt_at=timezone.now() - timedelta(seconds=1)
+    )
+    (reclaimed,) = claim_due_outbox_events(limit=5)
+    assert reclaimed.id == first[0].id
+
+    process_claimed_outbox_event(first[0])
+    assert IntegrationOutboxEvent.objects.get(id=reclaimed.id).locked_by == reclaimed.locked_by
+
+    process_claimed_outbox_event(reclaimed)
+    stored = IntegrationOutboxEvent.objects.get(id=reclaimed.id)
+    assert stored.status != IntegrationOutboxEvent.STATUS_PROCESSING
+    assert stored.locked_by == ""
+
+
+# Lanes deliver on pool threads, which only see committed rows.
+@pytest.mark.django_db(transaction=True)
+# Lanes deliver on pool threads, which only see committed rows.
+@pytest.mark.django_db(transaction=True)
+def test_run_outbox_worker_once_drains_due_events():
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    _due_outbox_events(3)
+    out = StringIO()
+
+    call_command("run_outbox_worker", "--once", "--threads", "1", "--batch-size", "2", stdout=out)
+
+    assert "processed 3 event(s)" in out.getvalue()
+    assert not IntegrationOutboxEvent.objects.filter(
+        status__in=[IntegrationOutboxEvent.STATUS_PENDING, IntegrationOutboxEvent.STATUS_PROCESSING]
+    ).exists()
+
+
+def test_retry_due_outbox_events_fans_out_batch_tasks():
+    from wg_runtime.runtime.integrations.tasks import retry_due_outbox_events
+
+    _due_outbox_events(3)
+
+    assert retry_due_outbox_events.delay(10, 2).get() == 3
+    assert not IntegrationOutboxEvent.objects.filter(
+        status=IntegrationOutboxEvent.STATUS_PENDING
+    ).exists()
+
+
+# Lanes deliver on pool threads, which only see committed rows.
+@pytest.mark.django_db(transaction=True)
+def test_outbox_lanes_isolate_domains_and_batch_capable_adapters(monkeypatch):
+    from io import StringIO
+
+    from django.core.management import call_command
+    from wg_commerce.extension import JsonlAccountingExporterAdapter
+    from wg_contracts.integrations import ok_result
+
+    from wg_runtime.runtime.integrations.lanes import get_outbox_lane, outbox_lanes
+    from wg_runtime.runtime.integrations.outbox import (
+        claim_due_outbox_events,
+        process_claimed_outbox_events,
+    )
+
+    assert [lane.name for lane in outbox_lanes()][:3] == ["notifications", "shipping", "accounting"]
+    default_lane = get_outbox_lane("default")
+    assert "accounting" in default_lane.excluded_domains
+
+    export_calls = []
+
+    def export_records(self, payloads, provider_config):
+        export_calls.append(len(payloads))
+        return [ok_result(provider=self.name) for _ in payloads]
+
+    monkeypatch.setattr(JsonlAccountingExporterAdapter, "export_records", export_records)
+    _due_outbox_events(3, domain="accounting")
+    _due_outbox_events(2, domain="notifications")
+    _due_outbox_events(1, domain="custom")
+
+    out = StringIO()
+    call_command("run_outbox_worker", "--backlog", stdout=out)
+    backlog = {entry["lane"]: entry["due"] for entry in json.loads(out.getvalue())}
+    assert backlog == {"notifications": 2, "shipping": 0, "accounting": 3, "default": 1}
+
+    events = claim_due_outbox_events(limit=10, lane=get_outbox_lane("accounting"))
+    assert {event.provider_domain for event in events} == {"accounting"}
+    processed = process_claimed_outbox_events(events)
+    # The whole accounting batch went to the adapter in one call.
+    assert export_calls == [3]
+    assert {event.status for event in processed} == {IntegrationOutboxEvent.STATUS_SUCCEEDED}
+
+    out = StringIO()
+    call_command("run_outbox_worker", "--once", "--lane", "notifications", "--threads", "1", stdout=out)
+    assert "lane=notifications delivered=" in out.getvalue()
+    assert IntegrationOutboxEvent.objects.get(provider_domain="custom").status == (
+        IntegrationOutboxEvent.STATUS_PENDING
+    )
+
+
+def test_outbox_worker_claims_other_lanes_while_one_lane_is_blocked(monkeypatch):
+    import threading
+    from io import StringIO
+    from types import SimpleNamespace
+
+    from django.core.management import call_command
+
+    from wg_runtime.runtime.management.commands import run_outbox_worker
+
+    # Notifications only become due after the accounting batch was claimed.
+    due = {"accounting": [[SimpleNamespace(id=1)]], "notifications": [[], [SimpleNamespace(id=2)]]}
+    notification_delivered = threading.Event()
+    accounting_released = []
+
+    def claim(*, limit, lease_seconds, exclude_ids, lane):
+        batches = due.get(lane.name)
+        return batches.pop(0) if batches else []
+
+    def deliver(events, metrics):
+        if events[0].id == 2:
+            notification_delivered.set()
+        else:
+            # A slow export: it finishes only once the notification went out.
+            accounting_released.append(notification_delivered.wait(timeout=5))
+
+    monkeypatch.setattr(run_outbox_worker, "claim_due_outbox_events", claim)
+    monkeypatch.setattr(run_outbox_worker, "_deliver", deliver)
+    call_command(
+        "run_outbox_worker", "--once", "--threads", "1", "--poll-interval", "0.01", stdout=StringIO()
+    )
+
+    assert accounting_released == [True]
+
+
+def test_resolve_adapter_caches_bindings_and_pools_instances():
+    import threading
+
+    from wg_runtime.runtime.integrations.context import RuntimeIntegrationContext
+    from wg_runtime.runtime.integrations.registry import RuntimeAdapterRegistry
+    from wg_runtime.runtime.integrations import (
+        get_runtime_integration_context,
+        reset_runtime_integration_context_cache,
+    )
+
+    class SharedTax:
+        pass
+
+    class PerThreadShipping:
+        pass
+
+    registry = RuntimeAdapterRegistry()
+    registry.register("tax", SharedTax, metadata={"kind": "tax_pricing_provider", "thread_safe": True})
+    registry.register("shipping", PerThreadShipping, metadata={"kind": "shipping_provider"})
+    context = RuntimeIntegrationContext(
+        integrations={
+            "tax": {"default": "vat", "providers": {"vat": {"adapter": "tax"}}},
+            "shipping": {"providers": {"flat": {"adapter": "shipping"}}},
+        },
+        adapter_registry=registry,
+    )
+
+    tax, binding = context.resolve_adapter(domain="tax")
+    assert context.resolve_adapter(domain="tax") == (tax, binding)
+    assert context.resolve_adapter(domain="tax", provider_name="vat")[0] is tax
+
+    shipping, _ = context.resolve_adapter(domain="shipping")
+    assert context.resolve_adapter(domain="shipping")[0] is shipping
+    seen = {}
+
+    def resolve_in_thread():
+        seen["shipping"] = context.resolve_adapter(domain="shipping")[0]
+        seen["tax"] = context.resolve_adapter(domain="tax")[0]
+
+    thread = threading.Thread(target=resolve_in_thread)
+    thread.start()
+    thread.join()
+    assert seen["tax"] is tax
+    assert isinstance(seen["shipping"], PerThreadShipping) and seen["shipping"] is not shipping
+
+    pooled, _ = get_runtime_integration_context().resolve_adapter(domain="payments")
+    assert get_runtime_integration_context().resolve_adapter(domain="payments")[0] is pooled
+    reset_runtime_integration_context_cache()
+    assert get_runtime_integration_context().resolve_adapter(domain="payments")[0] is not pooled
@@ -0,0 +1,142 @@
+"""Tests for the output manifest and the production static file server."""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+from pathlib import Path
+import threading
+
+import pytest
+
+from core.output_manifest import OUTPUT_MANIFEST_FILENAME, write_output_manifest
+from core.static_server import IMMUTABLE_CACHE, LRUFileCache, StaticFileServer
+
+PAGE = "<html><body>" + "hello static world " * 100 + "</body></html>"
+
+
+def _write_output(root: Path) -> Path:
+    output = root / "output"
+    (output / "blog").mkdir(parents=True)
+    (output / "index.html").write_text(PAGE, encoding="utf-8")
+    (output / "blog" / "index.html").write_text("<p>blog</p>", encoding="utf-8")
+    (output / "app.0123abcd.js").write_text("console.log(1);" * 100, encoding="utf-8")
+    (output / "video.bin").write_bytes(bytes(range(256)) * 4)
+    return output
+
+
+@pytest.fixture
+def served(tmp_path):
+    output = _write_output(tmp_path)
+    write_output_manifest(output, precompress=["gzip"])
+    server = StaticFileServer(("127.0.0.1", 0), output, cache=LRUFileCache(max_entry_bytes=512))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        yield server, connection
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+
+
+def _get(connection, path, **headers):
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def test_write_output_manifest_hashes_files_and_writes_sidecars(tmp_path):
+    output = _write_output(tmp_path)
+    manifest_path = write_output_manifest(output, precompress=["gzip"])
+
+    files = json.loads(manifest_path.read_text(encoding="utf-8"))["files"]
+    assert set(files) == {"index.html", "blog/index.html", "app.0123abcd.js", "video.bin"}
+    assert gzip.decompress((output / "index.html.gz").read_bytes()).decode("utf-8") == PAGE
+    # Too small to be worth compressing, and binary files are never precompressed.
+    assert not (output / "blog" / "index.html.gz").exists()
+    assert not (output / "video.bin.gz").exists()
+    assert manifest_path.name == OUTPUT_MANIFEST_FILENAME
+
+
+def test_etag_conditional_get_and_gzip_negotiation(served):
+    server, connection = served
+    sha = server.manifest["index.html"]["sha256"]
+
+    response, body = _get(connection, "/")
+    assert response.status == 200 and body.decode("utf-8") == PAGE
+    assert response.getheader("ETag") == f'"{sha[:32]}"'
+    assert response.getheader("Vary") == "Accept-Encoding"
+    assert response.getheader("Cache-Control") == "public, max-age=0, must-revalidate"
+
+    response, body = _get(connection, "/", **{"If-None-Match": response.getheader("ETag")})
+    assert response.status == 304 and body == b""
+
+    response, body = _get(connection, "/index.html", **{"Accept-Encoding": "br;q=0, gzip"})
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert response.getheader("ETag") == f'"{sha[:32]}-gz"'
+    assert gzip.decompress(body).decode("utf-8") == PAGE
+
+    response, _ = _get(connection, "/app.0123abcd.js")
+    assert response.getheader("Cache-Control") == IMMUTABLE_CACHE
+
+    response, _ = _get(connection, "/blog")
+    assert response.status == 301 and response.getheader("Location") == "/blog/"
+    response, _ = _get(connection, "/../secret")
+    assert response.status == 404
+
+
+def test_etags_follow_files_changed_after_the_manifest(served):
+    server, connection = served
+    output = server.root
+    response, _ = _get(connection, "/blog/")
+    old_etag = response.getheader("ETag")
+
+    # Same size as before, so the manifest's size check alone would still match.
+    (output / "blog" / "index.html").write_text("<p>BLOG</p>", encoding="utf-8")
+    response, body = _get(connection, "/blog/", **{"If-None-Match": old_etag})
+    assert response.status == 200 and body == b"<p>BLOG</p>"
+    assert response.getheader("ETag") != old_etag
+
+    write_output_manifest(output)
+    response, _ = _get(connection, "/blog/")
+    assert response.getheader("ETag") == f'"{server.manifest["blog/index.html"]["sha256"][:32]}"'
+
+    response, _ = _get(connection, f"/{OUTPUT_MANIFEST_FILENAME}")
+    assert response.status == 404
+
+
+def test_range_requests_and_keep_alive(served):
+    server, connection = served
+    data = bytes(range(256)) * 4
+
+    response, body = _get(connection, "/video.bin", Range="bytes=10-19")
+    assert response.status == 206
+    assert response.getheader("Content-Range") == "bytes 10-19/1024"
+    assert body == data[10:20]
+
+    response, body = _get(connection, "/video.bin", Range="bytes=-4")
+    assert body == data[-4:]
+
+    response, _ = _get(connection, "/video.bin", Range="bytes=5000-")
+    assert response.status == 416
+    assert response.getheader("Content-Range") == "bytes */1024"
+
+    response, body = _get(connection, "/video.bin", Range="bytes=0-1", **{"If-Range": '"stale"'})
+    assert response.status == 200 and body == data
+    # Every request above reused one HTTP/1.1 connection.
+    assert response.getheader("Keep-Alive").startswith("timeout=5")
+
+
+def test_lru_cache_is_bounded_by_bytes(tmp_path):
+    cache = LRUFileCache(max_bytes=10, max_entry_bytes=8)
+    cache.put(tmp_path / "a", (1, 6), b"aaaaaa")
+    cache.put(tmp_path / "b", (1, 6), b"bbbbbb")
+    cache.put(tmp_path / "big", (1, 9), b"x" * 9)
+
+    assert cache.get(tmp_path / "a", (1, 6)) is None
+    assert cache.get(tmp_path / "b", (1, 6)) == b"bbbbbb"
+    assert cache.get(tmp_path / "big", (1, 9)) is None
+    assert len(cache) == 1
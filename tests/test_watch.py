@@ -0,0 +1,139 @@
+"""Tests for the file watchers and warm incremental rebuilds behind ``wg watch``."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import time
+
+import pytest
+
+from core.warm_build import FULL, NOOP, WARM, WarmBuildSession
+from core.watcher import InotifyWatcher, PollingWatcher, is_noise
+
+
+def _write_markdown(path: Path, title: str, body: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {title}\n---\n\n# {title}\n\n{body}\n", encoding="utf-8")
+
+
+def _touch_later(path: Path, text: str) -> None:
+    # Bump mtime explicitly: coarse filesystem timestamps could otherwise hide the edit.
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _write_site(root: Path) -> Path:
+    posts = root / "posts"
+    _write_markdown(posts / "first.md", "First")
+    _write_markdown(posts / "second.md", "Second")
+    config_path = root / "config.yaml"
+    config_path.write_text(
+        f"""version: 2
+site:
+  name: Watch Test
+  navigation: []
+content:
+  source_directory: {root / "posts"}
+  data_dir: {root / "data"}
+  collections:
+    blog:
+      path: {posts}
+      type: blog
+      route:
+        prefix: blog
+      layout: document
+      index:
+        enabled: true
+        layout: collection
+        output_path: blog/index.html
+        title: Blog
+build:
+  output_directory: {root / "output"}
+plugins:
+  - CollectionIndexerPlugin
+""",
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def test_polling_watcher_reports_modified_created_and_deleted_files(tmp_path):
+    existing = tmp_path / "a.md"
+    doomed = tmp_path / "b.md"
+    existing.write_text("a", encoding="utf-8")
+    doomed.write_text("b", encoding="utf-8")
+    watcher = PollingWatcher([tmp_path], interval=0.01)
+
+    _touch_later(existing, "a2")
+    doomed.unlink()
+    (tmp_path / "c.md").write_text("c", encoding="utf-8")
+    (tmp_path / ".c.md.swp").write_text("swap", encoding="utf-8")
+
+    changed = watcher.poll(1.0)
+    assert changed == {existing.resolve(), doomed.resolve(), (tmp_path / "c.md").resolve()}
+    assert watcher.poll(0.0) == set()
+    assert is_noise(tmp_path / ".c.md.swp")
+
+
+def test_inotify_watcher_sees_new_subdirectories(tmp_path):
+    try:
+        watcher = InotifyWatcher([tmp_path])
+    except OSError as exc:
+        pytest.skip(f"inotify unavailable: {exc}")
+    try:
+        nested = tmp_path / "nested"
+        nested.mkdir()
+        assert nested.resolve() in watcher.poll(1.0)
+
+        (nested / "page.md").write_text("hi", encoding="utf-8")
+        deadline = time.monotonic() + 2.0
+        changed: set[Path] = set()
+        while (nested / "page.md").resolve() not in changed and time.monotonic() < deadline:
+            changed |= watcher.poll(0.2)
+        assert (nested / "page.md").resolve() in changed
+    finally:
+        watcher.close()
+
+
+def test_warm_session_rerenders_only_the_edited_page(tmp_path):
+    config_path = _write_site(tmp_path)
+    output = tmp_path / "output"
+    session = WarmBuildSession(config_path)
+
+    report = session.build()
+    assert report.ok and report.mode == FULL
+    assert (output / "blog" / "second" / "index.html").exists()
+    assert len(session.parse_cache) == 2
+
+    second_out = output / "blog" / "second" / "index.html"
+    untouched_mtime = second_out.stat().st_mtime_ns
+    first_source = tmp_path / "posts" / "first.md"
+    _touch_later(first_source, "---\ntitle: First\n---\n\n# First\n\nEdited body.\n")
+
+    report = session.rebuild({first_source})
+    assert report.ok and report.mode == WARM
+    assert report.rendered == [output / "blog" / "first" / "index.html"]
+    assert "Edited body." in (output / "blog" / "first" / "index.html").read_text(encoding="utf-8")
+    assert second_out.stat().st_mtime_ns == untouched_mtime
+
+    assert session.rebuild({output / "blog" / "index.html"}).mode == NOOP
+
+
+def test_warm_session_removes_output_of_deleted_page(tmp_path):
+    config_path = _write_site(tmp_path)
+    output = tmp_path / "output"
+    session = WarmBuildSession(config_path)
+    session.build()
+
+    second_source = tmp_path / "posts" / "second.md"
+    second_source.unlink()
+    report = session.rebuild({second_source})
+
+    assert report.ok and report.mode == WARM
+    assert report.removed == [output / "blog" / "second" / "index.html"]
+    assert not (output / "blog" / "second" / "index.html").exists()
+    # Page set changed, so the collection index was re-rendered without the removed post.
+    assert output / "blog" / "index.html" in report.rendered
+    assert "Second" not in (output / "blog" / "index.html").read_text(encoding="utf-8")